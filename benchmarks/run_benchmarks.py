@@ -0,0 +1,338 @@
+"""Benchmarks for every stage of the DataFaker pipeline.
+
+Runs people generation, graph construction, each transaction type, coworker expansion, each export
+format and hashing the exported files at one or more scales, and writes the timings to a JSON file.
+Geocoding goes through the real Geocoder and its worker pool, but requests are answered by a local stub,
+so nothing touches the network.
+
+    python benchmarks/run_benchmarks.py --scales 1k 100k --output benchmarks/results/latest.json
+    python benchmarks/run_benchmarks.py --scales 1k --compare benchmarks/results/latest.json
+
+Every run also times a fresh `import data_faker` and fails when it goes over --import-budget seconds or
+loads a module from LAZY_MODULES, which should only load once the feature that needs it runs.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_faker import DataFaker  # noqa: E402
+from exporters import WRITERS  # noqa: E402
+from fast_profiles import ProfileGenerator  # noqa: E402
+from geocoder import Geocoder  # noqa: E402
+from manifest import describe_file  # noqa: E402
+from run_config import GRAPH_TYPES, TRANSACTION_TYPES  # noqa: E402
+from temporal import TemporalPattern  # noqa: E402
+
+SCALES = {'1k': 1000, '100k': 100000, '1M': 1000000}
+
+# Stages that build networkx objects are only run up to this many people.
+NETWORKX_LIMIT = 100000
+
+# The graph people are linked with when timing the stages that follow graph construction.
+PIPELINE_GRAPH = 'Org Hierarchy'
+
+# Seconds a fresh `import data_faker` may take, and the modules it must not load on its own.
+IMPORT_BUDGET = 0.5
+LAZY_MODULES = ['faker', 'pandas', 'networkx', 'requests', 'pyarrow']
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import data_faker
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "loaded": [name for name in %r if name in sys.modules]}))
+"""
+
+
+class StubResponse:
+    status_code = 200
+
+    def __init__(self, text):
+        self.text = text
+
+
+class StubSession:
+    """
+    Stands in for requests.Session so the Geocoder can be benchmarked offline.
+
+    Every address resolves to a point derived from its hash after an optional delay.
+
+    When initializing a StubSession class, include the following parameters:
+        latency:  (Float) Seconds each request takes.
+    """
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def get(self, url, params=None, timeout=None):
+        if self.latency:
+            time.sleep(self.latency)
+
+        value = hash(params['singleLine'])
+        location = {"x": -125 + (value % 5800) / 100, "y": 25 + (value // 5800 % 2400) / 100}
+        return StubResponse(json.dumps({"candidates": [{"location": location}]}))
+
+    def close(self):
+        pass
+
+
+def stub_geocoder(latency=0.0, max_workers=8):
+    """Builds a Geocoder whose requests are answered locally.
+
+    Keyword Arguments:
+        latency {float} -- Seconds each stubbed request takes. (default: {0.0})
+        max_workers {int} -- Size of the geocoder's worker pool. (default: {8})
+
+    Returns:
+        [Geocoder] -- The geocoder, without a cache.
+    """
+    geocoder = Geocoder(max_workers=max_workers, max_retries=0)
+    geocoder.session.close()
+    geocoder.session = StubSession(latency)
+    return geocoder
+
+
+def _timed(stages, name, function, records=None):
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        result = function()
+    seconds = time.perf_counter() - start
+
+    stages[name] = {"seconds": seconds,
+                    "records": records(result) if records is not None else None}
+    return result
+
+
+def run_scale(number_of_people, seed=0, latency=0.0, formats=None):
+    """Runs every stage once for one population size.
+
+    Arguments:
+        number_of_people {int} -- How many people to generate.
+
+    Keyword Arguments:
+        seed {int} -- Seed for the run. (default: {0})
+        latency {float} -- Seconds each stubbed geocoder request takes. (default: {0.0})
+        formats {List} -- Export formats to time. (default: {None})
+
+    Returns:
+        [Dict] -- Stage name to {"seconds": ..., "records": ...}.
+    """
+    formats = formats or list(WRITERS) + ['sqlite', 'd3']
+    stages = {}
+
+    generator = ProfileGenerator(DataFaker(seed=seed).fake, seed=seed)
+    _timed(stages, "profiles", lambda: generator.columns(number_of_people), lambda columns: len(columns["name"]))
+
+    for graph_type in GRAPH_TYPES:
+        if graph_type in ['Tree', 'Ring of Cliques'] and number_of_people > NETWORKX_LIMIT:
+            continue
+        faker = DataFaker(seed=seed)
+        _timed(stages, "graph:" + graph_type,
+               lambda: faker._create_random_graph(graph_type, number_of_people) and faker.G,
+               lambda G: G.number_of_edges)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        faker = DataFaker(location_provider=stub_geocoder(latency), seed=seed, output_dir=output_dir)
+        try:
+            faker._create_random_graph(PIPELINE_GRAPH, number_of_people)
+
+            _timed(stages, "people", lambda: faker._create_fake_people(number_of_people) or faker.people, len)
+            faker._get_companies_list()
+            _timed(stages, "attributes", lambda: faker._create_attributes(['phone_number', 'work_email', 'credit_card']))
+
+            for transaction_type in TRANSACTION_TYPES:
+                _timed(stages, "transactions:" + transaction_type,
+                       lambda: faker._generate_bulk_transactions(transaction_type),
+                       lambda _: len(faker.transactions.rows(transaction_type)))
+
+            # Three years of Hawkes arrivals with daily and weekly cycles and bursts, ten transactions per person.
+            pattern = TemporalPattern(datetime(2021, 1, 1), datetime(2024, 1, 1), 'hawkes', diurnal=True, weekly=True,
+                                      bursts=2)
+            _timed(stages, "timestamps:hawkes",
+                   lambda: pattern.sample(number_of_people, np.random.default_rng(seed), mean_count=10),
+                   lambda result: len(result[1]))
+
+            _timed(stages, "coworkers", lambda: sum(len(edges) for edges, _ in faker._iter_coworker_edges()),
+                   lambda count: count)
+
+            for file_format in formats:
+                if file_format == 'd3':
+                    _timed(stages, "export:d3", faker._to_d3_json)
+                    _timed(stages, "export:d3:compact", lambda: faker._to_d3_json({"compact": True}))
+                    continue
+
+                for table in TRANSACTION_TYPES + ["people", "coworker", "coworker_edges"]:
+                    _timed(stages, f"export:{file_format}:{table}",
+                           lambda: faker._export_records(table, file_format))
+
+                faker.sort_by_time = True
+                _timed(stages, f"export:{file_format}:money:by-time", lambda: faker._export_records("money", file_format))
+                faker.sort_by_time = False
+
+            # Hashing every file the exports wrote, as the manifest does at the end of a run.
+            _timed(stages, "manifest", lambda: {name: describe_file(os.path.join(output_dir, name))
+                                                for name in sorted(os.listdir(output_dir))}, len)
+        finally:
+            faker.location_provider.close()
+
+    return stages
+
+
+def measure_import(repeat=5):
+    """Times `import data_faker` in fresh interpreters.
+
+    Keyword Arguments:
+        repeat {int} -- How many interpreters to start.  The best time is kept. (default: {5})
+
+    Returns:
+        [Dict] -- {"seconds": [...], "best": ..., "loaded": [...]}, where loaded lists the LAZY_MODULES the
+                  import pulled in.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    seconds, loaded = [], []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT % LAZY_MODULES], capture_output=True,
+                                text=True, cwd=root, check=True)
+        measured = json.loads(result.stdout.strip().splitlines()[-1])
+        seconds.append(measured["seconds"])
+        loaded = measured["loaded"]
+
+    return {"seconds": seconds, "best": min(seconds), "loaded": loaded}
+
+
+def check_import(measured=None, budget=IMPORT_BUDGET):
+    """Prints the import time against the budget.
+
+    Keyword Arguments:
+        measured {Dict} -- The result of measure_import. (default: {None})
+        budget {float} -- Seconds the import may take. (default: {IMPORT_BUDGET})
+
+    Returns:
+        [bool] -- True when the import is within budget and loads none of LAZY_MODULES.
+    """
+    within = measured["best"] <= budget and not measured["loaded"]
+    print(f"import data_faker: {measured['best']:.3f}s of {budget:.3f}s budget"
+          + (f", loaded {', '.join(measured['loaded'])}" if measured["loaded"] else "")
+          + ("" if within else "  OVER BUDGET"))
+    return within
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_benchmarks(scales=None, repeat=1, seed=0, latency=0.0, formats=None):
+    """Runs the benchmark at each scale, repeating each run and keeping every timing.
+
+    Keyword Arguments:
+        scales {List} -- Scale names from SCALES. (default: {None})
+        repeat {int} -- How many times to run each scale. (default: {1})
+        seed {int} -- Seed for every run. (default: {0})
+        latency {float} -- Seconds each stubbed geocoder request takes. (default: {0.0})
+        formats {List} -- Export formats to time. (default: {None})
+
+    Returns:
+        [Dict] -- The report, ready to be written as JSON.
+    """
+    report = {"created": datetime.now().isoformat(timespec='seconds'),
+              "revision": _git_revision(),
+              "python": platform.python_version(),
+              "numpy": np.__version__,
+              "platform": platform.platform(),
+              "cpus": os.cpu_count(),
+              "settings": {"repeat": repeat, "seed": seed, "latency": latency},
+              "scales": {},
+              "import": measure_import()}
+
+    for scale in scales or ['1k', '100k']:
+        timings = {}
+        for _ in range(repeat):
+            for name, stage in run_scale(SCALES[scale], seed, latency, formats).items():
+                timings.setdefault(name, {"seconds": [], "records": stage["records"]})
+                timings[name]["seconds"].append(stage["seconds"])
+
+        for stage in timings.values():
+            stage["best"] = min(stage["seconds"])
+            stage["mean"] = sum(stage["seconds"]) / len(stage["seconds"])
+
+        report["scales"][scale] = timings
+        print(f"{scale}: {sum(stage['best'] for stage in timings.values()):.2f}s over {len(timings)} stages")
+
+    return report
+
+
+def compare(report=None, baseline=None, threshold=1.2):
+    """Prints each stage's best time against a baseline report.
+
+    Keyword Arguments:
+        report {Dict} -- The new report. (default: {None})
+        baseline {Dict} -- A report from an earlier version. (default: {None})
+        threshold {float} -- Ratio of new to old time that counts as a regression. (default: {1.2})
+
+    Returns:
+        [List] -- (scale, stage, ratio) for every regression.
+    """
+    regressions = []
+    for scale, stages in report["scales"].items():
+        for name, stage in stages.items():
+            old = baseline["scales"].get(scale, {}).get(name)
+            if old is None:
+                continue
+
+            ratio = stage["best"] / max(old["best"], 1e-9)
+            flag = "  REGRESSION" if ratio > threshold else ""
+            print(f"{scale:>5} {name:<32} {old['best']:9.3f}s -> {stage['best']:9.3f}s  x{ratio:5.2f}{flag}")
+            if ratio > threshold:
+                regressions.append((scale, name, ratio))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark each stage of the DataFaker pipeline.")
+    parser.add_argument("--scales", nargs="*", choices=list(SCALES), default=['1k', '100k'])
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per scale.  The best time is compared.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds each stubbed geocoder request takes.")
+    parser.add_argument("--formats", nargs="*", choices=list(WRITERS) + ['sqlite', 'd3'])
+    parser.add_argument("--output", help="JSON file to write the results to.")
+    parser.add_argument("--compare", help="JSON results from an earlier run to compare against.")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Slowdown ratio reported as a regression.")
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET,
+                        help="Seconds a fresh import of data_faker may take.")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.scales, args.repeat, args.seed, args.latency, args.formats)
+    within_budget = check_import(report["import"], args.import_budget)
+
+    if args.output is not None:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=4)
+
+    if args.compare is not None:
+        with open(args.compare, 'r') as baseline:
+            if compare(report, json.load(baseline), args.threshold):
+                sys.exit(1)
+
+    if not within_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+from datetime import datetime
+
+import numpy as np
+
+from temporal import TemporalPattern
+
+COLUMNS = ['origin', 'destination', 'date', 'amount', 'transaction-type', 'x', 'y']
+
+# Default share of graph-aware destinations that go to a direct contact, a contact of a contact,
+# and anyone in the pool.
+CONTACT_MIX = (0.7, 0.2, 0.1)
+
+
+class BulkTransactionGenerator:
+    """
+    Class that generates transactions for a whole population at once as NumPy columns.
+
+    Counts, destinations, amounts and timestamps are each drawn as a single array per transaction
+    type instead of one Transaction object at a time.
+
+    By default counts are uniform between min_per_person and max_per_person and times are uniform over the
+    window.  Temporal options hand counts and times to a TemporalPattern instead, which adds daily and weekly
+    cycles, bursts and Poisson or Hawkes arrivals, and sorts each person's transactions by time.
+
+    When initializing a BulkTransactionGenerator class, include the following parameters:
+        start_date:      (Datetime) Earliest time a transaction can occur.
+        end_date:        (Datetime) Latest time a transaction can occur.  Defaults to now. (Optional)
+        min_per_person:  (Int) Fewest transactions each person makes.
+        max_per_person:  (Int) Most transactions each person makes.
+        seed:            (Int) Seed for the random number generator. (Optional)
+        temporal:        (Dict) TemporalPattern settings, such as {"arrivals": "hawkes", "diurnal": true}.
+                         Keys come from TEMPORAL_OPTIONS. (Optional)
+    """
+    def __init__(self, start_date=None, end_date=None, min_per_person=1, max_per_person=10, seed=None,
+                 temporal=None):
+        if min_per_person < 0 or max_per_person < min_per_person:
+            print("Transactions per person must be a range of whole numbers starting at zero or more.")
+            raise ValueError
+
+        self.start_date = start_date
+        self.end_date = end_date
+        self.min_per_person = min_per_person
+        self.max_per_person = max_per_person
+        self.rng = np.random.default_rng(seed)
+        self.temporal = TemporalPattern(start_date, end_date, **temporal) if temporal else None
+
+    def _draw_dates(self, count):
+        start = np.datetime64(self.start_date, 's')
+        end = np.datetime64(self.end_date if self.end_date is not None else datetime.now(), 's')
+        span = max(int((end - start) / np.timedelta64(1, 's')), 1)
+
+        return start + self.rng.integers(0, span, size=count).astype('timedelta64[s]')
+
+    def _random_contact(self, node, indptr, indices):
+        degree = indptr[node + 1] - indptr[node]
+        return indices[indptr[node] + (self.rng.random(len(node)) * degree).astype(np.int64)]
+
+    def _draw_contacts(self, origin_id, destination_id, contacts, contact_mix, first_origin):
+        """Replaces uniform destinations with graph contacts.
+
+        Each draw is a constant number of array lookups into the CSR arrays: pick a position between
+        indptr[i] and indptr[i + 1], and for a contact of a contact, repeat from that neighbor.  Draws
+        whose origin (or first hop) has no contacts keep their uniform destination.
+        """
+        indptr, indices = contacts
+        origin_id = origin_id + first_origin
+        neighbor_share, two_hop_share = contact_mix[0], contact_mix[1]
+        degree = np.diff(indptr)
+
+        choice = self.rng.random(len(origin_id))
+        rows = np.flatnonzero((choice < neighbor_share + two_hop_share) & (degree[origin_id] > 0))
+        contact = self._random_contact(origin_id[rows], indptr, indices)
+
+        two_hop = np.flatnonzero(choice[rows] >= neighbor_share)
+        first_hop = contact[two_hop]
+        reachable = two_hop[degree[first_hop] > 0]
+        second_hop = self._random_contact(contact[reachable], indptr, indices)
+
+        # Walking back to the origin keeps the first hop instead.
+        returned = second_hop == origin_id[rows[reachable]]
+        contact[reachable] = np.where(returned, contact[reachable], second_hop)
+
+        destination_id = destination_id.copy()
+        destination_id[rows] = contact
+        return destination_id
+
+    def generate_ids(self, number_of_origins=0, number_of_destinations=0, origin_x=None, origin_y=None,
+                     destination_x=None, destination_y=None, amount_range=None, self_destination=None,
+                     contacts=None, contact_mix=CONTACT_MIX, first_origin=0):
+        """Method that draws one transaction type for every origin, keeping origins and destinations as ids.
+
+        Keyword Arguments:
+            number_of_origins {int} -- How many people make transactions. (default: {0})
+            number_of_destinations {int} -- Size of the pool destinations are drawn from uniformly. (default: {0})
+            origin_x {List} -- X location of each origin. (default: {None})
+            origin_y {List} -- Y location of each origin. (default: {None})
+            destination_x {List} -- X location of each destination.  When given, transactions are placed
+                                    at the destination instead of the origin. (default: {None})
+            destination_y {List} -- Y location of each destination. (default: {None})
+            amount_range {Tuple} -- Inclusive (low, high) range of amounts.  None leaves amounts empty. (default: {None})
+            self_destination {ndarray} -- For each origin, a destination id that counts as sending to itself.
+                                          Those transactions are dropped.  -1 means none. (default: {None})
+            contacts {Tuple} -- (indptr, indices) CSR arrays listing each person's contacts as destination ids.
+                                Origins and destinations must be the same people, so contacts of contacts
+                                can be followed.  When given, destinations follow contact_mix instead of
+                                being uniform. (default: {None})
+            contact_mix {Tuple} -- Shares of destinations drawn from direct contacts, contacts of contacts,
+                                   and the whole pool. (default: {CONTACT_MIX})
+            first_origin {int} -- Row of contacts that origin 0 corresponds to, when drawing for a shard. (default: {0})
+
+        Returns:
+            [Dict] -- origin_id, destination_id, timestamp, amount, x and y arrays, sorted by origin id.  With
+                      temporal options, each origin's rows are also sorted by time.
+        """
+        if number_of_destinations == 0:
+            print("Please provide at least one destination.")
+            raise ValueError
+
+        counts = None
+        if self.temporal is None or self.temporal.arrivals == 'uniform':
+            counts = self.rng.integers(self.min_per_person, self.max_per_person + 1, size=number_of_origins)
+
+        timestamp = None
+        if self.temporal is not None:
+            counts, timestamp = self.temporal.sample(number_of_origins, self.rng, counts,
+                                                     (self.min_per_person + self.max_per_person) / 2)
+
+        origin_id = np.repeat(np.arange(number_of_origins), counts)
+        destination_id = self.rng.integers(0, number_of_destinations, size=len(origin_id))
+        if contacts is not None:
+            destination_id = self._draw_contacts(origin_id, destination_id, contacts, contact_mix, first_origin)
+        if timestamp is None:
+            timestamp = self._draw_dates(len(origin_id))
+
+        amount = None
+        if amount_range is not None:
+            amount = self.rng.integers(amount_range[0], amount_range[1] + 1, size=len(origin_id))
+
+        if self_destination is not None:
+            keep = destination_id != np.asarray(self_destination)[origin_id]
+            origin_id = origin_id[keep]
+            destination_id = destination_id[keep]
+            timestamp = timestamp[keep]
+            if amount is not None:
+                amount = amount[keep]
+
+        if destination_x is not None:
+            x = np.asarray(destination_x, dtype=np.float64)[destination_id]
+            y = np.asarray(destination_y, dtype=np.float64)[destination_id]
+        else:
+            x = np.asarray(origin_x, dtype=np.float64)[origin_id]
+            y = np.asarray(origin_y, dtype=np.float64)[origin_id]
+
+        return {"origin_id": origin_id,
+                "destination_id": destination_id,
+                "timestamp": timestamp,
+                "amount": amount,
+                "x": x,
+                "y": y}
+
+    def generate(self, transaction_type=None, origins=None, origin_x=None, origin_y=None, destinations=None,
+                 destination_x=None, destination_y=None, amount_range=None, exclude_self=False):
+        """Method that generates every transaction of one type in a single vectorized pass.
+
+        Keyword Arguments:
+            transaction_type {str} -- "money", "email", or "phonecall". (default: {None})
+            origins {List} -- The origin identifier of each person, e.g. their credit card. (default: {None})
+            origin_x {List} -- X location of each person. (default: {None})
+            origin_y {List} -- Y location of each person. (default: {None})
+            destinations {List} -- The pool destinations are drawn from uniformly. (default: {None})
+            destination_x {List} -- X location of each destination.  When given, transactions are placed
+                                    at the destination instead of the origin. (default: {None})
+            destination_y {List} -- Y location of each destination. (default: {None})
+            amount_range {Tuple} -- Inclusive (low, high) range of amounts.  None leaves amounts empty. (default: {None})
+            exclude_self {bool} -- Drop transactions whose destination equals their origin. (default: {False})
+
+        Returns:
+            [Dict] -- Column name to NumPy array, in the same layout as Transaction.to_dict().
+        """
+        if transaction_type not in ['money', 'phonecall', 'email']:
+            print("Transaction type only accepts 'money', 'email', or 'phonecall' as inputs.")
+            raise ValueError
+
+        origins = np.asarray(origins, dtype=object)
+        destinations = np.asarray(destinations, dtype=object)
+
+        self_destination = None
+        if exclude_self:
+            self_destination = self_destination_ids(origins, destinations)
+
+        batch = self.generate_ids(len(origins), len(destinations), origin_x, origin_y, destination_x,
+                                  destination_y, amount_range, self_destination)
+
+        amount = batch["amount"] if batch["amount"] is not None else np.full(len(batch["origin_id"]), np.nan)
+
+        return {"origin": origins[batch["origin_id"]],
+                "destination": destinations[batch["destination_id"]],
+                "date": batch["timestamp"],
+                "amount": amount,
+                "transaction-type": np.full(len(batch["origin_id"]), transaction_type, dtype=object),
+                "x": batch["x"],
+                "y": batch["y"]}
+
+
+def self_destination_ids(origins=None, destinations=None):
+    """Finds, for each origin, the destination id holding the same value.
+
+    Keyword Arguments:
+        origins {List} -- The origin identifier of each person. (default: {None})
+        destinations {List} -- The destination pool. (default: {None})
+
+    Returns:
+        [ndarray] -- One destination id per origin, or -1 where the origin isn't in the pool.
+    """
+    index = {value: i for i, value in enumerate(destinations)}
+    return np.fromiter((index.get(value, -1) for value in origins), dtype=np.int64, count=len(origins))
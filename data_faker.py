@@ -1,16 +1,73 @@
+import argparse
 import json
 import math
 import os
 import random
 from typing import List
-import requests
 
-import pandas as pd
-import networkx as nx
+import numpy as np
 
-from copy import deepcopy
+from functools import partial
+from operator import attrgetter
 from datetime import datetime, timedelta
-from faker import Faker
+
+from bulk_transactions import COLUMNS, CONTACT_MIX, BulkTransactionGenerator, self_destination_ids
+from entity_registry import ENTITY_KINDS, EntityRegistry
+from exporters import WRITERS, NodeLinkWriter, open_writer
+from fast_profiles import ProfileGenerator, create_faker
+from inmates import import_inmates
+from instrumentation import NULL_INSTRUMENTATION, Instrumentation, print_progress
+from graphs import CSRGraph, barabasi_albert, erdos_renyi, org_hierarchy, stochastic_block_model, watts_strogatz
+from locations import SyntheticLocationProvider
+from manifest import changed_files, describe_file, read_manifest, run_key, write_manifest
+from pipeline import StageWorker, iter_pending
+from sinks import SINKS, open_sink
+from snapshot import PERSON_FIELDS, load_snapshot, load_state, save_snapshot, save_state, save_transactions
+from transaction_table import TransactionTable, TransactionView
+from sharding import PEOPLE_FIELDS, ShardRunner, generate_people_shard, generate_transaction_shard, shard_ranges, shard_seeds
+from run_config import ARRIVAL_MODES, ATTRIBUTES, COWORKER_EXPORTS, DATABASE_FORMATS, DESTINATION_MODES, ENGINES, FORMATS, GRAPH_TYPES, LOCATION_MODES, POPULATION_PARAMETERS, PROFILE_MODES, RUNTIME_PARAMETERS, TRANSACTION_ATTRIBUTES, TRANSACTION_TYPES, RunConfig
+
+COWORKER_EDGE_COLUMNS = ["person_id", "coworker_id"]
+
+# How many people are created between progress updates.
+PROGRESS_EVERY = 10000
+
+# Most residences waiting on the location provider while profiles are generated.
+PENDING_LOCATIONS = 1024
+
+# Profiles the fast profile generator draws at once.
+PROFILE_CHUNK = 10000
+
+# Most finished tables waiting for the export thread before generation waits for it.
+EXPORT_QUEUE_SIZE = 1
+
+# Seed stage for graph generation.  Stage 0 is people and stages 1 to 3 are the transaction types.
+GRAPH_STAGE = len(TRANSACTION_TYPES) + 1
+
+# Seed stage that each appended transaction window derives its own seed from.
+WINDOW_STAGE = GRAPH_STAGE + 1
+
+# Seed stage of each random source outside the shards.  Every source draws from its own stream, so drawing
+# more from one never changes what another draws.
+SEED_STAGES = {"graph": GRAPH_STAGE,
+               "faker": WINDOW_STAGE + 1,
+               "random": WINDOW_STAGE + 2,
+               "profiles": WINDOW_STAGE + 3,
+               "locations": WINDOW_STAGE + 4,
+               "transactions": WINDOW_STAGE + 5}
+
+
+def derive_seeds(master_seed=None):
+    """Derives the seed of every random source in SEED_STAGES from one master seed.
+
+    Keyword Arguments:
+        master_seed {int} -- The seed the whole run is reproduced from. (default: {None})
+
+    Returns:
+        [Dict] -- The seed of each source, keyed like SEED_STAGES.
+    """
+    return {source: shard_seeds(master_seed, stage, 1)[0] for source, stage in SEED_STAGES.items()}
+
 
 class Transaction:
     """
@@ -83,10 +140,27 @@ class Transaction:
                 "y": self.y}
         
 
+# Columns of the people export and the Person attribute each one comes from.
+PERSON_COLUMNS = {"name": "name",
+                  "company": "company",
+                  "ssn": "ssn",
+                  "address": "address",
+                  "job": "job",
+                  "email": "email",
+                  "birthday": "birthday",
+                  "work-email": "work_email",
+                  "credit_card": "credit_card",
+                  "phone_number": "phone_number",
+                  "x": "location_x",
+                  "y": "location_y"}
+
+
 class Person:
     """
     Class representation of a person.  Includes methods for adding additional details regarding person.
 
+    Fields are plain slotted attributes, so a person carries no per-instance __dict__.
+
     When initializing a Person class the follow elements are needed:
         name:      (String) The name of the fake person.
         company:   (String) The fake company that employs the fake person.
@@ -96,6 +170,10 @@ class Person:
         email:     (String) A person email account for the person.
         birthday:  (Date) The date of birth of the person.  This should be presented as a datetime object.
     """
+    __slots__ = ("name", "company", "ssn", "address", "job", "email", "birthday",
+                 "work_email", "credit_card", "phone_number", "location_x", "location_y", "employee_number",
+                 "credit_card_transactions", "email_transactions", "phone_transactions", "coworker")
+
     def __init__(self, name, company, ssn, address, job, email, birthday):
         self.name = name
         self.company = company
@@ -111,15 +189,15 @@ class Person:
         self.location_x = None
         self.location_y = None
         self.employee_number = None
-        
-        
-        self.credit_card_transactions = []
-        self.email_transactions = []
-        self.phone_transactions = []
-        self.coworker = []
+
+        # Lists are only created once something is added, so people without any cost no list objects.
+        self.credit_card_transactions = ()
+        self.email_transactions = ()
+        self.phone_transactions = ()
+        self.coworker = ()
 
     def __repr__(self):
-        return repr((self._name, self._ssn, self._company))
+        return repr((self.name, self.ssn, self.company))
 
     def to_dict(self):
         """Method to convert the class into a dictionary. Attaches any attributes assigned to the class.
@@ -127,150 +205,18 @@ class Person:
         Returns:
             [Dict] -- Dictionary representation of the class.
         """
-        person = {"name": self.name,
-                  "company": self.company,
-                  "ssn": self.ssn,
-                  "address": self.address,
-                  "job": self.job,
-                  "email": self.email,
-                  "birthday": self.birthday}
-
-        
-        try: person["work-email"] = self._work_email
-        except: pass
-
-        try: person["credit_card"] = self._credit_card
-        except: pass
-
-        try: person["phone_number"] = self._phone_number
-        except: pass
-
-        try: person["x"] = self._location_x
-        except: pass
-
-        try: person["y"] = self._location_y
-        except: pass
-
-        return person
-
-    @property
-    def name(self):
-        return self._name
-    @name.setter
-    def name(self, value):
-        self._name = value
-
-    @property
-    def company(self):
-        return self._company
-    @company.setter
-    def company(self, value):
-        self._company = value
-
-    @property
-    def ssn(self):
-        return self._ssn
-    @ssn.setter
-    def ssn(self, value):
-        self._ssn = value
-
-    @property
-    def address(self):
-        return self._address
-    @address.setter
-    def address(self, value):
-        self._address = value
-
-    @property
-    def job(self):
-        return self._job
-    @job.setter
-    def job(self, value):
-        self._job = value
-
-    @property
-    def email(self):
-        return self._email
-    @email.setter
-    def email(self, value):
-        self._email = value
-
-    @property
-    def birthday(self):
-        return self._birthday
-    @birthday.setter
-    def birthday(self, value):
-        self._birthday = value
-
-    @property
-    def coworker(self):
-        return self._coworker
-    @coworker.setter
-    def coworker(self, value):
-        self._coworker = value
-
-    @property
-    def employee_number(self):
-        return self._employee_number
-    @employee_number.setter
-    def employee_number(self, value):
-        self._employee_number = value
-
-    @property
-    def work_email(self):
-        return self._work_email
-    @work_email.setter
-    def work_email(self, value):
-        self._work_email = value
-
-    @property
-    def credit_card(self):
-        return self._credit_card
-    @credit_card.setter
-    def credit_card(self, value):
-        self._credit_card = value
-
-    @property
-    def phone_number(self):
-        return self._phone_number
-    @phone_number.setter
-    def phone_number(self, value):
-        self._phone_number = value
-
-    @property
-    def credit_card_transactions(self):
-        return self._credit_card_transactions
-    @credit_card_transactions.setter
-    def credit_card_transactions(self, value):
-        self._credit_card_transactions = value
-
-    @property
-    def email_transactions(self):
-        return self._email_transactions
-    @email_transactions.setter
-    def email_transactions(self, value):
-        self._email_transactions = value
-
-    @property
-    def phone_transactions(self):
-        return self._phone_transactions
-    @phone_transactions.setter
-    def phone_transactions(self, value):
-        self._phone_transactions = value
-
-    @property
-    def location_x(self):
-        return self._location_x
-    @location_x.setter
-    def location_x(self, value):
-        self._location_x = value
-
-    @property
-    def location_y(self):
-        return self._location_y
-    @location_y.setter
-    def location_y(self, value):
-        self._location_y = value
+        return {"name": self.name,
+                "company": self.company,
+                "ssn": self.ssn,
+                "address": self.address,
+                "job": self.job,
+                "email": self.email,
+                "birthday": self.birthday,
+                "work-email": self.work_email,
+                "credit_card": self.credit_card,
+                "phone_number": self.phone_number,
+                "x": self.location_x,
+                "y": self.location_y}
 
     def add_credit_card_transaction(self, transaction=None) -> Transaction:
         """Method for adding credit card transactions to the class.
@@ -282,7 +228,9 @@ class Person:
                                          and appends it to the credit_card_transactions 
                                          list. (default: {None})
         """
-        self._credit_card_transactions.append(transaction)
+        if not self.credit_card_transactions:
+            self.credit_card_transactions = []
+        self.credit_card_transactions.append(transaction)
 
     def add_email_transaction(self, transaction=None) -> Transaction:
         """Method for adding email transactions to the class.
@@ -294,7 +242,9 @@ class Person:
                                          and appends it to the email_transactions 
                                          list. (default: {None})
         """
-        self._email_transactions.append(transaction)
+        if not self.email_transactions:
+            self.email_transactions = []
+        self.email_transactions.append(transaction)
 
     def add_phone_transaction(self, transaction=None) -> Transaction:
         """Method for adding phone transactions to the class.
@@ -306,66 +256,154 @@ class Person:
                                          and appends it to the phone_transactions 
                                          list. (default: {None})
         """
-        self._phone_transactions.append(transaction)
+        if not self.phone_transactions:
+            self.phone_transactions = []
+        self.phone_transactions.append(transaction)
 
-    def add_coworker(self, coworker=None) -> str:
-        self._coworker.append(coworker)
+    def add_coworker(self, coworker=None) -> int:
+        if not self.coworker:
+            self.coworker = []
+        self.coworker.append(coworker)
 
-    def get_coworkers(self):
-        coworkers = []
-        worker = self.to_dict()
-        for c in self._coworker:
-            coworker = deepcopy(worker)
-            coworker['coworker'] = c
-            coworkers.append(coworker)
+    def get_coworkers(self, names=None):
+        """Method that lists one record per coworker.
 
-        return coworkers
+        Keyword Arguments:
+            names {List} -- Name of each person id, used to resolve the coworker ids. (default: {None})
+        """
+        worker = self.to_dict()
+        return [dict(worker, coworker=names[c]) for c in self.coworker]
 
     def get_credit_card_transactions(self):
+        if isinstance(self.credit_card_transactions, TransactionView):
+            return self.credit_card_transactions.to_dicts()
+
         transactions = []
 
-        for t in self._credit_card_transactions:
+        for t in self.credit_card_transactions:
             transactions.append(t.to_dict())
 
         return transactions
 
     def get_email_transactions(self):
+        if isinstance(self.email_transactions, TransactionView):
+            return self.email_transactions.to_dicts()
+
         transactions = []
 
-        for t in self._email_transactions:
+        for t in self.email_transactions:
             transactions.append(t.to_dict())
 
         return transactions
 
     def get_phone_transactions(self):
+        if isinstance(self.phone_transactions, TransactionView):
+            return self.phone_transactions.to_dicts()
+
         transactions = []
 
-        for t in self._phone_transactions:
+        for t in self.phone_transactions:
             transactions.append(t.to_dict())
 
         return transactions
     
 
 class DataFaker:
-    def __init__(self):
-        
-        rand_seed = random.randint(0, 50)
-        
-        self.fake = Faker()
-        Faker.seed(rand_seed)
+    """
+    Class that generates a fake population, the social graph between them and their transactions.
+
+    Use execute() to answer the questions interactively, or run() with a RunConfig to generate
+    a dataset without any prompts.
+
+    When initializing a DataFaker class, include the following parameters:
+        location_provider:  (LocationProvider) Places each person's residence.  Chosen from the run
+                            configuration when not given. (Optional)
+        seed:               (Int) Master seed every random source is seeded from.  Drawn at random when not
+                            given, and kept in master_seed. (Optional)
+        output_dir:         (String) Directory the output files are written to.
+        instrumentation:    (Instrumentation) Records stage timings, counters and memory.  Chosen from the
+                            run configuration when not given. (Optional)
+    """
+    def __init__(self, location_provider=None, seed=None, output_dir='.', instrumentation=None):
+        self.fake = create_faker()
+
+        self.seed = seed
+        self.location_provider = location_provider
+        self.instrumentation = instrumentation if instrumentation is not None else NULL_INSTRUMENTATION
+        self.output_dir = output_dir
+        self.chunk_size = 100000
 
         self.G = None
+        self.node_person = None
+        self.destinations = 'uniform'
+        self.contact_mix = CONTACT_MIX
+
+        # TemporalPattern settings for bulk transactions, or None for uniform times.
+        self.temporal = None
+        self.sort_by_time = False
 
+        # Transactions fall between start_date and end_date.  An end_date of None means now.  Each run that
+        # appends to a snapshot is a new window with its own seed.
         self.start_date = datetime.today() - timedelta(days=30)
+        self.end_date = None
+        self.window = 0
 
         self.people = []
         self.companies = []
         self.email_addresses = []
         self.phone_numbers = []
 
-        self.company_addresses = {}
+        # Entity ids for every company, phone number, email, card and inmate.  People are identified by
+        # their position in self.people.
+        self.registry = EntityRegistry()
+        self.company_ids = np.empty(0, dtype=np.int64)
+        self.company_x = np.empty(0, dtype=np.float64)
+        self.company_y = np.empty(0, dtype=np.float64)
 
-        self.execute()
+        self.transactions = TransactionTable(registry=self.registry)
+
+        # Rows written to each output, keyed by _output_key, so appended windows continue the row index.
+        self.rows_written = {}
+
+        # Where each database sink writes: the SQLite file and the PostgreSQL connection string.
+        self.databases = {}
+
+        # Further keyword arguments for each database sink's writer.
+        self.sink_options = {}
+
+        # Manifest entry of each file this run wrote, keyed by its name in output_dir, or None to skip hashing.
+        self.outputs = None
+
+        self.seed_all(seed)
+
+    def seed_all(self, seed=None):
+        """Method that seeds every random source from one master seed.
+
+        Faker, the random module, profiles, synthetic locations, transactions and graph generators each get
+        their own seed derived from the master seed, so no two of them share a stream.  Without a seed the
+        master seed is drawn from the operating system, and it's kept in master_seed, the run report and the
+        manifest so the run can be repeated.
+
+        Keyword Arguments:
+            seed {int} -- The master seed, or None to draw one. (default: {None})
+
+        Returns:
+            [Dict] -- The seed of each random source, keyed like SEED_STAGES.
+        """
+        self.master_seed = seed if seed is not None else random.SystemRandom().randint(0, 2 ** 32 - 1)
+        self.seeds = derive_seeds(self.master_seed)
+
+        # Faker is only imported once a run starts, which keeps `import data_faker` fast.
+        from faker import Faker
+
+        Faker.seed(self.seeds["faker"])
+        random.seed(self.seeds["random"])
+
+        self.transaction_seed = self.master_seed
+        self.profile_generator = ProfileGenerator(self.fake, seed=self.seeds["profiles"])
+        self.bulk_generator = BulkTransactionGenerator(start_date=self.start_date, end_date=self.end_date,
+                                                       seed=self.seeds["transactions"], temporal=self.temporal)
+        return self.seeds
 
     def _get_companies_list(self):
         self.companies = [person.company for person in self.people]
@@ -374,19 +412,33 @@ class DataFaker:
         self.email_addresses = [person.work_email for person in self.people]
 
     def geocode_address(self, address=None):
-        """Use World Geocoder to get XY for one address at a time."""
-        querystring = {
-            "f": "json",
-            "singleLine": address}
-        url = "https://geocode.arcgis.com/arcgis/rest/services/World/GeocodeServer/findAddressCandidates"  # noqa: E501
-        response = requests.request("GET", url, params=querystring)
-        p = response.text
-        j = json.loads(p)
-        location = j['candidates'][0]['location']  # returns first location as X, Y
-        return location
+        """Use the configured location provider to get XY for one address at a time."""
+        return self.location_provider.locate(address)
+
+    def _ask_yes_no(self, question):
+        answer = str(input(f"{question} (y/n):  "))
+
+        if answer not in ['y', 'n']:
+            print("Invalid selection.  Please enter y or n.")
+            answer = str(input(f"{question} (y/n):  "))
+
+        return answer == 'y'
     
-    def _create_random_graph(self, graph_type=None, number_of_people=0):
-        if graph_type not in ['Tree', 'Ring of Cliques', 'Random']:
+    def _create_random_graph(self, graph_type=None, number_of_people=0, graph_options=None):
+        """Method that builds the social graph into self.G as a CSRGraph.
+
+        Tree and Ring of Cliques are built with networkx and converted.  The other types are generated
+        straight into CSR arrays, so graphs with millions of people build in seconds.
+
+        Keyword Arguments:
+            graph_type {str} -- One of GRAPH_TYPES. (default: {None})
+            number_of_people {int} -- How many nodes the graph has.  Ignored for "Ring of Cliques". (default: {0})
+            graph_options {Dict} -- Generator settings, see GRAPH_OPTIONS. (default: {None})
+
+        Returns:
+            [bool] -- True once the graph exists.
+        """
+        if graph_type not in GRAPH_TYPES:
             print("Please enter a valid random graph type.")
             raise ValueError
 
@@ -394,166 +446,245 @@ class DataFaker:
             print("Please enter a number greater than zero for the number of people")
             raise ValueError
 
-        if graph_type == 'Tree' and number_of_people > 0:
-            self.G = nx.random_tree(number_of_people)
-            return True
-
-        if graph_type == 'Ring of Cliques':
-            num_cliques = random.randint(5, 10)
-            clique_size = random.randint(3, 6)
-            prob = random.random()
-            self.G = nx.relaxed_caveman_graph(num_cliques, clique_size, prob)
-            return True
-        
-        if graph_type == 'Random':
-            return False
-    
-    def _create_fake_people(self, number_of_people=0):
+        options = graph_options or {}
+        rng = np.random.default_rng(self.seeds["graph"])
 
-        if number_of_people > 0 and self.G is None:
-            for _ in range(number_of_people):
-                profile = self.fake.profile()
-                person = Person(name=profile['name'],
-                                company=profile['company'],
-                                ssn=profile['ssn'],
-                                address=profile['residence'],
-                                job=profile['job'],
-                                email=profile['mail'],
-                                birthday=profile['birthdate'])
+        if graph_type == 'Tree' and number_of_people > 0:
+            import networkx as nx
 
-                location = self.geocode_address(profile['residence'])
+            self.G = CSRGraph.from_networkx(nx.random_tree(number_of_people, seed=self.seeds["graph"]))
 
-                self.company_addresses[profile['company']] = location
-                
-                person.location_x = location['x']
-                person.location_y = location['y']
+        elif graph_type == 'Ring of Cliques':
+            import networkx as nx
 
-                self.people.append(person)
-                print(person)
+            # One stream sizes the ring and then wires it, so the whole graph follows from the graph seed.
+            graph_random = random.Random(self.seeds["graph"])
+            num_cliques = graph_random.randint(5, 10)
+            clique_size = graph_random.randint(3, 6)
+            prob = graph_random.random()
+            self.G = CSRGraph.from_networkx(nx.relaxed_caveman_graph(num_cliques, clique_size, prob,
+                                                                     seed=graph_random))
 
-            return
+        elif graph_type == 'Random':
+            self.G = erdos_renyi(number_of_people, options.get('average_degree', 4.0), rng)
 
-        if number_of_people > 0 and self.G is not None:
-            count = 0
+        elif graph_type == 'Stochastic Block Model':
+            blocks = max(1, min(options.get('blocks', 10), number_of_people))
+            sizes = [len(block) for block in np.array_split(np.arange(number_of_people), blocks)]
+            # By default each person has about 8 neighbors in their block and 2 outside it.
+            p_in = options.get('p_in', min(8.0 / max(max(sizes) - 1, 1), 1.0))
+            p_out = options.get('p_out', min(2.0 / number_of_people, 1.0))
+            self.G = stochastic_block_model(sizes, p_in, p_out, rng)
 
-            company = ""
+        elif graph_type == 'Barabasi-Albert':
+            self.G = barabasi_albert(number_of_people, options.get('m', 2), rng)
 
-            for node in self.G.nodes(data=True):
-                
-                profile = self.fake.profile()
+        elif graph_type == 'Watts-Strogatz':
+            self.G = watts_strogatz(number_of_people, options.get('k', 4), options.get('p', 0.1), rng)
 
-                if count == 0:
-                    company = profile['company']
-                else:
-                    profile['company'] = company
+        elif graph_type == 'Org Hierarchy':
+            self.G = org_hierarchy(number_of_people, options.get('companies', 5), options.get('branching', 5),
+                                   options.get('peer_probability', 0.5), rng)
 
-                self.G.nodes[count]['name'] = profile['name']
+        return True
+    
+    def _generate_profiles(self, number_of_people=0):
+        if self.profile_generator is not None:
+            return self.profile_generator.iter_profiles(number_of_people, PROFILE_CHUNK)
 
-                person = Person(name=profile['name'],
-                                company=profile['company'],
-                                ssn=profile['ssn'],
-                                address=profile['residence'],
-                                job=profile['job'],
-                                email=profile['mail'],
-                                birthday=profile['birthdate'])
+        return (self.fake.profile() for _ in range(number_of_people))
 
-                try:
-                    location = self.geocode_address(profile['residence'])
+    def _create_fake_people(self, number_of_people=0):
+        if number_of_people <= 0:
+            return
 
-                    self.company_addresses[profile['company']] = location
-                    
-                    person.location_x = location['x']
-                    person.location_y = location['y']
+        if self.G is None:
+            nodes = range(number_of_people)
+        else:
+            nodes = list(self.G.nodes)
+
+        # Everyone in a graph group works for the company of the group's first person.  Graphs without
+        # groups are a single company.
+        group_companies = {}
+        groups = self.G.groups if self.G is not None else None
+
+        def grouped_profiles():
+            for node, profile in zip(nodes, self._generate_profiles(len(nodes))):
+                if self.G is not None:
+                    group = int(groups[node]) if groups is not None else 0
+                    profile['company'] = group_companies.setdefault(group, profile['company'])
+                yield node, profile
+
+        # Each residence goes to the location provider as soon as its profile exists, so lookups overlap with
+        # generating the next profiles.  A bounded number wait at once, so a slow geocoder holds profile
+        # generation back instead of letting unresolved lookups pile up.
+        located = iter_pending(grouped_profiles(), lambda item: self.location_provider.submit(item[1]['residence']),
+                               PENDING_LOCATIONS)
+
+        for count, ((node, profile), location) in enumerate(located):
+            if location is None:
+                print(f"Error processing record {str(count)}")
+                continue
+
+            person = Person(name=profile['name'],
+                            company=profile['company'],
+                            ssn=profile['ssn'],
+                            address=profile['residence'],
+                            job=profile['job'],
+                            email=profile['mail'],
+                            birthday=profile['birthdate'])
+
+            person.location_x = location['x']
+            person.location_y = location['y']
+
+            if self.G is not None:
+                person.employee_number = node
+
+            self.people.append(person)
+
+            if (count + 1) % PROGRESS_EVERY == 0:
+                self.instrumentation.progress("people", count + 1, len(nodes))
+
+        self._index_people()
+        if self.G is not None:
+            self._link_coworkers()
+
+    def _index_people(self):
+        """Method that registers each person's company and indexes people by graph node.
+
+        A company is placed at the location of one of its employees, and companies without a located
+        employee get no location.
+        """
+        self.company_ids = self.registry.intern_many('company', [person.company for person in self.people])
 
-                    person.employee_number = count
+        x = np.array([person.location_x for person in self.people], dtype=np.float64)
+        y = np.array([person.location_y for person in self.people], dtype=np.float64)
+        located = ~np.isnan(x)
 
-                    self.people.append(person)
-                    count +=1
+        self.company_x = np.full(self.registry.count('company'), np.nan)
+        self.company_y = np.full(self.registry.count('company'), np.nan)
+        self.company_x[self.company_ids[located]] = x[located]
+        self.company_y[self.company_ids[located]] = y[located]
 
-                    print(person)
-                except json.JSONDecodeError as e:
-                    print(f"Error processing record {str(count)}")
+        if self.G is not None:
+            self.node_person = np.full(self.G.number_of_nodes, -1, dtype=np.int64)
+            self.node_person[[person.employee_number for person in self.people]] = np.arange(len(self.people))
 
-            for person in self.people:
-                neighbor_list = list(nx.neighbors(self.G, person.employee_number))
-                for neighbor in neighbor_list:
-                    person.add_coworker(self.G.nodes[neighbor]['name'])
-            return
+    def _link_coworkers(self):
+        for person in self.people:
+            neighbors = self.node_person[self.G.neighbors(person.employee_number)]
+            person.coworker = neighbors[neighbors >= 0].tolist()
 
-    def _create_fake_work_email(self):
-        work_email = str(input("Would you like a work email addresses created? (y/n):  "))
+    def _create_sharded_people(self, number_of_people=0, config=None):
+        """Method that generates people, their locations and attributes across a pool of worker processes.
 
-        if work_email not in ['y', 'n']:
-            print("Invalid selection.  Please enter y or n.")
-            work_email = str(input("Would you like a work email addresses created?:  "))
-        
-        if work_email is 'y':
-            for person in self.people:
-                person.work_email = person.name.replace(" ", ".") + "@" + self.fake.domain_name()    
-            return True
+        Each shard is seeded from the master seed and its position, so the people produced do not depend
+        on how many workers run them.
 
-        else:
-            return False
+        Keyword Arguments:
+            number_of_people {int} -- How many people to create.  Ignored when a graph exists. (default: {0})
+            config {RunConfig} -- Supplies the seed, worker count, shard size, location mode and attributes. (default: {None})
+        """
+        nodes = list(self.G.nodes) if self.G is not None else list(range(number_of_people))
+        shards = shard_ranges(len(nodes), config.shard_size)
+        seeds = shard_seeds(self.master_seed, 0, len(shards))
+
+        companies = None
+        groups = None
+        if self.G is not None:
+            groups = self.G.groups
+            companies = [self.fake.company() for _ in range(int(groups.max()) + 1 if groups is not None else 1)]
+
+        # Workers geocode against the run's cache, which only this process writes to.
+        cache = getattr(self.location_provider, 'cache', None)
+
+        shared = {"companies": companies,
+                  "groups": groups,
+                  "locations": config.locations,
+                  "geocode_cache": cache.path if cache is not None else ":memory:",
+                  "profiles": config.profiles,
+                  "attributes": config.attributes}
+
+        progress = partial(self.instrumentation.progress, "people")
+        results = ShardRunner(config.workers).map(generate_people_shard,
+                                                  [(seed, start, stop) for seed, (start, stop) in zip(seeds, shards)],
+                                                  shared, progress)
+
+        for shard in results:
+            if cache is not None and 'geocodes' in shard:
+                cache.add_entries(shard['geocodes'])
+
+            for values in zip(*(shard[field] for field in PEOPLE_FIELDS)):
+                row = dict(zip(PEOPLE_FIELDS, values))
+                node = nodes[row['node']]
+
+                person = Person(name=row['name'],
+                                company=row['company'],
+                                ssn=row['ssn'],
+                                address=row['address'],
+                                job=row['job'],
+                                email=row['email'],
+                                birthday=row['birthday'])
+
+                person.location_x = row['x']
+                person.location_y = row['y']
+                person.phone_number = row['phone_number']
+                person.work_email = row['work_email']
+                person.credit_card = row['credit_card']
+
+                if row['phone_number'] is not None:
+                    self.phone_numbers.append(row['phone_number'])
+
+                if self.G is not None:
+                    person.employee_number = node
 
-    def _create_fake_phone_number(self):
-        phone_number = str(input("Would you like a phone number created? (y/n):  "))
+                self.people.append(person)
 
-        if phone_number not in ['y', 'n']:
-            print("Invalid selection.  Please enter y or n.")
-            phone_number = str(input("Would you like a phone number created? (y/n):  "))
-        
-        if phone_number is 'y':
-            for person in self.people:
-                person.phone_number = self.fake.phone_number()
-                self.phone_numbers.append(person.phone_number)
-            return True
+        self._get_companies_list()
+        self._get_email_list()
+        self._index_people()
 
-        else:
-            return False
+        if self.G is not None:
+            self._link_coworkers()
 
-    def _create_fake_credit_card(self):
-        credit_card = str(input("Would you like a fake credit card created? (y/n):  "))
+    def _create_fake_work_email(self):
+        for person in self.people:
+            person.work_email = person.name.replace(" ", ".") + "@" + self.fake.domain_name()    
+        return True
 
-        if credit_card not in ['y', 'n']:
-            print("Invalid selection.  Please enter y or n.")
-            credit_card= str(input("Would you like a fake credit card created? (y/n):  "))
+    def _create_fake_phone_number(self):
+        for person in self.people:
+            person.phone_number = self.fake.phone_number()
+            self.phone_numbers.append(person.phone_number)
+        return True
 
-        if credit_card is 'y':
-            for person in self.people:
-                person.credit_card = self.fake.credit_card_number()
-            return True
-        
-        else:
-            return False
+    def _create_fake_credit_card(self):
+        for person in self.people:
+            person.credit_card = self.fake.credit_card_number()
+        return True
 
     def _generate_transactions(self, transaction_type=None):
-        transactions = str(input(f"Would you like to generate fake {transaction_type} transactions? (y/n):  "))
-
-        if transactions not in ['y', 'n']:
-            print("Invalid selection.  Please enter y or n.")
-            transactions = str(input(f"Would you like to generate fake {transaction_type} transactions? (y/n):  "))
-        
-
         for person in self.people:
             for _ in range(random.randint(1, 10)):
 
-                if transaction_type is "money":
+                if transaction_type == "money":
                     receiving_party = random.choice(self.companies)
+                    company_id = self.registry.id_of('company', receiving_party)
                     transaction = Transaction(origin=person.credit_card,
                                             destination=receiving_party,
-                                            date=self.fake.date_time_between(self.start_date, end_date='now'),
+                                            date=self.fake.date_time_between(self.start_date, end_date=self.end_date or 'now'),
                                             amount=random.randint(1, 1000),
                                             transaction_type=transaction_type,
-                                            x=self.company_addresses[receiving_party]['x'],
-                                            y=self.company_addresses[receiving_party]['y'])
+                                            x=float(self.company_x[company_id]),
+                                            y=float(self.company_y[company_id]))
 
 
                     person.add_credit_card_transaction(transaction)
 
-                elif transaction_type is "email":
+                elif transaction_type == "email":
                     transaction = Transaction(origin=person.work_email,
                                               destination=random.choice(self.email_addresses),
-                                              date=self.fake.date_time_between(self.start_date, end_date='now'),
+                                              date=self.fake.date_time_between(self.start_date, end_date=self.end_date or 'now'),
                                               amount=None,
                                               transaction_type=transaction_type,
                                               x=person.location_x,
@@ -562,10 +693,10 @@ class DataFaker:
                     if transaction.origin != transaction.destination:
                         person.add_email_transaction(transaction)
 
-                elif transaction_type is "phonecall":
+                elif transaction_type == "phonecall":
                     transaction = Transaction(origin=person.phone_number,
                                               destination=random.choice(self.phone_numbers),
-                                              date=self.fake.date_time_between(self.start_date, end_date='now'),
+                                              date=self.fake.date_time_between(self.start_date, end_date=self.end_date or 'now'),
                                               amount=None,
                                               transaction_type=transaction_type,
                                               x=person.location_x,
@@ -575,173 +706,938 @@ class DataFaker:
                         person.add_phone_transaction(transaction)
 
     def _generate_inmate_transactions(self, transaction_type=None, inmate_list=None):
-            transactions = str(input(f"Would you like to generate fake {transaction_type} transactions? (y/n):  "))
+        for person in self.people:
+            for _ in range(random.randint(1, 10)):
 
-            if transactions not in ['y', 'n']:
-                print("Invalid selection.  Please enter y or n.")
-                transactions = str(input(f"Would you like to generate fake {transaction_type} transactions? (y/n):  "))
-            
+                if transaction_type == "money":
+                    receiving_party = random.choice(inmate_list)
+                    transaction = Transaction(origin=person.credit_card,
+                                            destination=receiving_party,
+                                            date=self.fake.date_time_between(self.start_date, end_date=self.end_date or 'now'),
+                                            amount=random.randint(1, 50),
+                                            transaction_type=transaction_type,
+                                            x=person.location_x,
+                                            y=person.location_y)
 
+
+                    person.add_credit_card_transaction(transaction)
+
+                elif transaction_type == "email":
+                    transaction = Transaction(origin=person.work_email,
+                                            destination=random.choice(inmate_list),
+                                            date=self.fake.date_time_between(self.start_date, end_date=self.end_date or 'now'),
+                                            amount=None,
+                                            transaction_type=transaction_type,
+                                            x=person.location_x,
+                                            y=person.location_y)
+
+                    if transaction.origin != transaction.destination:
+                        person.add_email_transaction(transaction)
+
+                elif transaction_type == "phonecall":
+                    transaction = Transaction(origin=person.phone_number,
+                                            destination=random.choice(inmate_list),
+                                            date=self.fake.date_time_between(self.start_date, end_date=self.end_date or 'now'),
+                                            amount=None,
+                                            transaction_type=transaction_type,
+                                            x=person.location_x,
+                                            y=person.location_y)
+
+                    if transaction.origin != transaction.destination:
+                        person.add_phone_transaction(transaction)
+
+    def _generate_bulk_transactions(self, transaction_type=None, inmates=None):
+        """Method that generates every transaction of one type into the shared transaction table.
+
+        Keyword Arguments:
+            transaction_type {str} -- "money", "email", or "phonecall". (default: {None})
+            inmates {ndarray} -- When given, every transaction targets one of these inmate entity ids. (default: {None})
+        """
+        pool = self._transaction_pool(transaction_type, inmates)
+
+        batch = self.bulk_generator.generate_ids(len(pool["origins"]), len(pool["destinations"]),
+                                                 pool["origin_x"], pool["origin_y"],
+                                                 pool["destination_x"], pool["destination_y"],
+                                                 pool["amount_range"], pool["self_destination"],
+                                                 pool["contacts"], pool["contact_mix"])
+
+        self._store_transactions(transaction_type, pool, [batch])
+
+    def _transaction_pool(self, transaction_type=None, inmates=None):
+        """Method that gathers everything needed to draw one transaction type for the whole population.
+
+        Keyword Arguments:
+            transaction_type {str} -- "money", "email", or "phonecall". (default: {None})
+            inmates {ndarray} -- When given, every transaction targets one of these inmate entity ids. (default: {None})
+
+        Returns:
+            [Dict] -- Origin and destination entity ids, their locations, the amount range and each origin's own
+                      destination id.  Destinations are drawn as positions in the destinations array.
+        """
+        # Entity kinds are named after the Person attribute holding them.
+        origin_kind = {"money": "credit_card",
+                       "email": "work_email",
+                       "phonecall": "phone_number"}[transaction_type]
+
+        origins = self.registry.intern_many(origin_kind, [getattr(person, origin_kind) for person in self.people])
+
+        pool = {"origin_kind": origin_kind,
+                "origins": origins,
+                "origin_x": np.array([person.location_x for person in self.people], dtype=np.float64),
+                "origin_y": np.array([person.location_y for person in self.people], dtype=np.float64),
+                "destination_x": None,
+                "destination_y": None,
+                "amount_range": None,
+                "self_destination": None,
+                "contacts": None,
+                "contact_mix": self.contact_mix}
+
+        if inmates is not None:
+            pool["destination_kind"] = "inmate"
+            pool["destinations"] = np.asarray(inmates, dtype=np.int64)
+            if transaction_type == "money":
+                pool["amount_range"] = (1, 50)
+
+        elif transaction_type == "money":
+            # One entry per employee, so larger companies receive more payments.
+            pool["destination_kind"] = "company"
+            pool["destinations"] = self.company_ids
+            pool["destination_x"] = self.company_x[self.company_ids]
+            pool["destination_y"] = self.company_y[self.company_ids]
+            pool["amount_range"] = (1, 1000)
+
+        else:
+            # Email and phone calls go to everyone's work email or phone number, the same entities people send from.
+            pool["destination_kind"] = origin_kind
+            pool["destinations"] = origins
+
+        # Ids only match within one kind, so sending to yourself is only possible in email and phone pools.
+        if pool["destination_kind"] == origin_kind:
+            pool["self_destination"] = self_destination_ids(origins, pool["destinations"])
+
+            # Email and phone pools hold one entry per person, so person ids double as destination ids.
+            if self.destinations == 'graph':
+                pool["contacts"] = self._contact_graph()
+
+        return pool
+
+    def _contact_graph(self):
+        """Method that lays the social graph out by person id instead of by graph node.
+
+        Returns:
+            [Tuple] -- (indptr, indices) CSR arrays of each person's coworkers.
+        """
+        node_person = self.node_person
+
+        if np.array_equal(node_person, np.arange(self.G.number_of_nodes)):
+            return self.G.indptr, self.G.indices
+
+        # Some people were skipped, so drop their edges and renumber the rest.
+        source, target = self.G.edge_arrays()
+        source = node_person[source]
+        target = node_person[target]
+        keep = (source >= 0) & (target >= 0)
+        contacts = CSRGraph.from_edges(len(self.people), source[keep], target[keep])
+        return contacts.indptr, contacts.indices
+
+    def _store_transactions(self, transaction_type=None, pool=None, batches=None):
+        """Method that appends generated batches to the transaction table and points each person at their rows.
+
+        Keyword Arguments:
+            transaction_type {str} -- "money", "email", or "phonecall". (default: {None})
+            pool {Dict} -- The pool the batches were drawn from. (default: {None})
+            batches {List} -- Batches from BulkTransactionGenerator.generate_ids, in origin order. (default: {None})
+        """
+        self.transactions.set_entities(transaction_type, pool["origin_kind"], pool["origins"], pool["destination_kind"])
+
+        start = len(self.transactions)
+        for batch in batches:
+            batch = dict(batch, destination_id=pool["destinations"][batch["destination_id"]])
+            self.transactions.append(transaction_type, **batch)
+
+        # Rows are sorted by person, so each person's transactions are one contiguous range.
+        origin_id = self.transactions.column("origin_id")[start:]
+        bounds = (start + np.searchsorted(origin_id, np.arange(len(self.people) + 1))).tolist()
+        for i, person in enumerate(self.people):
+            view = TransactionView(self.transactions, transaction_type, bounds[i], bounds[i + 1])
+            if transaction_type == "money":
+                person.credit_card_transactions = view
+            elif transaction_type == "email":
+                person.email_transactions = view
+            else:
+                person.phone_transactions = view
+
+    def _generate_sharded_transactions(self, transaction_types=None, inmates=None, config=None):
+        """Method that generates transactions across a pool of worker processes.
+
+        Every (type, shard) pair gets its own seed derived from the master seed, and batches are merged in
+        shard order, so the table is the same for any number of workers.
+
+        Keyword Arguments:
+            transaction_types {List} -- Which of "phonecall", "email" and "money" to generate. (default: {None})
+            inmates {ndarray} -- When given, every transaction targets one of these inmate entity ids. (default: {None})
+            config {RunConfig} -- Supplies the worker count and shard size. (default: {None})
+        """
+        shards = shard_ranges(len(self.people), config.shard_size)
+        pools = {transaction_type: self._transaction_pool(transaction_type, inmates)
+                 for transaction_type in transaction_types}
+
+        tasks = []
+        for transaction_type in transaction_types:
+            seeds = shard_seeds(self.transaction_seed, 1 + TRANSACTION_TYPES.index(transaction_type), len(shards))
+            tasks.extend((transaction_type, seed, start, stop) for seed, (start, stop) in zip(seeds, shards))
+
+        shared = {"pools": {transaction_type: {key: value for key, value in pool.items() if key != "origins"}
+                            for transaction_type, pool in pools.items()},
+                  "start_date": self.start_date,
+                  "end_date": self.end_date if self.end_date is not None else datetime.now(),
+                  "temporal": self.temporal}
+
+        progress = partial(self.instrumentation.progress, "transactions")
+        results = ShardRunner(config.workers).map(generate_transaction_shard, tasks, shared, progress)
+
+        for transaction_type in transaction_types:
+            batches = [batch for task, batch in zip(tasks, results) if task[0] == transaction_type]
+            self._store_transactions(transaction_type, pools[transaction_type], batches)
+
+    def _iter_records(self, transaction_type=None):
+        if transaction_type == "money":
             for person in self.people:
-                for _ in range(random.randint(1, 10)):
-
-                    if transaction_type is "money":
-                        receiving_party = random.choice(inmate_list)
-                        transaction = Transaction(origin=person.credit_card,
-                                                destination=receiving_party,
-                                                date=self.fake.date_time_between(self.start_date, end_date='now'),
-                                                amount=random.randint(1, 50),
-                                                transaction_type=transaction_type,
-                                                x=person.location_x,
-                                                y=person.location_y)
-
-
-                        person.add_credit_card_transaction(transaction)
-
-                    elif transaction_type is "email":
-                        transaction = Transaction(origin=person.work_email,
-                                                destination=random.choice(inmate_list),
-                                                date=self.fake.date_time_between(self.start_date, end_date='now'),
-                                                amount=None,
-                                                transaction_type=transaction_type,
-                                                x=person.location_x,
-                                                y=person.location_y)
-
-                        if transaction.origin != transaction.destination:
-                            person.add_email_transaction(transaction)
-
-                    elif transaction_type is "phonecall":
-                        transaction = Transaction(origin=person.phone_number,
-                                                destination=random.choice(inmate_list),
-                                                date=self.fake.date_time_between(self.start_date, end_date='now'),
-                                                amount=None,
-                                                transaction_type=transaction_type,
-                                                x=person.location_x,
-                                                y=person.location_y)
-
-                        if transaction.origin != transaction.destination:
-                            person.add_phone_transaction(transaction)
-
-    def _to_pandas_dataframe(self, transaction_type=None):
-        data = []
-        
-        if transaction_type is "money":
-            for person in self.people:
-                for purchase in person.get_credit_card_transactions():
-                    data.append(purchase)
+                yield from person.get_credit_card_transactions()
 
-        elif transaction_type is "email":
+        elif transaction_type == "email":
             for person in self.people:
-                for email in person.get_email_transactions():
-                    data.append(email)
+                yield from person.get_email_transactions()
 
-        elif transaction_type is "phonecall":
+        elif transaction_type == "phonecall":
             for person in self.people:
-                for call in person.get_phone_transactions():
-                    data.append(call)
+                yield from person.get_phone_transactions()
 
-        elif transaction_type is "coworker":
+        elif transaction_type == "coworker":
+            names = [person.name for person in self.people]
             for person in self.people:
-                for coworker in person.get_coworkers():
-                    data.append(coworker)
+                yield from person.get_coworkers(names)
         
-        elif transaction_type is "people":
+        elif transaction_type == "people":
             for person in self.people:
-                data.append(person.to_dict())
+                yield person.to_dict()
 
-        df = pd.DataFrame(data)
-        df.to_csv(transaction_type + ".csv")
+    def _iter_coworker_edges(self, chunk_size=100000):
+        """Method that streams the coworker edges straight from the graph adjacency.
 
-    def _to_d3_json(self):
-        d3_json = str(input("Would you like to export to D3 JSON?  "))
-        if d3_json == 'y':
-            from networkx.readwrite import json_graph
-            import json
+        Every edge appears once in each direction, ordered by person, matching the rows of the joined export.
 
-            d3_json_data = json_graph.node_link_data(self.G)
+        Keyword Arguments:
+            chunk_size {int} -- Largest number of edges yielded at once. (default: {100000})
 
-            with open("data.json", "w") as jsonfile:
-                json.dump(d3_json_data, jsonfile, indent=4)
-        
+        Yields:
+            [Tuple] -- person_id and coworker_id arrays, where ids are rows of the people export.
+        """
+        indptr, indices = self._contact_graph()
+        for start in range(0, len(indices), chunk_size):
+            positions = np.arange(start, min(start + chunk_size, len(indices)))
+            yield np.searchsorted(indptr, positions, side='right') - 1, indices[positions]
+
+    def _iter_coworker_columns(self, chunk_size=100000):
+        """Method that joins each coworker edge to the person's attributes and the coworker's name, a chunk at a time.
+
+        Keyword Arguments:
+            chunk_size {int} -- Largest number of edges joined at once. (default: {100000})
+
+        Yields:
+            [Dict] -- The people export columns plus "coworker" for the next chunk of edges.
+        """
+        people = {column: np.array(list(map(attrgetter(attribute), self.people)), dtype=object)
+                  for column, attribute in PERSON_COLUMNS.items()}
+
+        for person_id, coworker_id in self._iter_coworker_edges(chunk_size):
+            columns = {column: values[person_id].tolist() for column, values in people.items()}
+            columns["coworker"] = people["name"][coworker_id].tolist()
+            yield columns
+
+    def _database(self, file_format=None):
+        # Every table goes to the same database, named after its file.
+        database = self.databases.get(file_format)
+        if database is None and file_format == 'sqlite':
+            database = os.path.join(self.output_dir, "data.sqlite")
+        return database
+
+    def _output_key(self, transaction_type=None, file_format='csv'):
+        """Method that names where a table is written, so rows an earlier window wrote are only continued
+        when this window writes to the same place.
+
+        Files and SQLite tables are keyed by their resolved path.  PostgreSQL tables are keyed by name alone,
+        which keeps the connection string and its credentials out of the snapshot.
+
+        Keyword Arguments:
+            transaction_type {str} -- The table. (default: {None})
+            file_format {str} -- "csv", "parquet", "sqlite", or "postgres". (default: {'csv'})
+
+        Returns:
+            [str] -- The key.
+        """
+        if file_format == 'postgres':
+            return f"{transaction_type}.{file_format}"
+
+        if file_format == 'sqlite':
+            return f"{os.path.abspath(self._database(file_format))}:{transaction_type}"
+
+        return os.path.abspath(os.path.join(self.output_dir, f"{transaction_type}.{file_format}"))
+
+    def _open_writer(self, path=None, file_format='csv', columns=None, first_row=0):
+        if file_format in SINKS:
+            return open_sink(self._database(file_format), file_format, os.path.basename(path), columns,
+                             self.chunk_size, first_row, self.sink_options.get(file_format))
+
+        return open_writer(path, file_format, columns, self.chunk_size, first_row)
+
+    def _export_records(self, transaction_type=None, file_format='csv'):
+        """Method that streams one table to disk, or into a database, in fixed size chunks.
+
+        Keyword Arguments:
+            transaction_type {str} -- "money", "email", "phonecall", "coworker", "coworker_edges", or "people".
+                                      (default: {None})
+            file_format {str} -- "csv", "parquet", "sqlite", or "postgres". (default: {'csv'})
+        """
+        path = os.path.join(self.output_dir, transaction_type)
+        key = self._output_key(transaction_type, file_format)
+
+        # Rows from earlier windows stay where they are.  CSV files and database tables are appended to, and
+        # Parquet files, which can't be, get one more part file per window.
+        first_row = self.rows_written.get(key, 0)
+        if first_row > 0 and file_format == 'parquet':
+            path = f"{path}.{self.window}"
+
+        if transaction_type in self.transactions.origin_entities:
+            total = len(self.transactions.rows(transaction_type))
+            with self._open_writer(path, file_format, COLUMNS, first_row) as writer:
+                for columns in self.transactions.iter_columns(transaction_type, self.chunk_size, self.sort_by_time):
+                    if len(columns["origin"]) == 0:
+                        continue
+                    writer.write_columns(columns)
+                    self.instrumentation.progress(f"export:{transaction_type}", writer.rows_written, total)
+        elif transaction_type == "coworker":
+            with self._open_writer(path, file_format, list(PERSON_COLUMNS) + ["coworker"]) as writer:
+                for columns in self._iter_coworker_columns(self.chunk_size):
+                    writer.write_columns(columns)
+        elif transaction_type == "coworker_edges":
+            with self._open_writer(path, file_format, COWORKER_EDGE_COLUMNS) as writer:
+                for person_id, coworker_id in self._iter_coworker_edges(self.chunk_size):
+                    writer.write_columns({"person_id": person_id, "coworker_id": coworker_id})
+        elif transaction_type == "people":
+            with self._open_writer(path, file_format, list(PERSON_COLUMNS)) as writer:
+                for start in range(0, len(self.people), self.chunk_size):
+                    people = self.people[start:start + self.chunk_size]
+                    writer.write_columns({column: list(map(attrgetter(attribute), people))
+                                          for column, attribute in PERSON_COLUMNS.items()})
         else:
-            pass
+            columns = COLUMNS if transaction_type in TRANSACTION_TYPES else None
+            with self._open_writer(path, file_format, columns, first_row) as writer:
+                writer.write_records(self._iter_records(transaction_type))
 
-    def _import_inmate_data(self, csv_file: str) -> List:
-        import csv
+        self.rows_written[key] = first_row + writer.rows_written
+        self.instrumentation.count(f"rows:{transaction_type}.{file_format}", writer.rows_written)
 
-        inmates = []
-        with open(csv_file, 'r') as csvfile:
-            reader = csv.reader(csvfile, delimiter=',')
-            for row in reader:
-                inmates.append(row[0])
-        
-        return list(set(inmates))
+        if file_format in WRITERS:
+            # CSV files hold every window's rows, Parquet part files only their own.
+            self._record_output(writer.path, self.rows_written[key] if file_format == 'csv' else writer.rows_written)
 
-    
-    
-    def execute(self):
+    def _record_output(self, path=None, rows=None):
+        """Method that hashes a finished output file into this run's manifest.
 
-        inmate_data = str(input("Would you like to import existing inmate data?: "))
+        Files are hashed by the export stage as soon as they're closed, so hashing overlaps with generating
+        the next table.
 
-        if inmate_data == 'Yes' or inmate_data == 'y':
-            csv_path = str(input("What is the path to input inmate dataset?: "))
-            inmates = self._import_inmate_data(csv_file=csv_path)
-
-            num_people = math.ceil(len(inmates) * .6)
-            
-            self._create_fake_people(num_people)
-            
-            phone_number = self._create_fake_phone_number()
-            if phone_number:
-                self._generate_inmate_transactions("phonecall", inmates)
-                self._to_pandas_dataframe("phonecall")
-
-            email = self._create_fake_work_email()
-            if email:
-                self._get_email_list()
-                self._generate_inmate_transactions("email", inmates)
-                self._to_pandas_dataframe("email")
-            
-            credit_card = self._create_fake_credit_card()
-            if credit_card:
-                self._generate_inmate_transactions("money", inmates)
-                self._to_pandas_dataframe("money")
-
-            self._to_pandas_dataframe("people")
-
-            exit()
-        
-        graph_type = str(input("What type of graph would you like to create? (Tree, Ring of Cliques, or Random): "))
-        if graph_type != 'Ring of Cliques':
-            num_people = int(input("How many people would you like to create? (Please enter whole number):  "))
+        Keyword Arguments:
+            path {str} -- The file. (default: {None})
+            rows {int} -- Rows the file holds, or None when it isn't a single table. (default: {None})
+        """
+        if self.outputs is not None:
+            self.outputs[os.path.relpath(path, self.output_dir)] = describe_file(path, rows)
+
+    def _export_stage(self, transaction_type=None, options=None):
+        """Method that runs one export job of the pipeline as its own stage.
+
+        Keyword Arguments:
+            transaction_type {str} -- The table to export, or "d3" for the node-link JSON. (default: {None})
+            options {List} -- The formats to write, or the D3 options for "d3". (default: {None})
+        """
+        with self.instrumentation.stage(f"export:{transaction_type}"):
+            if transaction_type == "d3":
+                self._to_d3_json(options)
+            else:
+                self._export(transaction_type, options)
+
+    def _queue_population_exports(self, exporter=None, config=None, tree=False):
+        # People and coworkers don't change once attributes exist, so they're written during transaction generation.
+        exporter.put("people", config.formats)
+        if tree and config.coworkers in ['joined', 'both']:
+            exporter.put("coworker", config.formats)
+        if tree and config.coworkers in ['edges', 'both']:
+            exporter.put("coworker_edges", config.formats)
+
+    def _export(self, transaction_type=None, formats=None):
+        for file_format in formats:
+            if file_format in WRITERS or file_format in SINKS:
+                self._export_records(transaction_type, file_format)
+
+    def _to_d3_json(self, options=None):
+        """Method that streams the social graph to data.json as D3 node-link JSON.
+
+        Keyword Arguments:
+            options {Dict} -- Settings from D3_OPTIONS.  "compact" drops the indentation, "compression" set to
+                              "gzip" writes data.json.gz, "attributes" adds people export columns such as "company"
+                              to each node next to "name", and "weights" adds the number of email and phone calls
+                              between the two people to each link. (default: {None})
+        """
+        options = options or {}
+
+        columns = ["name"] + [column for column in options.get('attributes', []) if column != "name"]
+        for column in columns:
+            if column not in PERSON_COLUMNS:
+                print(f"D3 attributes only accepts {', '.join(PERSON_COLUMNS)} as inputs.")
+                raise ValueError
+
+        # Nodes without a person get None, which leaves the attribute off, through the extra entry at -1.
+        node_person = self.node_person
+        values = {column: np.array(list(map(attrgetter(PERSON_COLUMNS[column]), self.people)) + [None], dtype=object)
+                  for column in columns}
+
+        weights = self._edge_weights() if options.get('weights', False) else None
+
+        path = os.path.join(self.output_dir, "data.json")
+        if options.get('compression') == 'gzip':
+            path += ".gz"
+
+        with NodeLinkWriter(path, options.get('compact', False), options.get('compression')) as writer:
+            for start in range(0, self.G.number_of_nodes, self.chunk_size):
+                nodes = np.arange(start, min(start + self.chunk_size, self.G.number_of_nodes))
+                writer.write_nodes(nodes, {column: column_values[node_person[nodes]]
+                                           for column, column_values in values.items()})
+
+            for source, target in self.G.iter_edges(self.chunk_size):
+                links = None
+                if weights is not None:
+                    links = {"weight": weights[writer.links_written:writer.links_written + len(source)]}
+                writer.write_links(source, target, links)
+
+        self.instrumentation.count("rows:d3.nodes", writer.nodes_written)
+        self.instrumentation.count("rows:d3.links", writer.links_written)
+        self._record_output(path)
+
+    def _edge_weights(self):
+        """Method that counts the email and phone call transactions between the two people of each graph edge.
+
+        Transactions in either direction count, and transactions between people who aren't neighbors are
+        ignored.  Only transactions in the transaction table, which the bulk engine fills, are counted.
+
+        Returns:
+            [ndarray] -- One count per edge, in the order of CSRGraph.edge_arrays.
+        """
+        source, target = self.G.edge_arrays()
+        number_of_nodes = self.G.number_of_nodes
+        edges = source * number_of_nodes + target
+        weights = np.zeros(len(edges), dtype=np.int64)
+
+        person_node = np.array([person.employee_number for person in self.people], dtype=np.int64)
+        origin_id = self.transactions.column("origin_id")
+        destination_id = self.transactions.column("destination_id")
+
+        for transaction_type, (kind, origin_entities) in self.transactions.origin_entities.items():
+            # Only email and phone calls go from one person's entity to another's.
+            if self.transactions.destination_kinds[transaction_type] != kind:
+                continue
+
+            entity_person = np.full(self.registry.count(kind), -1, dtype=np.int64)
+            entity_person[origin_entities] = np.arange(len(origin_entities))
+
+            rows = self.transactions.rows(transaction_type)
+            origin = person_node[origin_id[rows]]
+            destination = entity_person[destination_id[rows]]
+            known = destination >= 0
+            origin, destination = origin[known], person_node[destination[known]]
+
+            keys = np.minimum(origin, destination) * number_of_nodes + np.maximum(origin, destination)
+            positions = np.searchsorted(edges, keys)
+            found = positions < len(edges)
+            found[found] = edges[positions[found]] == keys[found]
+            weights += np.bincount(positions[found], minlength=len(edges))
+
+        return weights
+
+    def _import_inmate_data(self, csv_file: str, key_columns: List = None, index_path: str = None) -> np.ndarray:
+        """Method that streams an inmate roster into the registry in chunks of chunk_size rows.
+
+        Arguments:
+            csv_file {str} -- Path to the roster.
+
+        Keyword Arguments:
+            key_columns {List} -- Column positions or names that identify an inmate.  Defaults to the first column.
+                                  (default: {None})
+            index_path {str} -- Directory of an on-disk id index that later runs can load instead of the roster.
+                                (default: {None})
+
+        Returns:
+            [ndarray] -- Entity id of each distinct inmate, in order of first appearance in the roster.
+        """
+        return import_inmates(csv_file, self.registry, key_columns, self.chunk_size, index_path)
+
+    def _run_key(self, config=None):
+        """Method that builds the key of everything that decides what this run writes.
+
+        The key covers the settings, the master seed and the time window.  Settings in RUNTIME_PARAMETERS
+        only change how the run goes, so they're left out.  Of the worker count only whether the run is
+        sharded is kept, since every worker count writes the same files.  The inmate roster is covered by its
+        size and modification time.
+
+        Keyword Arguments:
+            config {RunConfig} -- The run configuration. (default: {None})
+
+        Returns:
+            [str] -- The key, as hex.
+        """
+        values = {key: value for key, value in config.to_dict().items() if key not in RUNTIME_PARAMETERS}
+        values.update(sharded=config.workers is not None,
+                      master_seed=self.master_seed,
+                      window=self.window,
+                      start_date=self.start_date.isoformat(),
+                      end_date=self.end_date.isoformat())
+
+        if config.inmate_csv is not None:
+            status = os.stat(config.inmate_csv)
+            values["inmate_source"] = [status.st_size, status.st_mtime_ns]
+
+        return run_key(values)
+
+    def _write_manifest(self, config=None, key=None):
+        """Method that writes manifest.json with the digest, size and rows of every file written so far.
+
+        An appended run keeps the entries of earlier windows' files it didn't write again.  Databases are
+        only listed when they're a file, which leaves PostgreSQL out.
+
+        Keyword Arguments:
+            config {RunConfig} -- The run configuration. (default: {None})
+            key {str} -- The run key from _run_key. (default: {None})
+        """
+        files = {}
+        previous = read_manifest(self.output_dir) if config.append else None
+        if previous is not None:
+            files.update(previous["files"])
+
+        if 'sqlite' in config.formats:
+            self._record_output(self._database('sqlite'))
+        files.update(self.outputs)
+
+        write_manifest(self.output_dir, {"key": key,
+                                         "master_seed": self.master_seed,
+                                         "seeds": self.seeds,
+                                         "window": self.window,
+                                         "start_date": self.start_date.isoformat(),
+                                         "end_date": self.end_date.isoformat(),
+                                         "files": dict(sorted(files.items()))})
+
+    def _save_snapshot(self, config=None):
+        """Method that saves the population and this run's transactions, so a later run can append to it.
+
+        An appended run only adds its own transactions and rewrites the snapshot's state, since its
+        population hasn't changed.
+
+        Keyword Arguments:
+            config {RunConfig} -- Supplies the snapshot directory and the population settings. (default: {None})
+        """
+        values = config.to_dict()
+        state = {"config": {key: values[key] for key in POPULATION_PARAMETERS},
+                 "master_seed": self.master_seed,
+                 "window": self.window,
+                 "start_date": self.start_date.isoformat(),
+                 "end_date": self.end_date.isoformat(),
+                 "rows": self.rows_written}
+
+        if config.append:
+            save_state(config.snapshot, state)
         else:
-            num_people = 1
-        
-        tree = self._create_random_graph(graph_type, num_people)
-        
-        self._create_fake_people(num_people)
+            save_snapshot(config.snapshot, self.people, self.G, self.registry, state)
+
+        save_transactions(config.snapshot, self.window, self.transactions)
+
+    def _load_snapshot(self, path=None):
+        """Method that restores the people, graph and entity ids saved by _save_snapshot.
+
+        Entities are registered again in id order, so the ids new transactions use match the earlier run's.
+
+        Keyword Arguments:
+            path {str} -- The snapshot directory. (default: {None})
+        """
+        people, self.G, entities = load_snapshot(path)
+
+        for kind in ENTITY_KINDS:
+            self.registry.intern_many(kind, entities[kind])
+
+        for values in zip(*(people[field] for field in PERSON_FIELDS)):
+            row = dict(zip(PERSON_FIELDS, values))
+
+            person = Person(name=row['name'],
+                            company=row['company'],
+                            ssn=row['ssn'],
+                            address=row['address'],
+                            job=row['job'],
+                            email=row['email'],
+                            birthday=row['birthday'])
+
+            person.work_email = row['work_email']
+            person.credit_card = row['credit_card']
+            person.phone_number = row['phone_number']
+            person.location_x = row['location_x']
+            person.location_y = row['location_y']
+            person.employee_number = row['employee_number']
+
+            if row['phone_number'] is not None:
+                self.phone_numbers.append(row['phone_number'])
+
+            self.people.append(person)
+
         self._get_companies_list()
+        self._get_email_list()
+        self._index_people()
+
+        if self.G is not None:
+            self._link_coworkers()
+
+    def _prompt_config(self):
+        """Method that asks the interactive questions and collects the answers into a run configuration.
 
-        phone_number = self._create_fake_phone_number()
-        if phone_number:
-            self._generate_transactions("phonecall")
-            self._to_pandas_dataframe("phonecall")
+        Returns:
+            [RunConfig] -- The configuration described by the answers.
+        """
+        values = {}
 
-        email = self._create_fake_work_email()
-        if email:
+        inmate_data = str(input("Would you like to import existing inmate data?: "))
+
+        if inmate_data == 'Yes' or inmate_data == 'y':
+            values['inmate_csv'] = str(input("What is the path to input inmate dataset?: "))
+        else:
+            values['graph_type'] = str(input(f"What type of graph would you like to create? ({', '.join(GRAPH_TYPES[:-1])}, or {GRAPH_TYPES[-1]}): "))
+            if values['graph_type'] != 'Ring of Cliques':
+                values['number_of_people'] = int(input("How many people would you like to create? (Please enter whole number):  "))
+
+        geocode = self._ask_yes_no("Would you like to geocode addresses with the ArcGIS World Geocoder?")
+        values['locations'] = 'geocode' if geocode else 'synthetic'
+
+        values['attributes'] = []
+        values['transactions'] = []
+        for attribute, transaction_type, question in [
+                ('phone_number', 'phonecall', "Would you like a phone number created?"),
+                ('work_email', 'email', "Would you like a work email addresses created?"),
+                ('credit_card', 'money', "Would you like a fake credit card created?")]:
+            if self._ask_yes_no(question):
+                values['attributes'].append(attribute)
+                if self._ask_yes_no(f"Would you like to generate fake {transaction_type} transactions?"):
+                    values['transactions'].append(transaction_type)
+
+        values['formats'] = ['csv']
+        if 'inmate_csv' not in values and self._ask_yes_no("Would you like to export to D3 JSON?"):
+            values['formats'].append('d3')
+
+        return RunConfig.from_dict(values)
+
+    def _create_attributes(self, attributes=None):
+        if 'phone_number' in attributes:
+            self._create_fake_phone_number()
+
+        if 'work_email' in attributes:
+            self._create_fake_work_email()
             self._get_email_list()
-            self._generate_transactions("email")
-            self._to_pandas_dataframe("email")
-        
-        credit_card = self._create_fake_credit_card()
-        if credit_card:
-            self._generate_transactions("money")
-            self._to_pandas_dataframe("money")
 
-        self._to_pandas_dataframe("people")
-        if tree:
-            self._to_pandas_dataframe("coworker")
+        if 'credit_card' in attributes:
+            self._create_fake_credit_card()
+
+    def execute(self):
+        """Method that runs DataFaker interactively, asking each question on the command line."""
+        self.run(self._prompt_config())
+
+    def _start_window(self, config=None, state=None):
+        """Method that sets the time window and seeds for this run's transactions.
+
+        A new dataset is window 0 and uses the transaction seed from seed_all.  Each run that appends to a
+        snapshot is the next window, starting where the last one ended unless dates are given, with seeds
+        derived from the master seed and the window number so every window draws different transactions.
+
+        Keyword Arguments:
+            config {RunConfig} -- Supplies the start date, end date and window length. (default: {None})
+            state {Dict} -- The state of the snapshot being appended to, or None. (default: {None})
+        """
+        start = datetime.fromisoformat(config.start_date) if config.start_date is not None else None
+        end = datetime.fromisoformat(config.end_date) if config.end_date is not None else None
+
+        if state is not None:
+            self.window = state["window"] + 1
+            if start is None and end is None:
+                start = datetime.fromisoformat(state["end_date"])
+
+        if start is None:
+            # Whole seconds keep the window exactly days long, so a seed draws the same transactions at any time.
+            end = end if end is not None else datetime.now().replace(microsecond=0)
+            start = end - timedelta(days=config.days)
+        elif end is None:
+            end = start + timedelta(days=config.days)
+
+        if start >= end:
+            print("The start date must be before the end date.")
+            raise ValueError
+
+        self.start_date = start
+        self.end_date = end
+
+        seed = self.seeds["transactions"]
+        self.transaction_seed = self.master_seed
+        if self.window > 0:
+            self.transaction_seed = shard_seeds(self.master_seed, WINDOW_STAGE, self.window + 1)[self.window]
+            window_seeds = derive_seeds(self.transaction_seed)
+
+            from faker import Faker
 
-        self._to_d3_json()
+            Faker.seed(window_seeds["faker"])
+            random.seed(window_seeds["random"])
+            seed = window_seeds["transactions"]
 
-DataFaker()
\ No newline at end of file
+        self.bulk_generator = BulkTransactionGenerator(start_date=start, end_date=end, seed=seed,
+                                                       temporal=self.temporal)
+
+    def run(self, config=None):
+        """Method that generates and writes a complete dataset without any prompts.
+
+        Keyword Arguments:
+            config {RunConfig} -- Describes what to generate and where to write it. (default: {None})
+        """
+        state = None
+        if config.append:
+            # The population settings of an appended run are whatever the snapshot was generated with.
+            state = load_state(config.snapshot)
+            missing = [transaction_type for transaction_type in config.transactions
+                       if TRANSACTION_ATTRIBUTES[transaction_type] not in state["config"]["attributes"]]
+            if missing:
+                print(f"The snapshot's people can't make {', '.join(missing)} transactions.")
+                raise ValueError
+
+            config = RunConfig.from_dict(dict(config.to_dict(), **state["config"]))
+
+        if state is not None:
+            self.seed_all(state["master_seed"])
+        else:
+            self.seed_all(config.seed if config.seed is not None else self.master_seed)
+
+        if config.profiles != 'fast':
+            self.profile_generator = None
+
+        if self.instrumentation is NULL_INSTRUMENTATION and (config.report is not None or config.progress or
+                                                             config.trace_memory):
+            self.instrumentation = Instrumentation(trace_memory=config.trace_memory,
+                                                   progress=print_progress if config.progress else None)
+        self.instrumentation.add_section("seeds", dict(self.seeds, master=self.master_seed))
+
+        self.output_dir = config.output_dir
+        self.chunk_size = config.chunk_size
+        self.destinations = config.destinations
+        self.contact_mix = tuple(config.contact_mix)
+        self.sort_by_time = config.sort_by_time
+        self.databases = {'sqlite': config.sqlite_file, 'postgres': config.postgres_dsn}
+        self.sink_options = {'sqlite': {'synchronous': config.sqlite_sync}}
+        self.outputs = {} if config.manifest else None
+        if config.arrivals != 'uniform' or config.temporal_options:
+            self.temporal = dict(config.temporal_options, arrivals=config.arrivals)
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        if self.location_provider is None:
+            if config.locations == 'geocode':
+                from geocode_cache import GEOCODE_CACHE_FILE, GeocodeCache
+                from geocoder import Geocoder
+
+                # The cache lives with the output, so runs in different directories never share a file.
+                cache = GeocodeCache(os.path.join(self.output_dir, GEOCODE_CACHE_FILE))
+                self.location_provider = Geocoder(cache=cache, instrumentation=self.instrumentation)
+            else:
+                self.location_provider = SyntheticLocationProvider(seed=self.seeds["locations"])
+
+        stage = self.instrumentation.stage
+
+        try:
+            inmates = None
+            tree = False
+
+            self._start_window(config, state)
+
+            key = self._run_key(config)
+            if config.skip_unchanged:
+                manifest = read_manifest(self.output_dir)
+                if manifest is not None and manifest["key"] == key and not changed_files(self.output_dir, manifest):
+                    print(f"The output in {self.output_dir} already matches this run.")
+                    return
+
+            if config.append:
+                with stage("snapshot:load"):
+                    self._load_snapshot(config.snapshot)
+                self.rows_written = dict(state["rows"])
+
+                if config.inmate_csv is not None:
+                    inmates = np.arange(self.registry.count('inmate'))
+
+                if config.destinations == 'graph' and self.G is None:
+                    print("Graph destinations need a snapshot with a graph.")
+                    raise ValueError
+
+            elif config.inmate_csv is not None:
+                with stage("inmates"):
+                    inmates = self._import_inmate_data(config.inmate_csv, config.inmate_columns, config.inmate_index)
+
+                num_people = math.ceil(len(inmates) * .6)
+
+            else:
+                if config.graph_type != 'Ring of Cliques':
+                    num_people = config.number_of_people
+                else:
+                    num_people = 1
+
+                if config.graph_type is not None:
+                    with stage("graph"):
+                        tree = self._create_random_graph(config.graph_type, num_people, config.graph_options)
+
+            # Exports run on their own thread behind a bounded queue, so each table is written while the next
+            # one is generated.  Exports only read what generation has finished with.
+            with StageWorker(self._export_stage, EXPORT_QUEUE_SIZE, config.pipeline, "export") as exporter:
+                if config.workers is not None:
+                    if not config.append:
+                        with stage("people"):
+                            self._create_sharded_people(num_people, config)
+                        self._queue_population_exports(exporter, config, tree)
+                    with stage("transactions"):
+                        self._generate_sharded_transactions(config.transactions, inmates, config)
+                    for transaction_type in config.transactions:
+                        exporter.put(transaction_type, config.formats)
+
+                else:
+                    if not config.append:
+                        with stage("people"):
+                            self._create_fake_people(num_people)
+                            self._get_companies_list()
+                        with stage("attributes"):
+                            self._create_attributes(config.attributes)
+                        self._queue_population_exports(exporter, config, tree)
+
+                    for transaction_type in config.transactions:
+                        with stage(f"transactions:{transaction_type}"):
+                            if config.engine == 'bulk':
+                                self._generate_bulk_transactions(transaction_type, inmates)
+                            elif inmates is not None:
+                                self._generate_inmate_transactions(transaction_type,
+                                                                   self.registry.resolve('inmate', inmates).tolist())
+                            else:
+                                self._generate_transactions(transaction_type)
+                        exporter.put(transaction_type, config.formats)
+
+                self.instrumentation.count("people", len(self.people))
+
+                # Link weights count transactions, so the D3 export waits until every type is generated.
+                if 'd3' in config.formats and self.G is not None and not config.append:
+                    exporter.put("d3", config.d3_options)
+
+            if config.manifest:
+                with stage("manifest"):
+                    self._write_manifest(config, key)
+
+            if config.snapshot is not None:
+                with stage("snapshot:save"):
+                    self._save_snapshot(config)
+
+        finally:
+            self.location_provider.close()
+
+            if hasattr(self.location_provider, 'stats'):
+                self.instrumentation.add_section("locations", self.location_provider.stats())
+            if config.report is not None:
+                self.instrumentation.write(config.report)
+            self.instrumentation.close()
+
+
+def main(argv=None):
+    """Command line entry point.  Without any options DataFaker asks its questions interactively.
+
+    Keyword Arguments:
+        argv {List} -- Command line arguments.  Defaults to sys.argv. (default: {None})
+    """
+    parser = argparse.ArgumentParser(description="Generate fake people, their social graph and their transactions.")
+    parser.add_argument("--config", help="JSON file holding a run configuration.  Other options override its values.")
+    parser.add_argument("--graph-type", choices=GRAPH_TYPES)
+    parser.add_argument("--people", dest="number_of_people", type=int, help="How many people to create.")
+    parser.add_argument("--attributes", nargs="*", choices=ATTRIBUTES)
+    parser.add_argument("--transactions", nargs="*", choices=TRANSACTION_TYPES)
+    parser.add_argument("--formats", nargs="*", choices=FORMATS + DATABASE_FORMATS)
+    parser.add_argument("--engine", choices=ENGINES, help="Generate transactions in NumPy batches or one object at a time.")
+    parser.add_argument("--profiles", choices=PROFILE_MODES, help="Draw profiles in bulk from word lists or call Faker.profile().")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--locations", choices=LOCATION_MODES)
+    parser.add_argument("--inmate-csv")
+    parser.add_argument("--inmate-columns", nargs="*", type=lambda column: int(column) if column.isdigit() else column,
+                        help="Roster columns, by position or header name, that identify an inmate.")
+    parser.add_argument("--inmate-index", help="Directory of an on-disk id index that speeds up later imports of the roster.")
+    parser.add_argument("--output-dir")
+    parser.add_argument("--sqlite-file", help="SQLite database the sqlite format writes to.  Defaults to data.sqlite "
+                                              "in the output directory.")
+    parser.add_argument("--sqlite-no-sync", dest="sqlite_sync", action="store_false", default=None,
+                        help="Don't wait for SQLite commits to reach the disk.  Faster, but a crash can corrupt "
+                             "the database.")
+    parser.add_argument("--postgres-dsn", help="Connection string of the database the postgres format writes to.")
+    parser.add_argument("--chunk-size", type=int, help="Rows written to disk at a time.")
+    parser.add_argument("--workers", type=int, help="Generate in shards across this many processes.")
+    parser.add_argument("--shard-size", type=int, help="People per shard in sharded mode.")
+    parser.add_argument("--graph-options", type=json.loads,
+                        help='JSON object of graph generator settings, e.g. \'{"m": 3}\'.')
+    parser.add_argument("--destinations", choices=DESTINATION_MODES,
+                        help="Send email and phone calls to anyone or mostly along the social graph.")
+    parser.add_argument("--d3-options", type=json.loads,
+                        help='JSON object of D3 export settings, e.g. \'{"compact": true, "compression": "gzip", '
+                             '"attributes": ["company"], "weights": true}\'.')
+    parser.add_argument("--arrivals", choices=ARRIVAL_MODES,
+                        help="Give each person uniform, Poisson or self-exciting Hawkes transaction arrivals.")
+    parser.add_argument("--temporal-options", type=json.loads,
+                        help='JSON object of temporal engine settings, e.g. \'{"diurnal": true, "weekly": true, '
+                             '"bursts": 2, "rate": 0.5}\'.')
+    parser.add_argument("--no-pipeline", dest="pipeline", action="store_false", default=None,
+                        help="Run every stage one after the other instead of writing tables while generating.")
+    parser.add_argument("--no-manifest", dest="manifest", action="store_false", default=None,
+                        help="Don't write manifest.json with the digest of every output file.")
+    parser.add_argument("--skip-unchanged", action="store_true", default=None,
+                        help="Don't generate anything when the output directory's manifest already matches this run.")
+    parser.add_argument("--sort-by-time", action="store_true", default=None,
+                        help="Write transactions in order of time instead of grouped by person.")
+    parser.add_argument("--coworkers", choices=COWORKER_EXPORTS,
+                        help="Write coworkers joined to each person's row, as a person_id/coworker_id edge file, or both.")
+    parser.add_argument("--report", help="Write a JSON run report with stage timings, counters and memory use.")
+    parser.add_argument("--progress", action="store_true", default=None, help="Print progress while stages run.")
+    parser.add_argument("--trace-memory", action="store_true", default=None,
+                        help="Record each stage's peak Python allocation with tracemalloc.  Slows the run down.")
+    parser.add_argument("--contact-mix", nargs=3, type=float,
+                        help="Shares of graph destinations sent to contacts, contacts of contacts, and anyone.")
+    parser.add_argument("--start-date", help="ISO date the transactions start at.  Defaults to --days before the end.")
+    parser.add_argument("--end-date", help="ISO date the transactions end at.  Defaults to now.")
+    parser.add_argument("--days", type=int, help="Length of the transaction window in days.")
+    parser.add_argument("--snapshot", help="Directory to save the population to, or to load it from with --append.")
+    parser.add_argument("--append", action="store_true", default=None,
+                        help="Add a new window of transactions for the population in --snapshot to the existing files.")
+    args = parser.parse_args(argv)
+
+    values = {key: value for key, value in vars(args).items() if key != 'config' and value is not None}
+
+    if args.config is None and not values:
+        DataFaker().execute()
+        return
+
+    config = {}
+    if args.config is not None:
+        config = RunConfig.from_file(args.config).to_dict()
+    config.update(values)
+
+    DataFaker().run(RunConfig.from_dict(config))
+
+
+if __name__ == "__main__":
+    main()
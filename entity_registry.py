@@ -0,0 +1,137 @@
+import numpy as np
+
+ENTITY_KINDS = ['company', 'phone_number', 'work_email', 'credit_card', 'inmate']
+
+
+class EntityRegistry:
+    """
+    Central store that gives every company, phone number, email, card and inmate a dense integer id.
+
+    Each kind keeps a list from id to value and a hash index from value to id, so lookups run in
+    constant time in both directions.  Generation and joins work on ids, and values are only turned
+    back into strings when data is written.  People are identified by their position in
+    DataFaker.people rather than by a value, since names and social security numbers can repeat.
+    """
+    def __init__(self):
+        self._values = {kind: [] for kind in ENTITY_KINDS}
+        self._ids = {kind: {} for kind in ENTITY_KINDS}
+        self._arrays = {}
+
+    def __repr__(self):
+        return "EntityRegistry(%s)" % ", ".join(f"{kind}={len(values)}" for kind, values in self._values.items())
+
+    def __len__(self):
+        return sum(len(values) for values in self._values.values())
+
+    def _check_kind(self, kind):
+        if kind not in ENTITY_KINDS:
+            print(f"Entity kind only accepts {', '.join(ENTITY_KINDS)} as inputs.")
+            raise ValueError
+
+    def count(self, kind=None):
+        """Method to find how many entities of one kind are registered.
+
+        Keyword Arguments:
+            kind {str} -- One of ENTITY_KINDS. (default: {None})
+
+        Returns:
+            [int] -- The number of ids handed out, which is also the next id.
+        """
+        self._check_kind(kind)
+        return len(self._values[kind])
+
+    def intern(self, kind=None, value=None):
+        """Method to find the id of a value, registering the value first if it is new.
+
+        Keyword Arguments:
+            kind {str} -- One of ENTITY_KINDS. (default: {None})
+            value {str} -- The value to look up. (default: {None})
+
+        Returns:
+            [int] -- The value's id.
+        """
+        self._check_kind(kind)
+        ids = self._ids[kind]
+        entity_id = ids.get(value)
+        if entity_id is None:
+            entity_id = ids[value] = len(self._values[kind])
+            self._values[kind].append(value)
+            self._arrays.pop(kind, None)
+        return entity_id
+
+    def intern_many(self, kind=None, values=None):
+        """Method to find the ids of many values, registering new ones in order.
+
+        Keyword Arguments:
+            kind {str} -- One of ENTITY_KINDS. (default: {None})
+            values {Iterable} -- The values to look up. (default: {None})
+
+        Returns:
+            [ndarray] -- One id per value.
+        """
+        self._check_kind(kind)
+        ids = self._ids[kind]
+        known = self._values[kind]
+
+        result = []
+        for value in values:
+            entity_id = ids.get(value)
+            if entity_id is None:
+                entity_id = ids[value] = len(known)
+                known.append(value)
+            result.append(entity_id)
+
+        self._arrays.pop(kind, None)
+        return np.array(result, dtype=np.int64)
+
+    def id_of(self, kind=None, value=None):
+        """Method to find the id of a value without registering it.
+
+        Keyword Arguments:
+            kind {str} -- One of ENTITY_KINDS. (default: {None})
+            value {str} -- The value to look up. (default: {None})
+
+        Returns:
+            [int] -- The value's id, or -1 when it isn't registered.
+        """
+        self._check_kind(kind)
+        return self._ids[kind].get(value, -1)
+
+    def value_of(self, kind=None, entity_id=None):
+        """Method to find the value behind one id.
+
+        Keyword Arguments:
+            kind {str} -- One of ENTITY_KINDS. (default: {None})
+            entity_id {int} -- The id to resolve. (default: {None})
+
+        Returns:
+            [str] -- The registered value.
+        """
+        self._check_kind(kind)
+        return self._values[kind][entity_id]
+
+    def values(self, kind=None):
+        """Method to list every value of one kind, in id order.
+
+        Keyword Arguments:
+            kind {str} -- One of ENTITY_KINDS. (default: {None})
+
+        Returns:
+            [ndarray] -- Object array where position i holds the value of id i.
+        """
+        self._check_kind(kind)
+        if kind not in self._arrays:
+            self._arrays[kind] = np.array(self._values[kind], dtype=object)
+        return self._arrays[kind]
+
+    def resolve(self, kind=None, ids=None):
+        """Method to turn an array of ids back into values, for writing.
+
+        Keyword Arguments:
+            kind {str} -- One of ENTITY_KINDS. (default: {None})
+            ids {ndarray} -- Ids to resolve. (default: {None})
+
+        Returns:
+            [ndarray] -- Object array of values.
+        """
+        return self.values(kind)[ids]
@@ -0,0 +1,342 @@
+import gzip
+import io
+import json
+
+
+def open_gzip(path=None, mode='w', newline=None):
+    """Opens a gzip file for writing text.
+
+    The header's modification time is left at zero, so the same text always compresses to the same bytes
+    and the file's digest only depends on what was written.
+
+    Keyword Arguments:
+        path {str} -- The file to write. (default: {None})
+        mode {str} -- "w" to write from scratch or "a" to append. (default: {'w'})
+        newline {str} -- Passed to the text layer, as for open. (default: {None})
+
+    Returns:
+        [TextIOWrapper] -- The open file.
+    """
+    return io.TextIOWrapper(gzip.GzipFile(path, mode + 'b', mtime=0), newline=newline)
+
+
+def iter_chunks(records=None, chunk_size=100000):
+    """Groups a stream of records into lists of at most chunk_size records.
+
+    Keyword Arguments:
+        records {Iterable} -- Dictionaries to group. (default: {None})
+        chunk_size {int} -- Largest number of records in one chunk. (default: {100000})
+
+    Yields:
+        [List] -- The next chunk of records.
+    """
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+class ChunkedWriter:
+    """
+    Base class for writers that receive data in fixed size chunks, so only one chunk is ever held in memory.
+
+    Subclasses implement _write_frame.
+
+    When initializing a ChunkedWriter class, include the following parameters:
+        path:        (String) The file to write.
+        columns:     (List) Column names, in output order.  Taken from the first chunk when not given. (Optional)
+        chunk_size:  (Int) Largest number of rows handed to the file format at once.
+        first_row:   (Int) Index of the first row written, when adding rows after ones written by an earlier run.
+    """
+    def __init__(self, path=None, columns=None, chunk_size=100000, first_row=0):
+        # pandas is only loaded once a table is written, so runs and tools that never write one start faster.
+        import pandas
+
+        self._pd = pandas
+        self.path = path
+        self.columns = columns
+        self.chunk_size = chunk_size
+        self.first_row = first_row
+        self.rows_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _write_frame(self, df):
+        raise NotImplementedError
+
+    def _write(self, data):
+        df = self._pd.DataFrame(data, columns=self.columns)
+        if self.columns is None:
+            self.columns = list(df.columns)
+
+        start = self.first_row + self.rows_written
+        df.index = self._pd.RangeIndex(start, start + len(df))
+        self._write_frame(df)
+        self.rows_written += len(df)
+
+    def write_records(self, records=None):
+        """Method that writes a stream of dictionaries, one chunk at a time.
+
+        Keyword Arguments:
+            records {Iterable} -- Dictionaries keyed by column name. (default: {None})
+        """
+        for chunk in iter_chunks(records, self.chunk_size):
+            self._write(chunk)
+
+    def write_columns(self, columns=None):
+        """Method that writes a dictionary of equal length column arrays, one chunk at a time.
+
+        Keyword Arguments:
+            columns {Dict} -- Column name to array. (default: {None})
+        """
+        length = len(next(iter(columns.values()))) if columns else 0
+        for start in range(0, length, self.chunk_size):
+            self._write({name: values[start:start + self.chunk_size] for name, values in columns.items()})
+
+    def close(self):
+        """Method that finishes the file."""
+        pass
+
+
+class CSVWriter(ChunkedWriter):
+    """
+    Writes CSV files in chunks.  The leading index column matches what DataFrame.to_csv writes.
+
+    A first_row above zero appends to the existing file without writing the header again, so later
+    runs can add rows without rewriting what is already there.
+
+    When initializing a CSVWriter class, include the following parameters:
+        path:         (String) The file to write.
+        columns:      (List) Column names, in output order. (Optional)
+        chunk_size:   (Int) Largest number of rows formatted at once.
+        first_row:    (Int) Rows already in the file.  Above zero, new rows are appended.
+        compression:  (String) "gzip" to compress the file, or None. (Optional)
+    """
+    def __init__(self, path=None, columns=None, chunk_size=100000, first_row=0, compression=None):
+        super().__init__(path, columns, chunk_size, first_row)
+
+        if compression not in [None, 'gzip']:
+            print("CSV compression only accepts 'gzip' or None as inputs.")
+            raise ValueError
+
+        mode = 'a' if first_row > 0 else 'w'
+        if compression == 'gzip':
+            self._file = open_gzip(path, mode, newline='')
+        else:
+            self._file = open(path, mode, newline='')
+
+    def _write_frame(self, df):
+        df.to_csv(self._file, header=self.first_row + self.rows_written == 0)
+
+    def close(self):
+        if self.first_row + self.rows_written == 0 and self.columns is not None:
+            self._pd.DataFrame(columns=self.columns).to_csv(self._file)
+        self._file.close()
+
+
+class ParquetWriter(ChunkedWriter):
+    """
+    Writes Parquet files in chunks, one row group per chunk.  Requires pyarrow.
+
+    When initializing a ParquetWriter class, include the following parameters:
+        path:         (String) The file to write.
+        columns:      (List) Column names, in output order. (Optional)
+        chunk_size:   (Int) Rows per row group.
+        first_row:    (Int) Rows written to earlier files of the same table.  Parquet files can't be appended
+                      to, so the file at path is always written from scratch.
+        compression:  (String) Parquet codec such as "snappy", "zstd", or "gzip".
+    """
+    def __init__(self, path=None, columns=None, chunk_size=100000, first_row=0, compression='snappy'):
+        super().__init__(path, columns, chunk_size, first_row)
+
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            print("Parquet output needs pyarrow.  Please run: pip install pyarrow")
+            raise
+
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.compression = compression
+        self._writer = None
+
+    def _write_frame(self, df):
+        if self._writer is None:
+            table = self._pa.Table.from_pandas(df, preserve_index=False)
+            self._writer = self._pq.ParquetWriter(self.path, table.schema, compression=self.compression)
+        else:
+            table = self._pa.Table.from_pandas(df, schema=self._writer.schema, preserve_index=False)
+
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is None and self.columns is not None:
+            self._write_frame(self._pd.DataFrame(columns=self.columns))
+        if self._writer is not None:
+            self._writer.close()
+
+
+class NodeLinkWriter:
+    """
+    Writes a graph as node-link JSON, the layout D3 force graphs and networkx's node_link_data use, one chunk
+    of nodes or links at a time, so the whole document is never built in memory.
+
+    The default layout matches json.dump(node_link_data(G), indent=4) character for character.  Compact
+    mode drops the indentation and spaces, which makes the file several times smaller.
+
+    When initializing a NodeLinkWriter class, include the following parameters:
+        path:         (String) The file to write.
+        compact:      (Bool) Write without indentation or spaces.
+        compression:  (String) "gzip" to compress the file, or None. (Optional)
+    """
+    def __init__(self, path=None, compact=False, compression=None):
+        if compression not in [None, 'gzip']:
+            print("JSON compression only accepts 'gzip' or None as inputs.")
+            raise ValueError
+
+        self.path = path
+        self.compact = compact
+        self.nodes_written = 0
+        self.links_written = 0
+
+        if compression == 'gzip':
+            self._file = open_gzip(path, 'w')
+        else:
+            self._file = open(path, 'w')
+
+        self._sections = []
+        self._empty = True
+
+        if compact:
+            self._dumps = json.JSONEncoder(separators=(',', ':'), default=str).encode
+            self._file.write('{"directed":false,"multigraph":false,"graph":{}')
+        else:
+            # Nodes and links are flat, so putting the indentation in the separator gives the same text as
+            # indent=4 while staying on the C encoder, which json only uses without indent.
+            self._dumps = json.JSONEncoder(separators=(',\n            ', ': '), default=str).encode
+            self._file.write('{\n    "directed": false,\n    "multigraph": false,\n    "graph": {}')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _open_section(self, name):
+        if self._sections and self._sections[-1] == name:
+            return
+
+        if name in self._sections:
+            print("Nodes have to be written before links.")
+            raise ValueError
+
+        if self._sections:
+            self._file.write(']' if self.compact or self._empty else '\n    ]')
+
+        self._sections.append(name)
+        self._empty = True
+        self._file.write(f',"{name}":[' if self.compact else f',\n    "{name}": [')
+
+    def _write_items(self, items):
+        if not items:
+            return
+
+        if self.compact:
+            text = ','.join(map(self._dumps, items))
+            separator = ','
+        else:
+            text = ',\n'.join('        {\n            ' + self._dumps(item)[1:-1] + '\n        }' for item in items)
+            separator = '\n' if self._empty else ',\n'
+
+        self._file.write(text if self._empty and self.compact else separator + text)
+        self._empty = False
+
+    def write_nodes(self, ids=None, columns=None):
+        """Method that writes one chunk of nodes.  Every node has to be written before the first link.
+
+        Keyword Arguments:
+            ids {ndarray} -- The node ids in the chunk. (default: {None})
+            columns {Dict} -- Attribute name to one value per node.  None values are left off the node. (default: {None})
+        """
+        self._open_section("nodes")
+
+        ids = ids.tolist() if hasattr(ids, 'tolist') else list(ids)
+        columns = {name: values.tolist() if hasattr(values, 'tolist') else list(values)
+                   for name, values in (columns or {}).items()}
+
+        items = []
+        for index, node in enumerate(ids):
+            item = {name: values[index] for name, values in columns.items() if values[index] is not None}
+            item["id"] = node
+            items.append(item)
+
+        self._write_items(items)
+        self.nodes_written += len(ids)
+
+    def write_links(self, source=None, target=None, columns=None):
+        """Method that writes one chunk of links.
+
+        Keyword Arguments:
+            source {ndarray} -- One end of each link. (default: {None})
+            target {ndarray} -- The other end of each link. (default: {None})
+            columns {Dict} -- Attribute name to one value per link, such as "weight". (default: {None})
+        """
+        self._open_section("links")
+
+        names = list(columns or {})
+        values = [columns[name].tolist() if hasattr(columns[name], 'tolist') else list(columns[name])
+                  for name in names]
+
+        items = [dict(zip(names, attributes), source=u, target=v)
+                 for u, v, *attributes in zip(source.tolist(), target.tolist(), *values)]
+
+        self._write_items(items)
+        self.links_written += len(items)
+
+    def close(self):
+        """Method that closes any open list and finishes the document."""
+        if self._file.closed:
+            return
+
+        for name in ["nodes", "links"]:
+            if name not in self._sections:
+                self._open_section(name)
+
+        self._file.write(']' if self.compact or self._empty else '\n    ]')
+        self._file.write('}' if self.compact else '\n}')
+        self._file.close()
+
+
+WRITERS = {'csv': (CSVWriter, '.csv'),
+           'parquet': (ParquetWriter, '.parquet')}
+
+
+def open_writer(path=None, file_format='csv', columns=None, chunk_size=100000, first_row=0):
+    """Opens the chunked writer for a file format.
+
+    Keyword Arguments:
+        path {str} -- The file to write, without its extension. (default: {None})
+        file_format {str} -- "csv" or "parquet". (default: {'csv'})
+        columns {List} -- Column names, in output order. (default: {None})
+        chunk_size {int} -- Largest number of rows written at once. (default: {100000})
+        first_row {int} -- Rows an earlier run already wrote to this table.  CSV files are appended to. (default: {0})
+
+    Returns:
+        [ChunkedWriter] -- The writer, ready for write_records or write_columns.
+    """
+    if file_format not in WRITERS:
+        print(f"File format only accepts {', '.join(WRITERS)} as inputs.")
+        raise ValueError
+
+    writer, extension = WRITERS[file_format]
+    return writer(path + extension, columns=columns, chunk_size=chunk_size, first_row=first_row)
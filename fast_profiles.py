@@ -0,0 +1,292 @@
+import re
+import string
+import unicodedata
+from datetime import date, timedelta
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# Tokens that are drawn straight from a provider word list, mapped to the list's attribute name.
+WORD_LISTS = {"first_name": ["first_names"],
+              "first_name_female": ["first_names_female"],
+              "first_name_male": ["first_names_male"],
+              "last_name": ["last_names"],
+              "prefix_female": ["prefixes_female"],
+              "prefix_male": ["prefixes_male"],
+              "suffix_female": ["suffixes_female"],
+              "suffix_male": ["suffixes_male"],
+              "company_suffix": ["company_suffixes"],
+              "city_prefix": ["city_prefixes"],
+              "city_suffix": ["city_suffixes"],
+              "street_suffix": ["street_suffixes"],
+              "state_abbr": ["states_abbr"],
+              "military_state": ["military_state_abbr"],
+              "military_ship": ["military_ship_prefix"],
+              "free_email_domain": ["free_email_domains"],
+              "job": ["jobs"]}
+
+# Further word lists appended to a token's list, the way Faker's method for the token joins them.
+# Faker's state_abbr also draws US territories and freely associated states.
+WORD_LIST_EXTRAS = {"state_abbr": ["territories_abbr", "freely_associated_states_abbr"]}
+
+# Tokens that expand to further formats, mapped to the attribute holding them.
+FORMATS = {"name_female": ["formats_female"],
+           "name_male": ["formats_male"],
+           "company": ["formats"],
+           "address": ["address_formats"],
+           "street_address": ["street_address_formats"],
+           "street_name": ["street_name_formats"],
+           "city": ["city_formats"],
+           "building_number": ["building_number_formats"],
+           "secondary_address": ["secondary_address_formats"],
+           "military_apo": ["military_apo_format"],
+           "military_dpo": ["military_dpo_format"],
+           "user_name": ["user_name_formats"]}
+
+# Provider module each format token belongs to, since several providers share attribute names like "formats".
+FORMAT_PROVIDERS = {"company": "company"}
+
+# Tokens Faker draws as a whole number between two bounds, mapped to the bounds and the number's format.
+# Faker's en_US postcode is randint(501, 99950), so no postcode starts 000 or runs past 99950.
+NUMBER_RANGES = {"postcode": (501, 99950, "%05d")}
+
+# The only locale DataFaker draws from, and the Faker providers it calls.  Faker() loads all of its
+# providers, so building one with just these starts faster and draws exactly the same values.
+FAKER_LOCALE = 'en_US'
+FAKER_PROVIDERS = ['faker.providers.person',
+                   'faker.providers.address',
+                   'faker.providers.company',
+                   'faker.providers.job',
+                   'faker.providers.ssn',
+                   'faker.providers.internet',
+                   'faker.providers.date_time',
+                   'faker.providers.geo',
+                   'faker.providers.profile',
+                   'faker.providers.phone_number',
+                   'faker.providers.credit_card']
+
+
+def create_faker(locale=FAKER_LOCALE, providers=None):
+    """Builds a Faker that loads only the providers DataFaker uses.
+
+    Keyword Arguments:
+        locale {str} -- The Faker locale. (default: {FAKER_LOCALE})
+        providers {List} -- Provider modules to load.  Defaults to FAKER_PROVIDERS. (default: {None})
+
+    Returns:
+        [Faker] -- The Faker instance.
+    """
+    from faker import Faker
+
+    return Faker(locale, providers=providers if providers is not None else FAKER_PROVIDERS)
+
+
+class ProfileGenerator:
+    """
+    Lean replacement for Faker.profile() that produces only the fields Person uses.
+
+    Word lists and format strings are read once from the Faker instance's providers.  Every field is
+    then drawn for a whole batch at a time with NumPy, keeping each provider's weights, instead of
+    building a full profile per person.  Postcodes and state abbreviations cover the same ranges as Faker's,
+    territories included.  Tokens the generator doesn't know fall back to calling Faker.
+
+    When initializing a ProfileGenerator class, include the following parameters:
+        fake:  (Faker) The Faker instance whose providers supply the word lists.
+        seed:  (Int) Seed for the random number generator. (Optional)
+    """
+    def __init__(self, fake=None, seed=None):
+        self.fake = fake
+        self.rng = np.random.default_rng(seed)
+
+        self._providers = fake.get_providers()
+        self._words = {}
+
+    def _provider_attribute(self, names, module=None):
+        for provider in self._providers:
+            if module is not None and ".providers.%s" % module not in type(provider).__module__:
+                continue
+            for name in names:
+                value = getattr(provider, name, None)
+                if value is not None:
+                    return value
+        return None
+
+    def _word_list(self, token):
+        if token not in self._words:
+            values = self._provider_attribute(WORD_LISTS[token])
+
+            if token == "first_name" and values is None:
+                female = self._provider_attribute(["first_names_female"])
+                male = self._provider_attribute(["first_names_male"])
+                if female is not None and male is not None:
+                    values = dict(female)
+                    values.update(male)
+
+            if values is not None and token in WORD_LIST_EXTRAS:
+                values = list(values)
+                for name in WORD_LIST_EXTRAS[token]:
+                    values.extend(self._provider_attribute([name]) or [])
+
+            if values is None:
+                self._words[token] = None
+            elif hasattr(values, "items"):
+                words = np.array(list(values.keys()), dtype=object)
+                weights = np.array(list(values.values()), dtype=np.float64)
+                self._words[token] = (words, weights / weights.sum())
+            else:
+                self._words[token] = (np.array(list(values), dtype=object), None)
+
+        return self._words[token]
+
+    def _choose(self, values, count):
+        words, weights = values
+        if weights is None:
+            return words[self.rng.integers(0, len(words), size=count)]
+        return words[self.rng.choice(len(words), size=count, p=weights)]
+
+    def _number(self, low, high, number_format, count):
+        numbers = self.rng.integers(low, high + 1, size=count).tolist()
+        return np.array([number_format % number for number in numbers], dtype=object)
+
+    def _pattern(self, pattern, count):
+        result = np.full(count, "", dtype=object)
+        for character in pattern:
+            if character == "#":
+                result = result + np.array(list(string.digits), dtype=object)[self.rng.integers(0, 10, size=count)]
+            elif character == "%":
+                result = result + np.array(list(string.digits[1:]), dtype=object)[self.rng.integers(0, 9, size=count)]
+            elif character == "?":
+                letters = np.array(list(string.ascii_letters), dtype=object)
+                result = result + letters[self.rng.integers(0, len(letters), size=count)]
+            else:
+                result = result + character
+        return result
+
+    def _format(self, formats, count):
+        if isinstance(formats, str):
+            formats = [formats]
+
+        if hasattr(formats, "items"):
+            choices = (np.array(list(formats.keys()), dtype=object),
+                       np.array(list(formats.values()), dtype=np.float64))
+            choices = (choices[0], choices[1] / choices[1].sum())
+        else:
+            choices = (np.array(list(formats), dtype=object), None)
+
+        chosen = self.rng.choice(len(choices[0]), size=count, p=choices[1])
+        result = np.empty(count, dtype=object)
+
+        for index, template in enumerate(choices[0]):
+            rows = np.flatnonzero(chosen == index)
+            if len(rows) == 0:
+                continue
+
+            pieces = TOKEN_PATTERN.split(template)
+            filled = np.full(len(rows), "", dtype=object)
+            for position, piece in enumerate(pieces):
+                if position % 2:
+                    filled = filled + self.draw(piece, len(rows))
+                elif piece:
+                    filled = filled + self._pattern(piece, len(rows))
+            result[rows] = filled
+
+        return result
+
+    def draw(self, token, count):
+        """Method that draws one Faker token, such as "last_name" or "street_address", for a batch.
+
+        Arguments:
+            token {str} -- The Faker token to draw.
+            count {int} -- How many values to draw.
+
+        Returns:
+            [ndarray] -- Object array of strings.
+        """
+        if token in NUMBER_RANGES:
+            return self._number(*NUMBER_RANGES[token], count)
+
+        if token in WORD_LISTS:
+            values = self._word_list(token)
+            if values is not None:
+                return self._choose(values, count)
+
+        if token in FORMATS:
+            formats = self._provider_attribute(FORMATS[token], FORMAT_PROVIDERS.get(token))
+            if formats is not None:
+                return self._format(formats, count)
+
+        method = getattr(self.fake, token)
+        return np.array([method() for _ in range(count)], dtype=object)
+
+    def _names(self, count):
+        female = self.rng.random(count) < 0.5
+        names = np.empty(count, dtype=object)
+        names[female] = self.draw("name_female", int(female.sum()))
+        names[~female] = self.draw("name_male", int((~female).sum()))
+        return names
+
+    def _ssns(self, count):
+        area = self.rng.integers(1, 900, size=count)
+        area[area == 666] = 667
+        group = self.rng.integers(1, 100, size=count)
+        serial = self.rng.integers(1, 10000, size=count)
+        return ["%03d-%02d-%04d" % values for values in zip(area.tolist(), group.tolist(), serial.tolist())]
+
+    def _mails(self, count):
+        users = self.draw("user_name", count)
+        domains = self.draw("free_email_domain", count)
+        return [_ascii(user).lower() + "@" + domain for user, domain in zip(users.tolist(), domains.tolist())]
+
+    def _birthdates(self, count):
+        today = date.today()
+        earliest = today.replace(year=today.year - 116) + timedelta(days=1)
+        offsets = self.rng.integers(0, (today - earliest).days + 1, size=count)
+        return (np.datetime64(earliest, 'D') + offsets.astype('timedelta64[D]')).astype(object).tolist()
+
+    def columns(self, count=0):
+        """Method that generates a batch of profiles as columns.
+
+        Keyword Arguments:
+            count {int} -- How many profiles to generate. (default: {0})
+
+        Returns:
+            [Dict] -- name, company, ssn, residence, job, mail and birthdate mapped to lists.
+        """
+        return {"name": self._names(count).tolist(),
+                "company": self.draw("company", count).tolist(),
+                "ssn": self._ssns(count),
+                "residence": self.draw("address", count).tolist(),
+                "job": self.draw("job", count).tolist(),
+                "mail": self._mails(count),
+                "birthdate": self._birthdates(count)}
+
+    def profiles(self, count=0):
+        """Method that generates a batch of profiles shaped like the output of Faker.profile().
+
+        Keyword Arguments:
+            count {int} -- How many profiles to generate. (default: {0})
+
+        Returns:
+            [List] -- One dictionary per profile holding the fields Person uses.
+        """
+        columns = self.columns(count)
+        fields = list(columns)
+        return [dict(zip(fields, values)) for values in zip(*(columns[field] for field in fields))]
+
+    def iter_profiles(self, count=0, chunk_size=10000):
+        """Method that generates profiles a chunk at a time, so only one chunk of them is held at once.
+
+        Keyword Arguments:
+            count {int} -- How many profiles to generate. (default: {0})
+            chunk_size {int} -- Largest number of profiles drawn at once. (default: {10000})
+
+        Returns:
+            [Generator] -- One dictionary per profile holding the fields Person uses.
+        """
+        for start in range(0, count, chunk_size):
+            yield from self.profiles(min(chunk_size, count - start))
+
+
+def _ascii(text):
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
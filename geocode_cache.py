@@ -0,0 +1,210 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import quote
+
+# Name of the cache file a run keeps in its output directory.
+GEOCODE_CACHE_FILE = "geocode_cache.sqlite"
+
+
+def normalize_address(address):
+    """Normalizes an address so that trivially different spellings share a cache entry.
+
+    Arguments:
+        address {str} -- The single line address.
+
+    Returns:
+        [str] -- The address lower cased with all runs of whitespace and commas collapsed.
+    """
+    return re.sub(r"[\s,]+", " ", str(address)).strip().lower()
+
+
+class GeocodeCache:
+    """
+    Persistent cache of geocoded locations backed by SQLite, with an in-memory LRU in front of it.
+
+    Entries are keyed by the normalized address string, so repeated runs that produce the same
+    addresses can be served without going to the network.
+
+    When initializing a GeocodeCache class, include the following parameters:
+        path:            (String) Location of the SQLite database file.  Use ":memory:" for a throwaway cache.
+        memory_entries:  (Int) How many entries the in-memory LRU keeps.
+        max_entries:     (Int) Upper bound on the entries kept on disk.  Oldest entries are evicted first. (Optional)
+        ttl:             (Float) Age in seconds after which an entry is treated as missing. (Optional)
+        flush_every:     (Int) How many new entries are buffered before they are written to disk.
+        read_only:       (Bool) Only read the database.  New entries stay buffered until take_pending hands them
+                         over, so worker processes can share one cache file while a single process writes it.
+    """
+    def __init__(self, path=GEOCODE_CACHE_FILE, memory_entries=10000, max_entries=None, ttl=None, flush_every=256,
+                 read_only=False):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.flush_every = flush_every
+        self.read_only = read_only
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._pending = []
+
+        if read_only:
+            # A missing file is an empty cache.  An in-memory database stands in, so lookups still work.
+            if path != ":memory:" and os.path.exists(path):
+                uri = "file:" + quote(os.path.abspath(path)) + "?mode=ro"
+                self._connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            else:
+                self._connection = sqlite3.connect(":memory:", check_same_thread=False)
+                self._create_table()
+            return
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._create_table()
+
+    def _create_table(self):
+        self._connection.execute("CREATE TABLE IF NOT EXISTS geocodes ("
+                                 "address TEXT PRIMARY KEY, "
+                                 "x REAL NOT NULL, "
+                                 "y REAL NOT NULL, "
+                                 "created REAL NOT NULL)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS geocodes_created ON geocodes (created)")
+        self._connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            self._flush()
+            return self._connection.execute("SELECT COUNT(*) FROM geocodes").fetchone()[0]
+
+    def _expired(self, created):
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, address=None):
+        """Method to look up the cached location of an address.
+
+        Keyword Arguments:
+            address {str} -- The single line address. (default: {None})
+
+        Returns:
+            [Dict] -- The cached {"x": ..., "y": ...} location, or None on a miss.
+        """
+        key = normalize_address(address)
+
+        with self._lock:
+            entry = self._memory.get(key)
+
+            if entry is None:
+                row = self._connection.execute("SELECT x, y, created FROM geocodes WHERE address = ?",
+                                               (key,)).fetchone()
+                if row is not None:
+                    entry = ({"x": row[0], "y": row[1]}, row[2])
+
+            if entry is None or self._expired(entry[1]):
+                self._memory.pop(key, None)
+                self.misses += 1
+                return None
+
+            self._remember(key, entry)
+            self.hits += 1
+            return dict(entry[0])
+
+    def put(self, address=None, location=None):
+        """Method to store the location of an address.
+
+        Keyword Arguments:
+            address {str} -- The single line address. (default: {None})
+            location {Dict} -- The {"x": ..., "y": ...} location returned by the geocoder. (default: {None})
+        """
+        key = normalize_address(address)
+        created = time.time()
+
+        with self._lock:
+            self._remember(key, ({"x": location['x'], "y": location['y']}, created))
+            self._pending.append((key, location['x'], location['y'], created))
+
+            if len(self._pending) >= self.flush_every:
+                self._flush()
+
+    def take_pending(self):
+        """Method that hands over the entries added since the last flush, so another process can store them.
+
+        Returns:
+            [List] -- (address, x, y, created) tuples, ready for add_entries.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+            return pending
+
+    def add_entries(self, entries=None):
+        """Method to store entries taken from another cache with take_pending.
+
+        Keyword Arguments:
+            entries {List} -- (address, x, y, created) tuples. (default: {None})
+        """
+        with self._lock:
+            for key, x, y, created in entries or []:
+                self._remember(key, ({"x": x, "y": y}, created))
+                self._pending.append((key, x, y, created))
+            self._flush()
+
+    def _flush(self):
+        if not self._pending or self.read_only:
+            return
+
+        with self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO geocodes VALUES (?, ?, ?, ?)", self._pending)
+            self._pending = []
+            self._evict()
+
+    def _evict(self):
+        if self.ttl is not None:
+            self._connection.execute("DELETE FROM geocodes WHERE created < ?", (time.time() - self.ttl,))
+
+        if self.max_entries is not None:
+            self._connection.execute("DELETE FROM geocodes WHERE address IN ("
+                                     "SELECT address FROM geocodes ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                                     (self.max_entries,))
+
+    def flush(self):
+        """Method that writes any buffered entries to disk and applies size and TTL eviction."""
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        """Method that flushes buffered entries and closes the database.  Closing twice does nothing."""
+        with self._lock:
+            if self._connection is None:
+                return
+            self._flush()
+            self._connection.close()
+            self._connection = None
+
+    def stats(self):
+        """Method to report the cache counters.
+
+        Returns:
+            [Dict] -- The number of hits, misses and the hit rate since the cache was opened.
+        """
+        lookups = self.hits + self.misses
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
@@ -0,0 +1,228 @@
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from instrumentation import NULL_INSTRUMENTATION
+from locations import LocationProvider
+
+WORLD_GEOCODER_URL = "https://geocode.arcgis.com/arcgis/rest/services/World/GeocodeServer/findAddressCandidates"  # noqa: E501
+
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+
+
+class RateLimiter:
+    """
+    Thread safe limiter that spaces calls so no more than a fixed number happen per second.
+
+    When initializing a RateLimiter class, include the following parameters:
+        requests_per_second:  (Float) The maximum number of calls allowed per second.  None or 0 disables limiting.
+    """
+    def __init__(self, requests_per_second=None):
+        self.requests_per_second = requests_per_second
+
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        """Method that blocks until the caller is allowed to make the next call."""
+        if not self.requests_per_second:
+            return
+
+        interval = 1.0 / self.requests_per_second
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class Geocoder(LocationProvider):
+    """
+    Class that geocodes addresses against an ArcGIS findAddressCandidates endpoint.
+
+    Requests are sent through a single keep-alive session whose connection pool is shared by a pool
+    of worker threads, so many lookups can be in flight while the caller keeps generating data.
+
+    When initializing a Geocoder class, include the following parameters:
+        url:                  (String) The findAddressCandidates endpoint.  Point this at a local stub server for testing.
+        max_workers:          (Int) The number of lookups that can be in flight at once.
+        requests_per_second:  (Float) Upper bound on the request rate sent to the endpoint. (Optional)
+        max_retries:          (Int) How many times a failed lookup is retried before giving up.
+        backoff_factor:       (Float) Base delay in seconds for the exponential backoff between retries.
+        timeout:              (Float) Timeout in seconds for a single request.
+        cache:                (GeocodeCache) Cache consulted before, and filled after, every lookup. (Optional)
+        instrumentation:      (Instrumentation) Receives the latency of every request. (Optional)
+    """
+    def __init__(self, url=WORLD_GEOCODER_URL, max_workers=8, requests_per_second=None,
+                 max_retries=3, backoff_factor=0.5, timeout=10, cache=None, instrumentation=None):
+        if max_workers < 1:
+            print("Max workers must be greater than zero.")
+            raise ValueError
+
+        self.url = url
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.cache = cache
+        self.instrumentation = instrumentation if instrumentation is not None else NULL_INSTRUMENTATION
+
+        self.requests = 0
+        self.failures = 0
+        self._counter_lock = threading.Lock()
+
+        self.rate_limiter = RateLimiter(requests_per_second)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Method that shuts down the worker threads, releases pooled connections and closes the cache."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.session.close()
+
+        if self.cache is not None:
+            self.cache.close()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="geocoder")
+        return self._executor
+
+    def geocode(self, address=None):
+        """Method that geocodes a single address, retrying with exponential backoff on failure.
+
+        Keyword Arguments:
+            address {str} -- The single line address to geocode. (default: {None})
+
+        Raises:
+            LookupError: The endpoint returned no candidates for the address.
+            requests.RequestException: The request still failed after all retries.
+
+        Returns:
+            [Dict] -- The location of the first candidate as {"x": ..., "y": ...}
+        """
+        if self.cache is not None:
+            location = self.cache.get(address)
+            if location is not None:
+                return location
+
+        return self._fetch(address)
+
+    def _get(self, querystring):
+        start = time.perf_counter()
+        try:
+            return self.session.get(self.url, params=querystring, timeout=self.timeout)
+        finally:
+            # Failed requests are timed too, so the latency covers every request sent, retries included.
+            self.instrumentation.observe("geocoder_latency_ms", (time.perf_counter() - start) * 1000)
+
+    def _fetch(self, address):
+        querystring = {
+            "f": "json",
+            "singleLine": address}
+
+        attempt = 0
+        while True:
+            self.rate_limiter.wait()
+            with self._counter_lock:
+                self.requests += 1
+            try:
+                response = self._get(querystring)
+                if response.status_code in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                j = json.loads(response.text)
+
+            except (requests.RequestException, json.JSONDecodeError):
+                with self._counter_lock:
+                    self.failures += 1
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self.backoff_factor * (2 ** attempt))
+                attempt += 1
+                continue
+
+            candidates = j.get('candidates')
+            if not candidates:
+                raise LookupError(address)
+
+            location = candidates[0]['location']  # returns first location as X, Y
+
+            if self.cache is not None:
+                self.cache.put(address, location)
+
+            return location
+
+    def stats(self):
+        """Method to report the request counters and, when there is a cache, its hit rate.
+
+        Returns:
+            [Dict] -- Requests sent, failed requests and the cache statistics.
+        """
+        return {"requests": self.requests,
+                "failures": self.failures,
+                "cache": self.cache.stats() if self.cache is not None else None}
+
+    def _geocode_or_none(self, address, use_cache=True):
+        try:
+            if use_cache:
+                return self.geocode(address)
+            return self._fetch(address)
+        except (requests.RequestException, json.JSONDecodeError, LookupError):
+            return None
+
+    def submit(self, address=None):
+        """Method that queues an address for geocoding on the worker pool.
+
+        Keyword Arguments:
+            address {str} -- The single line address to geocode. (default: {None})
+
+        Returns:
+            [Future] -- Resolves to the location dictionary, or None if the address could not be geocoded.
+        """
+        if self.cache is not None:
+            location = self.cache.get(address)
+            if location is not None:
+                future = Future()
+                future.set_result(location)
+                return future
+
+        return self._get_executor().submit(self._geocode_or_none, address, False)
+
+    def geocode_many(self, addresses=None):
+        """Method that geocodes a batch of addresses concurrently.
+
+        Keyword Arguments:
+            addresses {List} -- The single line addresses to geocode. (default: {None})
+
+        Returns:
+            [List] -- Location dictionaries in the same order as the input.  Failed lookups are None.
+        """
+        return list(self._get_executor().map(self._geocode_or_none, addresses or []))
+
+    def locate(self, address=None):
+        return self._geocode_or_none(address)
+
+    def locate_many(self, addresses=None):
+        return self.geocode_many(addresses)
@@ -0,0 +1,368 @@
+import numpy as np
+
+
+class CSRGraph:
+    """
+    Compact undirected graph stored as compressed sparse row arrays.
+
+    Node ids are 0 to number_of_nodes - 1.  The neighbors of node i are indices[indptr[i]:indptr[i + 1]],
+    so a graph costs a few bytes per edge instead of the dict-of-dicts networkx keeps per node.
+
+    When initializing a CSRGraph class, include the following parameters:
+        indptr:   (ndarray) Offsets into indices, one more than the number of nodes.
+        indices:  (ndarray) Neighbor ids, sorted within each node.
+        groups:   (ndarray) Group id of each node, such as the company it belongs to. (Optional)
+    """
+    def __init__(self, indptr, indices, groups=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.groups = groups
+
+    def __repr__(self):
+        return f"CSRGraph({self.number_of_nodes} nodes, {self.number_of_edges} edges)"
+
+    @property
+    def number_of_nodes(self):
+        return len(self.indptr) - 1
+
+    @property
+    def number_of_edges(self):
+        return len(self.indices) // 2
+
+    @property
+    def nodes(self):
+        return range(self.number_of_nodes)
+
+    @classmethod
+    def from_edges(cls, number_of_nodes, source, target, groups=None):
+        """Method to build a graph from edge endpoint arrays.  Self loops and repeated edges are dropped.
+
+        Arguments:
+            number_of_nodes {int} -- How many nodes the graph has.
+            source {ndarray} -- One endpoint of each edge.
+            target {ndarray} -- The other endpoint of each edge.
+
+        Keyword Arguments:
+            groups {ndarray} -- Group id of each node. (default: {None})
+
+        Returns:
+            [CSRGraph] -- The undirected graph.
+        """
+        source = np.asarray(source, dtype=np.int64)
+        target = np.asarray(target, dtype=np.int64)
+
+        keep = source != target
+        u = np.concatenate([source[keep], target[keep]])
+        v = np.concatenate([target[keep], source[keep]])
+
+        keys = np.sort(u * number_of_nodes + v)
+        keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])[:len(keys)]]
+        u = keys // max(number_of_nodes, 1)
+        v = keys % max(number_of_nodes, 1)
+
+        indptr = np.zeros(number_of_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(u, minlength=number_of_nodes), out=indptr[1:])
+
+        return cls(indptr, v.astype(np.int32), groups)
+
+    @classmethod
+    def from_networkx(cls, G):
+        """Method to convert a networkx graph whose nodes are 0 to n - 1.
+
+        Arguments:
+            G {nx.Graph} -- The graph to convert.
+
+        Returns:
+            [CSRGraph] -- The same graph in CSR form.
+        """
+        edges = np.array(list(G.edges()), dtype=np.int64).reshape(-1, 2)
+        return cls.from_edges(G.number_of_nodes(), edges[:, 0], edges[:, 1])
+
+    def neighbors(self, node):
+        """Method to list the neighbors of a node without copying.
+
+        Arguments:
+            node {int} -- The node id.
+
+        Returns:
+            [ndarray] -- Neighbor ids.
+        """
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def degree(self):
+        """Method to find the degree of every node.
+
+        Returns:
+            [ndarray] -- Degree per node.
+        """
+        return np.diff(self.indptr)
+
+    def edge_arrays(self):
+        """Method to list each undirected edge once.
+
+        Returns:
+            [Tuple] -- Source and target arrays with source < target.
+        """
+        source = np.repeat(np.arange(self.number_of_nodes), self.degree())
+        keep = source < self.indices
+        return source[keep], self.indices[keep].astype(np.int64)
+
+    def iter_edges(self, chunk_size=100000):
+        """Method to stream each undirected edge once, a range of nodes at a time, in the order of edge_arrays.
+
+        Keyword Arguments:
+            chunk_size {int} -- Roughly how many adjacency entries are read at once. (default: {100000})
+
+        Yields:
+            [Tuple] -- Source and target arrays with source < target.
+        """
+        start = 0
+        while start < self.number_of_nodes:
+            stop = int(np.searchsorted(self.indptr, self.indptr[start] + chunk_size, side='right')) - 1
+            stop = min(max(stop, start + 1), self.number_of_nodes)
+
+            positions = np.arange(self.indptr[start], self.indptr[stop])
+            source = np.searchsorted(self.indptr, positions, side='right') - 1
+            target = self.indices[positions].astype(np.int64)
+            keep = source < target
+            yield source[keep], target[keep]
+
+            start = stop
+
+    def to_networkx(self, names=None):
+        """Method to convert to a networkx graph carrying node names.  Intended for small graphs.
+
+        Keyword Arguments:
+            names {List} -- Name of each node, or None to leave a node unnamed. (default: {None})
+
+        Returns:
+            [nx.Graph] -- The same graph with a "name" attribute on each named node.
+        """
+        import networkx as nx
+
+        G = nx.Graph()
+        for node, name in enumerate(names if names is not None else [None] * self.number_of_nodes):
+            if name is None:
+                G.add_node(node)
+            else:
+                G.add_node(node, name=name)
+
+        source, target = self.edge_arrays()
+        G.add_edges_from(zip(source.tolist(), target.tolist()))
+        return G
+
+
+def _sample_pairs(rng, count, low_a, high_a, low_b, high_b):
+    return rng.integers(low_a, high_a, size=count), rng.integers(low_b, high_b, size=count)
+
+
+def _sample_distinct_pairs(rng, count, low, high):
+    # Draws count different pairs of different nodes in [low, high) by sampling their positions in the list
+    # of all pairs without replacement, so no draw is lost to a self loop or a repeated edge.  Position k is
+    # the pair (row, column) with column < row and k = row * (row - 1) / 2 + column.
+    positions = rng.choice((high - low) * (high - low - 1) // 2, size=count, replace=False)
+    row = ((1 + np.sqrt(1 + 8 * positions.astype(np.float64))) // 2).astype(np.int64)
+    # The square root can be off by one for large positions.
+    row -= row * (row - 1) // 2 > positions
+    row += (row + 1) * row // 2 <= positions
+    return low + row, low + positions - row * (row - 1) // 2
+
+
+def erdos_renyi(number_of_nodes=0, average_degree=4.0, rng=None):
+    """Builds a sparse G(n, p) random graph by sampling its edge count and then that many distinct edges.
+
+    Keyword Arguments:
+        number_of_nodes {int} -- How many nodes the graph has. (default: {0})
+        average_degree {float} -- Expected number of neighbors per node. (default: {4.0})
+        rng {Generator} -- NumPy random generator. (default: {None})
+
+    Returns:
+        [CSRGraph] -- The graph.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    pairs = number_of_nodes * (number_of_nodes - 1) // 2
+    p = min(average_degree / max(number_of_nodes - 1, 1), 1.0)
+
+    source, target = _sample_distinct_pairs(rng, rng.binomial(pairs, p), 0, number_of_nodes)
+    return CSRGraph.from_edges(number_of_nodes, source, target)
+
+
+def stochastic_block_model(sizes=None, p_in=0.1, p_out=0.001, rng=None):
+    """Builds a stochastic block model, where nodes link densely inside their block and sparsely across.
+
+    Edges inside each block and across blocks are drawn by sampling the edge count and then that many
+    distinct pairs of nodes.
+
+    Keyword Arguments:
+        sizes {List} -- Number of nodes in each block. (default: {None})
+        p_in {float} -- Edge probability between two nodes of the same block. (default: {0.1})
+        p_out {float} -- Edge probability between nodes of different blocks. (default: {0.001})
+        rng {Generator} -- NumPy random generator. (default: {None})
+
+    Returns:
+        [CSRGraph] -- The graph, with each node's block as its group.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    sizes = np.asarray(sizes, dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    number_of_nodes = int(offsets[-1])
+
+    sources = []
+    targets = []
+    for i in range(len(sizes)):
+        pairs = sizes[i] * (sizes[i] - 1) // 2
+        source, target = _sample_distinct_pairs(rng, rng.binomial(pairs, p_in), offsets[i], offsets[i + 1])
+        sources.append(source)
+        targets.append(target)
+
+    if p_out > 0 and len(sizes) > 1:
+        # Cross-block edges are drawn over all pairs at once and the ones landing inside a block are dropped.
+        # Only cross_fraction of the draws cross blocks, so each round draws enough for what is still
+        # missing, and rounds repeat until count distinct pairs are found.
+        cross_pairs = (number_of_nodes ** 2 - int((sizes ** 2).sum())) // 2
+        cross_fraction = 2 * cross_pairs / number_of_nodes ** 2
+        count = int(rng.binomial(cross_pairs, p_out))
+        groups = np.repeat(np.arange(len(sizes)), sizes)
+
+        keys = np.empty(0, dtype=np.int64)
+        while len(keys) < count:
+            missing = count - len(keys)
+            source, target = _sample_pairs(rng, int(missing / cross_fraction * 1.1) + 16,
+                                           0, number_of_nodes, 0, number_of_nodes)
+            keep = groups[source] != groups[target]
+            low = np.minimum(source[keep], target[keep])
+            high = np.maximum(source[keep], target[keep])
+
+            # Repeated pairs are dropped, keeping the order pairs were first drawn in.
+            keys = np.concatenate([keys, low * number_of_nodes + high])
+            _, first = np.unique(keys, return_index=True)
+            keys = keys[np.sort(first)]
+
+        keys = keys[:count]
+        sources.append(keys // number_of_nodes)
+        targets.append(keys % number_of_nodes)
+
+    groups = np.repeat(np.arange(len(sizes), dtype=np.int32), sizes)
+    return CSRGraph.from_edges(number_of_nodes, np.concatenate(sources), np.concatenate(targets), groups)
+
+
+def barabasi_albert(number_of_nodes=0, m=2, rng=None):
+    """Builds a Barabási–Albert preferential attachment graph.
+
+    Uses the Batagelj–Brandes edge list formulation: every new edge copies an endpoint of a uniformly
+    chosen earlier edge, which is the same as choosing a node in proportion to its degree.  The copy
+    chains are resolved for all edges at once by pointer jumping instead of adding nodes one by one.
+
+    Keyword Arguments:
+        number_of_nodes {int} -- How many nodes the graph has. (default: {0})
+        m {int} -- Edges each new node attaches with. (default: {2})
+        rng {Generator} -- NumPy random generator. (default: {None})
+
+    Returns:
+        [CSRGraph] -- The graph.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    if number_of_nodes <= m:
+        print("Barabasi-Albert graphs need more nodes than edges per node.")
+        raise ValueError
+
+    number_of_edges = (number_of_nodes - m) * m
+    edge = np.arange(number_of_edges)
+    source = m + edge // m
+
+    # Endpoint slot 2e holds the source of edge e and slot 2e + 1 its target.  The first m edges join
+    # node m to nodes 0..m-1; every later edge copies a random earlier slot.
+    target = np.full(number_of_edges, -1, dtype=np.int64)
+    pointer = np.full(number_of_edges, -1, dtype=np.int64)
+    target[:m] = np.arange(m)
+
+    slot = (rng.random(number_of_edges - m) * (2 * edge[m:])).astype(np.int64)
+    from_source = slot % 2 == 0
+    target[m:][from_source] = source[slot[from_source] // 2]
+    pointer[m:][~from_source] = slot[~from_source] // 2
+
+    while True:
+        pending = np.flatnonzero(pointer >= 0)
+        if len(pending) == 0:
+            break
+
+        referenced = pointer[pending]
+        jumped = pointer[referenced]
+        resolved = jumped < 0
+        target[pending[resolved]] = target[referenced[resolved]]
+        pointer[pending] = jumped
+
+    return CSRGraph.from_edges(number_of_nodes, source, target)
+
+
+def watts_strogatz(number_of_nodes=0, k=4, p=0.1, rng=None):
+    """Builds a Watts–Strogatz small world graph: a ring lattice with a fraction of edges rewired.
+
+    Keyword Arguments:
+        number_of_nodes {int} -- How many nodes the graph has. (default: {0})
+        k {int} -- Each node links to its k nearest ring neighbors. (default: {4})
+        p {float} -- Probability that an edge is rewired to a random node. (default: {0.1})
+        rng {Generator} -- NumPy random generator. (default: {None})
+
+    Returns:
+        [CSRGraph] -- The graph.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    if k >= number_of_nodes:
+        print("Watts-Strogatz graphs need more nodes than neighbors per node.")
+        raise ValueError
+
+    nodes = np.arange(number_of_nodes)
+    source = np.concatenate([nodes for _ in range(1, k // 2 + 1)])
+    target = np.concatenate([(nodes + j) % number_of_nodes for j in range(1, k // 2 + 1)])
+
+    rewire = rng.random(len(target)) < p
+    target[rewire] = rng.integers(0, number_of_nodes, size=int(rewire.sum()))
+
+    return CSRGraph.from_edges(number_of_nodes, source, target)
+
+
+def org_hierarchy(number_of_nodes=0, companies=5, branching=5, peer_probability=0.5, rng=None):
+    """Builds several company org charts: each company is a reporting tree, and people who share a
+    manager are linked as peers with some probability.
+
+    Keyword Arguments:
+        number_of_nodes {int} -- How many people across all companies. (default: {0})
+        companies {int} -- How many companies to split people into. (default: {5})
+        branching {int} -- Direct reports per manager. (default: {5})
+        peer_probability {float} -- Probability that two people with the same manager are linked. (default: {0.5})
+        rng {Generator} -- NumPy random generator. (default: {None})
+
+    Returns:
+        [CSRGraph] -- The graph, with each node's company as its group.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    companies = max(1, min(companies, number_of_nodes))
+
+    # Company sizes are uneven, like real employers, but every company gets at least one person.
+    shares = rng.dirichlet(np.ones(companies))
+    sizes = 1 + rng.multinomial(number_of_nodes - companies, shares)
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    groups = np.repeat(np.arange(companies, dtype=np.int32), sizes)
+
+    # Within a company, person i (counted from the company's first person) reports to (i - 1) // branching.
+    node = np.arange(number_of_nodes)
+    local = node - offsets[groups]
+    employees = node[local > 0]
+    managers = offsets[groups[employees]] + (local[local > 0] - 1) // branching
+
+    sources = [employees]
+    targets = [managers]
+
+    # Peers are consecutive reports of the same manager.
+    for gap in range(1, branching):
+        peer = employees + gap
+        inside = peer < number_of_nodes
+        same_manager = np.zeros(len(employees), dtype=bool)
+        same_manager[inside] = groups[peer[inside]] == groups[employees[inside]]
+        same_manager[inside] &= (offsets[groups[peer[inside]]] + (local[peer[inside]] - 1) // branching) == managers[inside]
+        linked = same_manager & (rng.random(len(employees)) < peer_probability)
+        sources.append(employees[linked])
+        targets.append(peer[linked])
+
+    return CSRGraph.from_edges(number_of_nodes, np.concatenate(sources), np.concatenate(targets), groups)
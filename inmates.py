@@ -0,0 +1,127 @@
+import json
+import os
+
+import numpy as np
+
+from snapshot import StringTable
+
+# Joins the key columns of a row when inmates are identified by more than one column.
+KEY_SEPARATOR = ' '
+
+INDEX_FILE = "index.json"
+
+
+def _check_key_columns(key_columns):
+    if all(type(column) == int for column in key_columns):
+        return False
+    if all(type(column) == str for column in key_columns):
+        return True
+
+    print("Inmate key columns must all be column names or all be column positions.")
+    raise ValueError
+
+
+def iter_inmate_keys(csv_file=None, key_columns=None, chunk_size=100000):
+    """Reads the inmate keys of a roster one chunk of rows at a time.
+
+    Keyword Arguments:
+        csv_file {str} -- Path to the roster. (default: {None})
+        key_columns {List} -- Column positions, or column names from the header row, that identify an inmate.
+                              Several columns are joined with KEY_SEPARATOR.  Defaults to the first column of a
+                              file without a header. (default: {None})
+        chunk_size {int} -- Rows read at a time. (default: {100000})
+
+    Yields:
+        [ndarray] -- Object array with the key of each row in the chunk.  Rows with an empty key are skipped.
+    """
+    import pandas as pd
+
+    key_columns = list(key_columns) if key_columns else [0]
+    named = _check_key_columns(key_columns)
+
+    reader = pd.read_csv(csv_file, header=0 if named else None, usecols=key_columns, dtype=str,
+                         keep_default_na=False, chunksize=chunk_size)
+
+    with reader:
+        for chunk in reader:
+            columns = [chunk[column] for column in key_columns]
+
+            keys = columns[0] if len(columns) == 1 else columns[0].str.cat(columns[1:], sep=KEY_SEPARATOR)
+            present = np.logical_and.reduce([column.to_numpy() != '' for column in columns])
+            yield keys.to_numpy(dtype=object)[present]
+
+
+def _source_signature(csv_file, key_columns):
+    status = os.stat(csv_file)
+    return {"source": os.path.abspath(csv_file),
+            "size": status.st_size,
+            "modified": status.st_mtime_ns,
+            "key_columns": list(key_columns) if key_columns else [0]}
+
+
+def _read_index(index_path, signature):
+    try:
+        with open(os.path.join(index_path, INDEX_FILE), 'r') as index_file:
+            if json.load(index_file) != signature:
+                return None
+
+        return StringTable(np.load(os.path.join(index_path, "keys.offsets.npy"), mmap_mode='r'),
+                           np.load(os.path.join(index_path, "keys.data.npy"), mmap_mode='r')).tolist()
+    except (OSError, ValueError):
+        return None
+
+
+def _write_index(index_path, signature, keys):
+    os.makedirs(index_path, exist_ok=True)
+
+    table = StringTable.from_values(keys)
+    np.save(os.path.join(index_path, "keys.offsets.npy"), table.offsets)
+    np.save(os.path.join(index_path, "keys.data.npy"), table.data)
+
+    # The signature goes last, so an index interrupted part way through is never trusted.
+    with open(os.path.join(index_path, INDEX_FILE), 'w') as index_file:
+        json.dump(signature, index_file, indent=4)
+
+
+def import_inmates(csv_file=None, registry=None, key_columns=None, chunk_size=100000, index_path=None):
+    """Streams an inmate roster into an EntityRegistry, dropping repeated inmates.
+
+    Rows are read in chunks, each chunk is deduplicated with pandas' hash table, and the registry's hash
+    index drops inmates already seen in earlier chunks.  Ids are handed out in order of first appearance,
+    so the same roster always produces the same ids.
+
+    With index_path, the unique keys are also written to an on-disk id index: a directory holding the keys
+    in id order as a memory mapped StringTable.  Later imports of the same unchanged file with the same key
+    columns read the index instead of parsing the roster again.
+
+    Keyword Arguments:
+        csv_file {str} -- Path to the roster. (default: {None})
+        registry {EntityRegistry} -- Registry the inmates are registered in. (default: {None})
+        key_columns {List} -- Column positions or names that identify an inmate, see iter_inmate_keys. (default: {None})
+        chunk_size {int} -- Rows read at a time. (default: {100000})
+        index_path {str} -- Directory of the on-disk id index. (Optional) (default: {None})
+
+    Returns:
+        [ndarray] -- Entity id of each distinct inmate, in order of first appearance.
+    """
+    signature = _source_signature(csv_file, key_columns) if index_path is not None else None
+
+    if index_path is not None:
+        keys = _read_index(index_path, signature)
+        if keys is not None:
+            return registry.intern_many('inmate', keys)
+
+    import pandas as pd
+
+    ids = [registry.intern_many('inmate', pd.unique(keys))
+           for keys in iter_inmate_keys(csv_file, key_columns, chunk_size)]
+    ids = np.concatenate(ids) if ids else np.empty(0, dtype=np.int64)
+
+    # An inmate repeated in a later chunk gets its first id again, so keep the first occurrence of each id.
+    _, first = np.unique(ids, return_index=True)
+    ids = ids[np.sort(first)]
+
+    if index_path is not None:
+        _write_index(index_path, signature, registry.resolve('inmate', ids).tolist())
+
+    return ids
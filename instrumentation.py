@@ -0,0 +1,274 @@
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Upper bounds, in milliseconds, of the latency histogram buckets.  The last bucket holds everything slower.
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+def peak_rss_mb():
+    """Reads the peak resident memory of the current process.
+
+    Returns:
+        [float] -- Peak resident set size in megabytes, or None where the platform doesn't report it.
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes and macOS reports bytes.
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class Histogram:
+    """
+    Thread safe histogram with fixed bucket bounds.
+
+    When initializing a Histogram class, include the following parameters:
+        bounds:  (List) Sorted upper bound of each bucket.  Values above the last bound go in an overflow bucket.
+    """
+    def __init__(self, bounds=None):
+        self.bounds = list(bounds if bounds is not None else LATENCY_BUCKETS_MS)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        """Method to add one value to the histogram.
+
+        Arguments:
+            value {float} -- The value to record.
+        """
+        with self._lock:
+            self.counts[bisect_left(self.bounds, value)] += 1
+            self.count += 1
+            self.total += value
+            self.minimum = value if self.minimum is None else min(self.minimum, value)
+            self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    def to_dict(self):
+        """Method to export the histogram as a dictionary.
+
+        Returns:
+            [Dict] -- Count, mean, min, max and the count per bucket keyed by its upper bound.
+        """
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {"count": self.count,
+                "mean": self.total / self.count if self.count else None,
+                "min": self.minimum,
+                "max": self.maximum,
+                "buckets": dict(zip(labels, self.counts))}
+
+
+class Instrumentation:
+    """
+    Collects per-stage timings, record counters, memory peaks and histograms for a run, and reports
+    them as a JSON run report.
+
+    Stages are timed with stage(), which can be nested and can run on several threads at once.  Each stage
+    records the process's peak resident memory when it ended.  With trace_memory, a stage that started with
+    no other stage open also records its own peak Python allocation, including any stages nested in it.  tracemalloc's peak covers the whole
+    process, so nested stages and stages that overlapped another thread's get none.  Use
+    NullInstrumentation when nothing should be recorded, so instrumented code costs nothing when
+    reporting is off.
+
+    When initializing an Instrumentation class, include the following parameters:
+        trace_memory:  (Bool) Record the peak Python allocation of each stage with tracemalloc.  This
+                       slows allocation-heavy stages down noticeably.
+        progress:      (Callable) Called as progress(stage, done, total) while long stages run. (Optional)
+    """
+    enabled = True
+
+    def __init__(self, trace_memory=False, progress=None):
+        self.trace_memory = trace_memory
+        self.progress_callback = progress
+
+        self.stages = {}
+        self.counters = {}
+        self.histograms = {}
+        self.sections = {}
+
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+        # Stages open right now, each as [thread id, whether another thread opened a stage meanwhile].
+        self._open = []
+
+        self._tracing = trace_memory and not tracemalloc.is_tracing()
+        if self._tracing:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        """Method that times the code inside a with block as one stage.
+
+        Repeated stages with the same name add up their time.
+
+        Arguments:
+            name {str} -- The stage name, such as "people" or "export:money".
+        """
+        thread = threading.get_ident()
+        with self._lock:
+            # The traced peak is only this stage's own when nothing else was open while it ran.
+            alone = not self._open
+            for other in self._open:
+                if other[0] != thread:
+                    other[1] = True
+            record = [thread, any(other[0] != thread for other in self._open)]
+            self._open.append(record)
+
+            traced = self.trace_memory and alone and hasattr(tracemalloc, 'reset_peak')
+            if traced:
+                tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+
+            with self._lock:
+                self._open.remove(record)
+
+                stage = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+                stage["seconds"] += seconds
+                stage["calls"] += 1
+                stage["process_peak_rss_mb"] = peak_rss_mb()
+                if traced and not record[1]:
+                    stage["traced_peak_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+
+    def count(self, name, amount=1):
+        """Method to add to a record counter.
+
+        Arguments:
+            name {str} -- The counter name, such as "people" or "transactions:email".
+
+        Keyword Arguments:
+            amount {int} -- How much to add. (default: {1})
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, value):
+        """Method to add a value to a named histogram.
+
+        Arguments:
+            name {str} -- The histogram name.
+            value {float} -- The value to record.
+        """
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, Histogram())
+        histogram.observe(value)
+
+    def progress(self, stage, done, total=None):
+        """Method that reports how far a long stage has got to the progress callback, if there is one.
+
+        Arguments:
+            stage {str} -- The stage name.
+            done {int} -- Records finished so far.
+
+        Keyword Arguments:
+            total {int} -- Records the stage will finish, when known. (default: {None})
+        """
+        if self.progress_callback is not None:
+            self.progress_callback(stage, done, total)
+
+    def add_section(self, name, values):
+        """Method to attach extra results to the report, such as geocoder statistics.
+
+        Arguments:
+            name {str} -- The key the values are reported under.
+            values {Dict} -- JSON serializable values.
+        """
+        self.sections[name] = values
+
+    def to_dict(self):
+        """Method to export the run report as a dictionary.
+
+        Returns:
+            [Dict] -- Total time, peak memory, stages, counters, histograms and any added sections.
+        """
+        with self._lock:
+            stages = {name: dict(stage) for name, stage in self.stages.items()}
+
+        report = {"seconds": time.perf_counter() - self._started,
+                  "peak_rss_mb": peak_rss_mb(),
+                  "stages": stages,
+                  "counters": self.counters,
+                  "histograms": {name: histogram.to_dict() for name, histogram in self.histograms.items()}}
+        report.update(self.sections)
+        return report
+
+    def write(self, path):
+        """Method to write the run report as JSON.
+
+        Arguments:
+            path {str} -- The file to write.
+        """
+        with open(path, 'w') as report_file:
+            json.dump(self.to_dict(), report_file, indent=4, default=str)
+
+    def close(self):
+        """Method that stops memory tracing if this instance started it."""
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+
+class NullInstrumentation:
+    """
+    Stand-in for Instrumentation that records nothing.  Every method returns immediately.
+    """
+    enabled = False
+
+    _stage = nullcontext()
+
+    def stage(self, name):
+        return self._stage
+
+    def count(self, name, amount=1):
+        pass
+
+    def observe(self, name, value):
+        pass
+
+    def progress(self, stage, done, total=None):
+        pass
+
+    def add_section(self, name, values):
+        pass
+
+    def to_dict(self):
+        return {}
+
+    def write(self, path):
+        pass
+
+    def close(self):
+        pass
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+def print_progress(stage, done, total=None):
+    """Progress callback that prints one line per update to standard error."""
+    if total:
+        print(f"{stage}: {done}/{total} ({100.0 * done / total:.0f}%)", file=sys.stderr)
+    else:
+        print(f"{stage}: {done}", file=sys.stderr)
@@ -0,0 +1,200 @@
+import re
+from concurrent.futures import Future
+
+import numpy as np
+
+# Approximate bounding boxes as (min x, min y, max x, max y) in WGS84 longitude/latitude.
+STATE_BOUNDS = {
+    "AL": (-88.47, 30.22, -84.89, 35.01), "AK": (-179.15, 51.21, -129.98, 71.37),
+    "AZ": (-114.82, 31.33, -109.05, 37.00), "AR": (-94.62, 33.00, -89.64, 36.50),
+    "CA": (-124.41, 32.53, -114.13, 42.01), "CO": (-109.06, 36.99, -102.04, 41.00),
+    "CT": (-73.73, 40.98, -71.79, 42.05), "DE": (-75.79, 38.45, -75.05, 39.84),
+    "DC": (-77.12, 38.79, -76.91, 38.99), "FL": (-87.63, 24.52, -80.03, 31.00),
+    "GA": (-85.61, 30.36, -80.84, 35.00), "HI": (-160.25, 18.91, -154.81, 22.24),
+    "ID": (-117.24, 41.99, -111.04, 49.00), "IL": (-91.51, 36.97, -87.49, 42.51),
+    "IN": (-88.10, 37.77, -84.78, 41.76), "IA": (-96.64, 40.38, -90.14, 43.50),
+    "KS": (-102.05, 36.99, -94.59, 40.00), "KY": (-89.57, 36.50, -81.96, 39.15),
+    "LA": (-94.04, 28.93, -88.82, 33.02), "ME": (-71.08, 42.98, -66.95, 47.46),
+    "MD": (-79.49, 37.91, -75.05, 39.72), "MA": (-73.51, 41.24, -69.93, 42.89),
+    "MI": (-90.42, 41.70, -82.41, 48.31), "MN": (-97.24, 43.50, -89.49, 49.38),
+    "MS": (-91.66, 30.17, -88.10, 35.00), "MO": (-95.77, 35.99, -89.10, 40.61),
+    "MT": (-116.05, 44.36, -104.04, 49.00), "NE": (-104.05, 40.00, -95.31, 43.00),
+    "NV": (-120.01, 35.00, -114.04, 42.00), "NH": (-72.56, 42.70, -70.61, 45.31),
+    "NJ": (-75.56, 38.93, -73.89, 41.36), "NM": (-109.05, 31.33, -103.00, 37.00),
+    "NY": (-79.76, 40.50, -71.86, 45.02), "NC": (-84.32, 33.84, -75.46, 36.59),
+    "ND": (-104.05, 45.94, -96.55, 49.00), "OH": (-84.82, 38.40, -80.52, 41.98),
+    "OK": (-103.00, 33.62, -94.43, 37.00), "OR": (-124.57, 41.99, -116.46, 46.29),
+    "PA": (-80.52, 39.72, -74.69, 42.27), "RI": (-71.86, 41.15, -71.12, 42.02),
+    "SC": (-83.35, 32.03, -78.54, 35.22), "SD": (-104.06, 42.48, -96.44, 45.95),
+    "TN": (-90.31, 34.98, -81.65, 36.68), "TX": (-106.65, 25.84, -93.51, 36.50),
+    "UT": (-114.05, 37.00, -109.04, 42.00), "VT": (-73.44, 42.73, -71.46, 45.02),
+    "VA": (-83.68, 36.54, -75.24, 39.47), "WA": (-124.76, 45.54, -116.92, 49.00),
+    "WV": (-82.64, 37.20, -77.72, 40.64), "WI": (-92.89, 42.49, -86.25, 47.08),
+    "WY": (-111.06, 40.99, -104.05, 45.01), "AS": (-170.85, -14.38, -169.42, -14.16),
+    "FM": (138.05, 5.26, 163.04, 9.98), "GU": (144.62, 13.23, 144.96, 13.65),
+    "MH": (160.80, 4.57, 172.17, 14.68), "MP": (145.12, 14.11, 145.86, 15.29),
+    "PW": (131.12, 2.80, 134.75, 8.20), "PR": (-67.95, 17.88, -65.22, 18.52),
+    "VI": (-65.09, 17.67, -64.56, 18.41),
+}
+
+# Continental United States, used for addresses whose state can't be read and for "country" sampling.
+COUNTRY_BOUNDS = (-124.77, 24.52, -66.95, 49.38)
+
+STATE_PATTERN = re.compile(r"\b([A-Z]{2}) \d{5}\s*$")
+
+
+class LocationProvider:
+    """
+    Interface for anything that turns residence addresses into X/Y locations.
+
+    Subclasses implement locate_many.  submit returns an object with a result() method so callers can
+    queue addresses while they keep generating data and collect the locations afterwards.
+    """
+    def locate(self, address=None):
+        """Method to find the location of one address.
+
+        Keyword Arguments:
+            address {str} -- The single line address. (default: {None})
+
+        Returns:
+            [Dict] -- The location as {"x": ..., "y": ...}, or None if it could not be found.
+        """
+        return self.locate_many([address])[0]
+
+    def locate_many(self, addresses=None):
+        """Method to find the locations of a batch of addresses.
+
+        Keyword Arguments:
+            addresses {List} -- The single line addresses. (default: {None})
+
+        Returns:
+            [List] -- Location dictionaries in input order.  Addresses that could not be found are None.
+        """
+        raise NotImplementedError
+
+    def submit(self, address=None):
+        """Method to queue one address for locating.
+
+        Keyword Arguments:
+            address {str} -- The single line address. (default: {None})
+
+        Returns:
+            [Future] -- Resolves to the location dictionary, or None if it could not be found.
+        """
+        future = Future()
+        future.set_result(self.locate(address))
+        return future
+
+    def close(self):
+        """Method to release any resources held by the provider."""
+        pass
+
+
+class _PendingLocation:
+    def __init__(self, provider, address):
+        self._provider = provider
+        self.address = address
+        self._location = None
+        self._done = False
+
+    def _set(self, location):
+        self._location = location
+        self._done = True
+        self.address = None
+
+    def result(self):
+        if not self._done:
+            self._provider._resolve_pending()
+        return self._location
+
+
+class SyntheticLocationProvider(LocationProvider):
+    """
+    Fully offline location provider that draws plausible X/Y values instead of geocoding.
+
+    Points are drawn in vectorized batches.  Addresses queued through submit are held until the first
+    result is requested and are then placed in a single pass.  Each location is handed to the handle submit
+    returned, so the provider only holds the addresses still waiting, never the whole run's.
+
+    When initializing a SyntheticLocationProvider class, include the following parameters:
+        mode:    (String) "state" samples inside the bounding box of the state named in the address,
+                 "country" samples anywhere in the continental United States and
+                 "hubs" scatters points around the given hub locations.
+        hubs:    (List) (x, y) tuples to scatter points around.  Required for "hubs" mode.
+        spread:  (Float) Standard deviation in degrees of the scatter around each hub.
+        seed:    (Int) Seed for the random number generator. (Optional)
+    """
+    def __init__(self, mode="state", hubs=None, spread=0.05, seed=None):
+        if mode not in ['state', 'country', 'hubs']:
+            print("Location mode only accepts 'state', 'country', or 'hubs' as inputs.")
+            raise ValueError
+
+        if mode == 'hubs' and not hubs:
+            print("Please provide at least one hub location for 'hubs' mode.")
+            raise ValueError
+
+        self.mode = mode
+        self.hubs = np.asarray(hubs, dtype=np.float64) if hubs else None
+        self.spread = spread
+        self.rng = np.random.default_rng(seed)
+
+        self._state_index = {state: i for i, state in enumerate(STATE_BOUNDS)}
+        self._bounds = np.array(list(STATE_BOUNDS.values()) + [COUNTRY_BOUNDS], dtype=np.float64)
+
+        # Handles of the addresses queued since the last pass.
+        self._pending = []
+
+    def _bounds_for(self, addresses):
+        country = len(self._bounds) - 1
+
+        if self.mode == 'country':
+            return np.full(len(addresses), country, dtype=np.intp)
+
+        indexes = np.empty(len(addresses), dtype=np.intp)
+        for i, address in enumerate(addresses):
+            match = STATE_PATTERN.search(address or "")
+            indexes[i] = self._state_index.get(match.group(1), country) if match else country
+        return indexes
+
+    def sample(self, addresses=None, count=None):
+        """Method that draws locations for a batch in one vectorized pass.
+
+        Keyword Arguments:
+            addresses {List} -- Addresses to place.  Only read in "state" mode. (default: {None})
+            count {int} -- Number of points to draw when no addresses are given. (default: {None})
+
+        Returns:
+            [Tuple] -- Two NumPy arrays holding the x and y values.
+        """
+        if addresses is not None:
+            count = len(addresses)
+
+        if self.mode == 'hubs':
+            hub = self.rng.integers(0, len(self.hubs), size=count)
+            offsets = self.rng.normal(0.0, self.spread, size=(count, 2))
+            points = self.hubs[hub] + offsets
+            return points[:, 0], points[:, 1]
+
+        if addresses is None:
+            addresses = [None] * count
+
+        bounds = self._bounds[self._bounds_for(addresses)]
+        u = self.rng.random((count, 2))
+        x = bounds[:, 0] + u[:, 0] * (bounds[:, 2] - bounds[:, 0])
+        y = bounds[:, 1] + u[:, 1] * (bounds[:, 3] - bounds[:, 1])
+        return x, y
+
+    def locate_many(self, addresses=None):
+        addresses = list(addresses or [])
+        x, y = self.sample(addresses)
+        return [{"x": x_value, "y": y_value} for x_value, y_value in zip(x.tolist(), y.tolist())]
+
+    def submit(self, address=None):
+        handle = _PendingLocation(self, address)
+        self._pending.append(handle)
+        return handle
+
+    def _resolve_pending(self):
+        pending, self._pending = self._pending, []
+        for handle, location in zip(pending, self.locate_many([handle.address for handle in pending])):
+            handle._set(location)
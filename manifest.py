@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+
+MANIFEST_FILE = "manifest.json"
+
+# Bytes read at a time when hashing an output file.
+BLOCK_SIZE = 1 << 20
+
+
+def file_digest(path=None):
+    """Hashes a file in fixed size blocks, so files of any size are hashed in constant memory.
+
+    Keyword Arguments:
+        path {str} -- The file to hash. (default: {None})
+
+    Returns:
+        [str] -- The SHA-256 digest as hex.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def describe_file(path=None, rows=None):
+    """Builds the manifest entry of one output file.
+
+    Keyword Arguments:
+        path {str} -- The file. (default: {None})
+        rows {int} -- Rows the file holds, or None when it isn't a single table. (default: {None})
+
+    Returns:
+        [Dict] -- The file's digest, size and rows.
+    """
+    entry = {"sha256": file_digest(path), "bytes": os.path.getsize(path)}
+    if rows is not None:
+        entry["rows"] = rows
+    return entry
+
+
+def run_key(values=None):
+    """Hashes everything that decides a run's output, so two runs with the same key write the same files.
+
+    Keyword Arguments:
+        values {Dict} -- JSON serializable settings, seeds and dates. (default: {None})
+
+    Returns:
+        [str] -- The SHA-256 digest of the values as hex.
+    """
+    text = json.dumps(values, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def read_manifest(output_dir=None):
+    """Reads the manifest of an output directory.
+
+    Keyword Arguments:
+        output_dir {str} -- The output directory. (default: {None})
+
+    Returns:
+        [Dict] -- The manifest, or None when the directory has none.
+    """
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+
+    with open(path) as manifest_file:
+        return json.load(manifest_file)
+
+
+def write_manifest(output_dir=None, manifest=None):
+    """Writes the manifest of an output directory.
+
+    The manifest is written next to its final name and then renamed, so an interrupted write never leaves
+    a manifest that describes files it doesn't match.
+
+    Keyword Arguments:
+        output_dir {str} -- The output directory. (default: {None})
+        manifest {Dict} -- The run key, seeds and an entry for each file. (default: {None})
+    """
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    with open(path + ".tmp", 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=4)
+    os.replace(path + ".tmp", path)
+
+
+def changed_files(output_dir=None, manifest=None):
+    """Lists the files that no longer match the manifest.
+
+    Sizes are compared first, so a file that was cut short or added to is found without hashing it.
+
+    Keyword Arguments:
+        output_dir {str} -- The output directory. (default: {None})
+        manifest {Dict} -- The manifest written by write_manifest. (default: {None})
+
+    Returns:
+        [List] -- Names of files that are missing or whose contents differ.
+    """
+    changed = []
+    for name, entry in manifest["files"].items():
+        path = os.path.join(output_dir, name)
+        if not os.path.exists(path) or os.path.getsize(path) != entry["bytes"] or \
+                file_digest(path) != entry["sha256"]:
+            changed.append(name)
+    return changed
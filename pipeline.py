@@ -0,0 +1,121 @@
+import queue
+import threading
+from collections import deque
+
+
+def iter_pending(items=None, submit=None, window=1024):
+    """Submits each item as soon as it arrives and yields the results in input order.
+
+    At most window submissions are pending at once.  When the window is full the oldest result is waited
+    for before reading the next item, so a slow consumer, such as a geocoder, holds back the producer
+    instead of letting pending work pile up.
+
+    Keyword Arguments:
+        items {Iterable} -- Items to submit, produced lazily. (default: {None})
+        submit {Callable} -- Takes an item and returns an object with a result() method, such as a Future.
+                             (default: {None})
+        window {int} -- Most submissions pending at once. (default: {1024})
+
+    Yields:
+        [Tuple] -- (item, result) pairs, in the order the items arrived.
+    """
+    if window <= 0:
+        print("The pending window must be greater than zero.")
+        raise ValueError
+
+    pending = deque()
+    for item in items:
+        pending.append((item, submit(item)))
+        if len(pending) >= window:
+            item, future = pending.popleft()
+            yield item, future.result()
+
+    while pending:
+        item, future = pending.popleft()
+        yield item, future.result()
+
+
+class StageWorker:
+    """
+    Runs the jobs of one pipeline stage on a background thread, in the order they are queued, so the stage
+    works through earlier results while the caller produces the next ones.
+
+    Jobs wait in a bounded queue.  When it is full, put blocks until the worker catches up, which keeps
+    the work in flight, and the memory it holds, flat.  An error raised by a job is raised again by the
+    next put or by close, and the jobs queued after it are skipped.
+
+    With threaded set to False every job runs inside put instead, which gives the same results one stage
+    at a time.
+
+    When initializing a StageWorker class, include the following parameters:
+        function:    (Callable) Called with the arguments of each job.
+        queue_size:  (Int) Jobs that can wait before put blocks.
+        threaded:    (Bool) Run the jobs on a background thread.
+        name:        (String) Name of the thread, shown in tracebacks and debuggers. (Optional)
+    """
+    def __init__(self, function=None, queue_size=1, threaded=True, name=None):
+        if queue_size <= 0:
+            print("The queue size must be greater than zero.")
+            raise ValueError
+
+        self.function = function
+        self.threaded = threaded
+        self._error = None
+        self._thread = None
+
+        if threaded:
+            self._queue = queue.Queue(maxsize=queue_size)
+            self._thread = threading.Thread(target=self._work, name=name, daemon=True)
+            self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+            return
+
+        # Something already failed, so stop the worker without hiding the original error.
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            if self._error is None:
+                try:
+                    self.function(*job)
+                except BaseException as error:
+                    self._error = error
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def put(self, *args):
+        """Method that queues one job, waiting while the queue is full.
+
+        Arguments:
+            args -- Arguments the job calls function with.
+        """
+        if not self.threaded:
+            self.function(*args)
+            return
+
+        self._raise_error()
+        self._queue.put(args)
+
+    def close(self):
+        """Method that waits for every queued job to finish."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+        self._raise_error()
@@ -0,0 +1,424 @@
+import json
+from datetime import datetime
+
+from bulk_transactions import CONTACT_MIX
+from temporal import ARRIVAL_MODES
+from transaction_table import TRANSACTION_TYPES
+
+GRAPH_TYPES = ['Tree', 'Ring of Cliques', 'Random', 'Stochastic Block Model', 'Barabasi-Albert',
+               'Watts-Strogatz', 'Org Hierarchy']
+ATTRIBUTES = ['phone_number', 'work_email', 'credit_card']
+FORMATS = ['csv', 'parquet', 'd3']
+DATABASE_FORMATS = ['sqlite', 'postgres']
+LOCATION_MODES = ['geocode', 'synthetic']
+ENGINES = ['bulk', 'object']
+PROFILE_MODES = ['fast', 'faker']
+DESTINATION_MODES = ['uniform', 'graph']
+COWORKER_EXPORTS = ['joined', 'edges', 'both']
+
+# Settings the generated graph types accept in graph_options.  Anything not given uses the generator's default.
+GRAPH_OPTIONS = ['average_degree', 'blocks', 'p_in', 'p_out', 'm', 'k', 'p', 'companies', 'branching',
+                 'peer_probability']
+
+# Settings the temporal engine accepts in temporal_options.  Anything not given uses TemporalPattern's default.
+TEMPORAL_OPTIONS = ['rate', 'diurnal', 'weekly', 'bursts', 'burst_share', 'burst_width', 'branching', 'decay']
+
+# Settings the D3 export accepts in d3_options.
+D3_OPTIONS = ['compact', 'compression', 'attributes', 'weights']
+
+PARAMETERS = ['graph_type', 'number_of_people', 'attributes', 'transactions', 'formats',
+              'seed', 'locations', 'inmate_csv', 'output_dir', 'engine', 'chunk_size',
+              'workers', 'shard_size', 'profiles', 'graph_options',
+              'destinations', 'contact_mix', 'report', 'progress', 'trace_memory',
+              'coworkers', 'start_date', 'end_date', 'days', 'snapshot', 'append', 'd3_options',
+              'inmate_columns', 'inmate_index', 'arrivals', 'temporal_options', 'sort_by_time',
+              'sqlite_file', 'sqlite_sync', 'postgres_dsn', 'pipeline', 'manifest', 'skip_unchanged']
+
+# Settings that describe the population.  When appending to a snapshot these come from the snapshot.
+POPULATION_PARAMETERS = ['graph_type', 'number_of_people', 'attributes', 'seed', 'locations', 'inmate_csv',
+                         'profiles', 'graph_options', 'inmate_columns']
+
+# Settings that change how a run goes but not what it writes.  They're left out of the manifest's run key.
+# Sharded runs write the same files for any number of workers, so only whether a run is sharded is kept.
+RUNTIME_PARAMETERS = ['output_dir', 'report', 'progress', 'trace_memory', 'snapshot', 'inmate_index', 'pipeline',
+                      'manifest', 'skip_unchanged', 'workers', 'sqlite_sync']
+
+# The attribute a person needs before transactions of each type can be generated.
+TRANSACTION_ATTRIBUTES = {'phonecall': 'phone_number',
+                          'email': 'work_email',
+                          'money': 'credit_card'}
+
+
+class RunConfig:
+    """
+    Class that describes one DataFaker run from start to finish, so it can run without any prompts.
+
+    When initializing a RunConfig class, include the following parameters:
+        graph_type:        (String) "Tree", "Ring of Cliques", "Random", "Stochastic Block Model",
+                           "Barabasi-Albert", "Watts-Strogatz", "Org Hierarchy", or None for people without a graph.
+        number_of_people:  (Int) How many people to create.  Ignored for "Ring of Cliques", which sizes itself.
+        attributes:        (List) Which of "phone_number", "work_email" and "credit_card" to create.
+        transactions:      (List) Which of "phonecall", "email" and "money" transactions to generate.
+                           The attribute each type needs is created automatically.
+        formats:           (List) Output formats.  "csv" and "parquet" write the tables, "d3" writes the
+                           node-link JSON, and "sqlite" and "postgres" bulk load the tables into a database.
+        seed:              (Int) Seed for every random source. (Optional)
+        locations:         (String) "geocode" to use the ArcGIS World Geocoder or "synthetic" to stay offline.
+        inmate_csv:        (String) Path to an inmate roster.  Transactions then target inmates. (Optional)
+        output_dir:        (String) Directory the output files are written to.
+        engine:            (String) "bulk" generates transactions as NumPy columns, "object" builds one
+                           Transaction object at a time.
+        chunk_size:        (Int) Rows written to disk at a time.  Bounds the memory used by exports.
+        workers:           (Int) Generate people and transactions in shards across this many processes.
+                           The output only depends on the seed and shard size, not on the worker count. (Optional)
+        shard_size:        (Int) People per shard in sharded mode.
+        profiles:          (String) "fast" draws profiles in bulk from the Faker word lists, "faker" calls
+                           Faker.profile() for every person.
+        graph_options:     (Dict) Settings for the graph generator, such as {"m": 3} for "Barabasi-Albert" or
+                           {"companies": 20} for "Org Hierarchy".  Keys come from GRAPH_OPTIONS. (Optional)
+        destinations:      (String) "uniform" sends email and phone calls to anyone, "graph" sends them mostly
+                           along the social graph.  Needs a graph and the "bulk" engine.
+        contact_mix:       (List) For "graph" destinations, the shares sent to direct contacts, contacts of
+                           contacts, and anyone.  Must add up to one. (Optional)
+        report:            (String) Path to write a JSON run report with stage timings, counters and memory. (Optional)
+        progress:          (Bool) Print progress while long stages run.
+        trace_memory:      (Bool) Record each stage's peak Python allocation with tracemalloc.  Slows the run down.
+        coworkers:         (String) "joined" writes each coworker next to the person's full row, "edges" writes
+                           person_id and coworker_id pairs that refer to rows of the people table, "both" writes both.
+        start_date:        (String) ISO date or time the transactions start at.  Defaults to days before end_date,
+                           or to where the snapshot's last window ended when appending. (Optional)
+        end_date:          (String) ISO date or time the transactions end at.  Defaults to days after start_date,
+                           or to now. (Optional)
+        days:              (Int) Length of the transaction window in days when start_date or end_date is missing.
+        snapshot:          (String) Directory to save the population to, so later runs can append to it. (Optional)
+        append:            (Bool) Load the population from snapshot instead of generating one, and add a new window of
+                           transactions to the existing transaction files.  The population settings are taken from
+                           the snapshot.
+        d3_options:        (Dict) Settings for the D3 export: "compact" (Bool) drops the indentation, "compression"
+                           set to "gzip" writes data.json.gz, "attributes" (List) adds people columns such as
+                           "company" to each node, and "weights" (Bool) adds the number of email and phone calls
+                           between two neighbors to each link.  Keys come from D3_OPTIONS. (Optional)
+        inmate_columns:    (List) Column positions, or names from the header row, that identify an inmate in
+                           inmate_csv.  Several columns are joined with a space.  Defaults to the first column. (Optional)
+        inmate_index:      (String) Directory of an on-disk id index of the roster.  Later runs with the same
+                           unchanged roster load it instead of reading the CSV. (Optional)
+        arrivals:          (String) "uniform" gives each person between 1 and 10 transactions, "poisson" draws a
+                           Poisson count per person, and "hawkes" adds self-exciting follow-ups that cluster in time.
+                           Anything but "uniform" needs the "bulk" engine.
+        temporal_options:  (Dict) Settings for the temporal engine, such as {"diurnal": true, "weekly": true} for
+                           daily and weekly cycles, {"bursts": 2} for bursts of activity, or {"rate": 0.5} for the
+                           mean transactions per person per day.  Keys come from TEMPORAL_OPTIONS.  Needs the
+                           "bulk" engine. (Optional)
+        sort_by_time:      (Bool) Write transactions in order of time instead of grouped by person.  Needs the
+                           "bulk" engine.
+        sqlite_file:       (String) SQLite database the "sqlite" format writes to.  Defaults to data.sqlite in
+                           output_dir. (Optional)
+        sqlite_sync:       (Bool) Wait for each SQLite commit to reach the disk.  False loads faster, but a power
+                           loss or OS crash while writing can corrupt the database file.
+        postgres_dsn:      (String) Connection string of the database the "postgres" format writes to, such as
+                           "postgresql://user@localhost/faker".  Needs psycopg. (Optional)
+        pipeline:          (Bool) Write each table on a background thread while the next one is generated.  False
+                           runs every stage one after the other.  The output is the same either way.
+        manifest:          (Bool) Write manifest.json to output_dir with the SHA-256 digest, size and rows of every
+                           file written, the seeds and a key made from everything that decides the output.
+        skip_unchanged:    (Bool) Don't generate anything when output_dir's manifest has the same key and every file
+                           in it still matches its digest.  Needs a seed and a start or end date, unless appending.
+    """
+    def __init__(self, graph_type=None, number_of_people=0, attributes=None, transactions=None,
+                 formats=None, seed=None, locations='geocode', inmate_csv=None, output_dir='.', engine='bulk',
+                 chunk_size=100000, workers=None, shard_size=10000,
+                 profiles='fast', graph_options=None, destinations='uniform', contact_mix=None,
+                 report=None, progress=False, trace_memory=False, coworkers='joined',
+                 start_date=None, end_date=None, days=30, snapshot=None, append=False, d3_options=None,
+                 inmate_columns=None, inmate_index=None, arrivals='uniform', temporal_options=None,
+                 sort_by_time=False, sqlite_file=None, sqlite_sync=True, postgres_dsn=None, pipeline=True,
+                 manifest=True, skip_unchanged=False):
+        self.graph_type = graph_type
+        self.number_of_people = number_of_people
+        self.attributes = list(attributes) if attributes is not None else list(ATTRIBUTES)
+        self.transactions = list(transactions) if transactions is not None else list(TRANSACTION_TYPES)
+        self.formats = list(formats) if formats is not None else list(FORMATS)
+        self.seed = seed
+        self.locations = locations
+        self.inmate_csv = inmate_csv
+        self.output_dir = output_dir
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.shard_size = shard_size
+        self.profiles = profiles
+        self.graph_options = dict(graph_options) if graph_options is not None else {}
+        self.destinations = destinations
+        self.contact_mix = list(contact_mix) if contact_mix is not None else list(CONTACT_MIX)
+        self.report = report
+        self.progress = progress
+        self.trace_memory = trace_memory
+        self.coworkers = coworkers
+        self.start_date = start_date
+        self.end_date = end_date
+        self.days = days
+        self.snapshot = snapshot
+        self.append = append
+        self.d3_options = dict(d3_options) if d3_options is not None else {}
+        self.inmate_columns = list(inmate_columns) if inmate_columns is not None else None
+        self.inmate_index = inmate_index
+        self.arrivals = arrivals
+        self.temporal_options = dict(temporal_options) if temporal_options is not None else {}
+        self.sort_by_time = sort_by_time
+        self.sqlite_file = sqlite_file
+        self.sqlite_sync = sqlite_sync
+        self.postgres_dsn = postgres_dsn
+        self.pipeline = pipeline
+        self.manifest = manifest
+        self.skip_unchanged = skip_unchanged
+
+        for transaction_type in self.transactions:
+            attribute = TRANSACTION_ATTRIBUTES.get(transaction_type)
+            if attribute is not None and attribute not in self.attributes:
+                self.attributes.append(attribute)
+
+        self._validate_input_parameters()
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def _validate_input_parameters(self):
+        """ Validates the configuration before any data is generated.
+
+        Raises:
+            ValueError: Graph type is not a valid graph type, or a graph option is not recognized.
+            ValueError: Number of people is not a positive whole number.
+            ValueError: An attribute, transaction type, format, location mode or engine is not recognized.
+            ValueError: A date is not an ISO date, or appending without a snapshot.
+        """
+        if self.graph_type is not None and self.graph_type not in GRAPH_TYPES:
+            print(f"Graph type only accepts {', '.join(GRAPH_TYPES)} as inputs.")
+            raise ValueError
+
+        for option in self.graph_options:
+            if option not in GRAPH_OPTIONS:
+                print(f"Graph options only accepts {', '.join(GRAPH_OPTIONS)} as keys.")
+                raise ValueError
+
+        for option, value in self.d3_options.items():
+            if option not in D3_OPTIONS:
+                print(f"D3 options only accepts {', '.join(D3_OPTIONS)} as keys.")
+                raise ValueError
+
+            if option in ['compact', 'weights'] and type(value) != bool:
+                print("The D3 compact and weights options only accept true or false.")
+                raise ValueError
+
+        if self.d3_options.get('compression') not in [None, 'gzip']:
+            print("D3 compression only accepts 'gzip' or None as inputs.")
+            raise ValueError
+
+        if type(self.d3_options.get('attributes', [])) != list:
+            print("D3 attributes only accepts a list of people columns.")
+            raise ValueError
+
+        for option, value in self.temporal_options.items():
+            if option not in TEMPORAL_OPTIONS:
+                print(f"Temporal options only accepts {', '.join(TEMPORAL_OPTIONS)} as keys.")
+                raise ValueError
+
+            if option in ['diurnal', 'weekly'] and type(value) != bool:
+                print("The diurnal and weekly temporal options only accept true or false.")
+                raise ValueError
+
+        if self.inmate_columns is not None:
+            if not self.inmate_columns or not (all(type(column) == int for column in self.inmate_columns) or
+                                               all(type(column) == str for column in self.inmate_columns)):
+                print("Inmate columns must all be column names or all be column positions.")
+                raise ValueError
+
+        if self.inmate_csv is None and self.graph_type != 'Ring of Cliques' and not self.append:
+            if type(self.number_of_people) != int or self.number_of_people <= 0:
+                print("Please enter a number greater than zero for the number of people")
+                raise ValueError
+
+        for name, values, valid in [('Attribute', self.attributes, ATTRIBUTES),
+                                    ('Transaction type', self.transactions, TRANSACTION_TYPES),
+                                    ('Format', self.formats, FORMATS + DATABASE_FORMATS)]:
+            for value in values:
+                if value not in valid:
+                    print(f"{name} only accepts {', '.join(valid)} as inputs.")
+                    raise ValueError
+
+        if 'postgres' in self.formats and self.postgres_dsn is None:
+            print("The postgres format needs a connection string.")
+            raise ValueError
+
+        if self.locations not in LOCATION_MODES:
+            print(f"Locations only accepts {', '.join(LOCATION_MODES)} as inputs.")
+            raise ValueError
+
+        if type(self.chunk_size) != int or self.chunk_size <= 0:
+            print("Please enter a number greater than zero for the chunk size")
+            raise ValueError
+
+        if self.profiles not in PROFILE_MODES:
+            print(f"Profiles only accepts {', '.join(PROFILE_MODES)} as inputs.")
+            raise ValueError
+
+        if self.engine not in ENGINES:
+            print(f"Engine only accepts {', '.join(ENGINES)} as inputs.")
+            raise ValueError
+
+        if self.destinations not in DESTINATION_MODES:
+            print(f"Destinations only accepts {', '.join(DESTINATION_MODES)} as inputs.")
+            raise ValueError
+
+        if len(self.contact_mix) != 3 or min(self.contact_mix) < 0 or abs(sum(self.contact_mix) - 1) > 1e-9:
+            print("Contact mix needs three shares that add up to one.")
+            raise ValueError
+
+        if self.destinations == 'graph':
+            if (self.graph_type is None and not self.append) or self.inmate_csv is not None:
+                print("Graph destinations need a graph type and no inmate data.")
+                raise ValueError
+
+            if self.engine != 'bulk':
+                print("Graph destinations only support the 'bulk' engine.")
+                raise ValueError
+
+        if self.arrivals not in ARRIVAL_MODES:
+            print(f"Arrivals only accepts {', '.join(ARRIVAL_MODES)} as inputs.")
+            raise ValueError
+
+        if type(self.sort_by_time) != bool:
+            print("Sort by time only accepts true or false.")
+            raise ValueError
+
+        if (self.arrivals != 'uniform' or self.temporal_options or self.sort_by_time) and self.engine != 'bulk':
+            print("Arrivals, temporal options and sorting by time only support the 'bulk' engine.")
+            raise ValueError
+
+        if self.coworkers not in COWORKER_EXPORTS:
+            print(f"Coworkers only accepts {', '.join(COWORKER_EXPORTS)} as inputs.")
+            raise ValueError
+
+        if type(self.progress) != bool or type(self.trace_memory) != bool or type(self.append) != bool or \
+                type(self.pipeline) != bool or type(self.manifest) != bool or type(self.skip_unchanged) != bool:
+            print("Progress, trace memory, append, pipeline, manifest and skip unchanged only accept true or false.")
+            raise ValueError
+
+        if self.skip_unchanged and not self.manifest:
+            print("Skipping unchanged output needs the manifest.")
+            raise ValueError
+
+        # Without a seed, or with a window that ends now, no two runs write the same output, so nothing could
+        # ever be skipped.  An appended window without dates starts where the snapshot's last one ended.
+        if self.skip_unchanged and not self.append and \
+                (self.seed is None or (self.start_date is None and self.end_date is None)):
+            print("Skipping unchanged output needs a seed and a start or end date.")
+            raise ValueError
+
+        for date in [self.start_date, self.end_date]:
+            if date is not None:
+                try:
+                    datetime.fromisoformat(date)
+                except (TypeError, ValueError):
+                    print("Start and end dates only accept ISO dates such as 2024-01-31 or 2024-01-31T12:00:00.")
+                    raise ValueError
+
+        if self.start_date is not None and self.end_date is not None and \
+                datetime.fromisoformat(self.start_date) >= datetime.fromisoformat(self.end_date):
+            print("The start date must be before the end date.")
+            raise ValueError
+
+        if type(self.days) != int or self.days <= 0:
+            print("Please enter a number greater than zero for the number of days")
+            raise ValueError
+
+        if self.append and self.snapshot is None:
+            print("Appending needs the snapshot to append to.")
+            raise ValueError
+
+        if self.workers is not None:
+            if type(self.workers) != int or self.workers <= 0:
+                print("Please enter a number greater than zero for the number of workers")
+                raise ValueError
+
+            if type(self.shard_size) != int or self.shard_size <= 0:
+                print("Please enter a number greater than zero for the shard size")
+                raise ValueError
+
+            if self.engine != 'bulk':
+                print("Sharded generation only supports the 'bulk' engine.")
+                raise ValueError
+
+    def to_dict(self):
+        """Method to export the configuration as a dictionary.
+
+        Returns:
+            [Dict] -- Dictionary representation of the class
+        """
+        return {"graph_type": self.graph_type,
+                "number_of_people": self.number_of_people,
+                "attributes": self.attributes,
+                "transactions": self.transactions,
+                "formats": self.formats,
+                "seed": self.seed,
+                "locations": self.locations,
+                "inmate_csv": self.inmate_csv,
+                "output_dir": self.output_dir,
+                "engine": self.engine,
+                "chunk_size": self.chunk_size,
+                "workers": self.workers,
+                "shard_size": self.shard_size,
+                "profiles": self.profiles,
+                "graph_options": self.graph_options,
+                "destinations": self.destinations,
+                "contact_mix": self.contact_mix,
+                "report": self.report,
+                "progress": self.progress,
+                "trace_memory": self.trace_memory,
+                "coworkers": self.coworkers,
+                "start_date": self.start_date,
+                "end_date": self.end_date,
+                "days": self.days,
+                "snapshot": self.snapshot,
+                "append": self.append,
+                "d3_options": self.d3_options,
+                "inmate_columns": self.inmate_columns,
+                "inmate_index": self.inmate_index,
+                "arrivals": self.arrivals,
+                "temporal_options": self.temporal_options,
+                "sort_by_time": self.sort_by_time,
+                "sqlite_file": self.sqlite_file,
+                "sqlite_sync": self.sqlite_sync,
+                "postgres_dsn": self.postgres_dsn,
+                "pipeline": self.pipeline,
+                "manifest": self.manifest,
+                "skip_unchanged": self.skip_unchanged}
+
+    @classmethod
+    def from_dict(cls, values):
+        """Method to build a configuration from a dictionary, such as a parsed config file.
+
+        Arguments:
+            values {Dict} -- Keys matching the RunConfig parameters.  Unknown keys are rejected.
+
+        Returns:
+            [RunConfig] -- The validated configuration.
+        """
+        unknown = set(values) - set(PARAMETERS)
+        if unknown:
+            print(f"Unknown configuration keys: {', '.join(sorted(unknown))}")
+            raise ValueError
+
+        return cls(**values)
+
+    @classmethod
+    def from_file(cls, path):
+        """Method to read a configuration from a JSON file.
+
+        Arguments:
+            path {str} -- Path to the JSON config file.
+
+        Returns:
+            [RunConfig] -- The validated configuration.
+        """
+        with open(path, 'r') as config_file:
+            return cls.from_dict(json.load(config_file))
@@ -0,0 +1,212 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from bulk_transactions import BulkTransactionGenerator
+from fast_profiles import ProfileGenerator, create_faker
+from locations import SyntheticLocationProvider
+
+PEOPLE_FIELDS = ['name', 'company', 'ssn', 'address', 'job', 'email', 'birthday',
+                 'x', 'y', 'phone_number', 'work_email', 'credit_card', 'node']
+
+# Worker processes are started fresh instead of forked.  The export thread may be writing, and holding locks
+# such as the import lock, when a pool starts, and a forked child would inherit those locks held forever.
+START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# Each worker process keeps one Faker and the read-only data every task of a stage needs.
+_fake = None
+_shared = {}
+
+
+def shard_ranges(total=0, shard_size=10000):
+    """Splits a number of records into consecutive shards.
+
+    Shards depend only on the total and the shard size, never on the number of workers, so every
+    worker count produces the same shards.
+
+    Keyword Arguments:
+        total {int} -- Number of records to split. (default: {0})
+        shard_size {int} -- Largest number of records in one shard. (default: {10000})
+
+    Returns:
+        [List] -- (start, stop) tuples covering 0 to total.
+    """
+    return [(start, min(start + shard_size, total)) for start in range(0, total, shard_size)]
+
+
+def shard_seeds(master_seed=None, stage=0, number_of_shards=0):
+    """Derives one independent seed per shard of a stage from the master seed.
+
+    Keyword Arguments:
+        master_seed {int} -- The seed the whole run is reproduced from. (default: {None})
+        stage {int} -- Which generation stage the seeds are for.  Each stage gets its own streams. (default: {0})
+        number_of_shards {int} -- How many seeds to derive. (default: {0})
+
+    Returns:
+        [List] -- Integer seeds, one per shard.
+    """
+    stage_sequence = np.random.SeedSequence([master_seed, stage])
+    return [int(child.generate_state(1)[0]) for child in stage_sequence.spawn(number_of_shards)]
+
+
+def _init_worker(shared):
+    _shared.clear()
+    _shared.update(shared)
+
+
+def _get_fake(seed):
+    global _fake
+    if _fake is None:
+        _fake = create_faker()
+    _fake.seed_instance(seed)
+    return _fake
+
+
+def generate_people_shard(task):
+    """Generates the people of one shard.  Runs inside a worker process.
+
+    Arguments:
+        task {Tuple} -- (seed, start, stop) for the shard.
+
+    Returns:
+        [Dict] -- PEOPLE_FIELDS mapped to lists, one entry per located person in the shard.  With geocoded
+                  locations, "geocodes" holds the new cache entries for the parent process to store.
+    """
+    seed, start, stop = task
+    fake = _get_fake(seed)
+
+    if _shared['profiles'] == 'fast':
+        profiles = ProfileGenerator(fake, seed=[seed, 1]).profiles(stop - start)
+    else:
+        profiles = (fake.profile() for _ in range(start, stop))
+
+    # In a graph everyone in a group works for the group's company.  Graphs without groups are one company.
+    companies = _shared['companies']
+    groups = _shared['groups']
+
+    people = {field: [] for field in PEOPLE_FIELDS}
+    for node, profile in enumerate(profiles, start):
+        people['name'].append(profile['name'])
+        if companies is None:
+            people['company'].append(profile['company'])
+        else:
+            people['company'].append(companies[int(groups[node]) if groups is not None else 0])
+        people['ssn'].append(profile['ssn'])
+        people['address'].append(profile['residence'])
+        people['job'].append(profile['job'])
+        people['email'].append(profile['mail'])
+        people['birthday'].append(profile['birthdate'])
+
+    cache = None
+    if _shared['locations'] == 'geocode':
+        from geocode_cache import GeocodeCache
+        from geocoder import Geocoder
+
+        # Workers only read the run's cache.  The parent process writes what they found, so no two
+        # processes ever write the same SQLite file.
+        cache = GeocodeCache(_shared['geocode_cache'], read_only=True)
+        provider = Geocoder(cache=cache)
+    else:
+        provider = SyntheticLocationProvider(seed=[seed, 2])
+
+    try:
+        locations = provider.locate_many(people['address'])
+    finally:
+        provider.close()
+
+    # People whose address couldn't be located are left out, as they are without shards.
+    located = [i for i, location in enumerate(locations) if location is not None]
+    for i, location in enumerate(locations):
+        if location is None:
+            print(f"Error processing record {str(start + i)}")
+
+    for field in ['name', 'company', 'ssn', 'address', 'job', 'email', 'birthday']:
+        people[field] = [people[field][i] for i in located]
+    people['x'] = [locations[i]['x'] for i in located]
+    people['y'] = [locations[i]['y'] for i in located]
+    people['node'] = [start + i for i in located]
+
+    attributes = _shared['attributes']
+    for name in people['name']:
+        people['phone_number'].append(fake.phone_number() if 'phone_number' in attributes else None)
+        people['work_email'].append(name.replace(" ", ".") + "@" + fake.domain_name()
+                                    if 'work_email' in attributes else None)
+        people['credit_card'].append(fake.credit_card_number() if 'credit_card' in attributes else None)
+
+    if cache is not None:
+        people['geocodes'] = cache.take_pending()
+
+    return people
+
+
+def generate_transaction_shard(task):
+    """Generates one transaction type for the origins of one shard.  Runs inside a worker process.
+
+    Arguments:
+        task {Tuple} -- (transaction_type, seed, start, stop) for the shard.
+
+    Returns:
+        [Dict] -- The batch from BulkTransactionGenerator.generate_ids with global origin ids.
+    """
+    transaction_type, seed, start, stop = task
+    pool = _shared['pools'][transaction_type]
+
+    generator = BulkTransactionGenerator(start_date=_shared['start_date'], end_date=_shared['end_date'], seed=seed,
+                                         temporal=_shared['temporal'])
+
+    self_destination = pool['self_destination']
+    batch = generator.generate_ids(stop - start, len(pool['destinations']),
+                                   pool['origin_x'][start:stop], pool['origin_y'][start:stop],
+                                   pool['destination_x'], pool['destination_y'], pool['amount_range'],
+                                   self_destination[start:stop] if self_destination is not None else None,
+                                   pool['contacts'], pool['contact_mix'], start)
+
+    batch['origin_id'] = batch['origin_id'] + start
+    return batch
+
+
+class ShardRunner:
+    """
+    Class that runs shard tasks either in a process pool or in the current process.
+
+    Results always come back in shard order, so merging them gives the same output for any worker count.
+
+    When initializing a ShardRunner class, include the following parameters:
+        workers:  (Int) Number of worker processes.  1 runs every shard in the current process.
+    """
+    def __init__(self, workers=1):
+        if workers < 1:
+            print("Workers must be greater than zero.")
+            raise ValueError
+
+        self.workers = workers
+
+    def map(self, function, tasks, shared=None, progress=None):
+        """Method that runs a task function over every shard.
+
+        Arguments:
+            function {Callable} -- A module level shard function.
+            tasks {List} -- One task tuple per shard.
+
+        Keyword Arguments:
+            shared {Dict} -- Read-only data sent once to each worker instead of with every task. (default: {None})
+            progress {Callable} -- Called as progress(done, total) as each result arrives. (default: {None})
+
+        Returns:
+            [List] -- The results, in task order.
+        """
+        if self.workers == 1 or len(tasks) <= 1:
+            _init_worker(shared or {})
+            return self._collect((function(task) for task in tasks), len(tasks), progress)
+
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context(START_METHOD),
+                                 initializer=_init_worker, initargs=(shared or {},)) as executor:
+            return self._collect(executor.map(function, tasks), len(tasks), progress)
+
+    def _collect(self, results, total, progress):
+        collected = []
+        for result in results:
+            collected.append(result)
+            if progress is not None:
+                progress(len(collected), total)
+        return collected
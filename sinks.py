@@ -0,0 +1,266 @@
+import queue
+import threading
+
+import numpy as np
+
+from exporters import ChunkedWriter
+
+# Name of the column holding the row index, the same index the CSV files start each row with.
+INDEX_COLUMN = "index"
+
+
+def quote(name):
+    """Quotes a table or column name, so names like "transaction-type" can be used as they are.
+
+    Arguments:
+        name {str} -- The name.
+
+    Returns:
+        [str] -- The name in double quotes.
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+
+class DatabaseWriter(ChunkedWriter):
+    """
+    Base class for writers that bulk insert chunks into a database table instead of writing a file.
+
+    Chunks are turned into rows by the caller's thread and handed to a writer thread through a bounded
+    queue, so generating and formatting the next chunk overlaps with inserting the last one.  When the
+    database falls behind, the queue fills up and the caller waits, which keeps memory flat.  The writer
+    thread inserts inside transactions and commits every commit_every rows.
+
+    A first_row of zero replaces the table.  Above zero, rows are added to the existing table.
+
+    Subclasses implement _connect and _insert and list their column types in TYPES.
+
+    When initializing a DatabaseWriter class, include the following parameters:
+        path:          (String) Where the database is, such as a file name or a connection string.
+        table:         (String) The table to write.
+        columns:       (List) Column names, in output order.  Taken from the first chunk when not given. (Optional)
+        chunk_size:    (Int) Largest number of rows inserted at once.
+        first_row:     (Int) Rows an earlier run already inserted.  Above zero, the table is added to.
+        commit_every:  (Int) Rows inserted between commits.
+        queue_size:    (Int) Chunks that can wait for the writer thread before the caller has to wait.
+    """
+    # Column type for each NumPy dtype kind.  Anything else is stored as text.
+    TYPES = {}
+    TEXT = "TEXT"
+
+    def __init__(self, path=None, table=None, columns=None, chunk_size=100000, first_row=0, commit_every=1000000,
+                 queue_size=4):
+        super().__init__(path, columns, chunk_size, first_row)
+
+        if commit_every <= 0 or queue_size <= 0:
+            print("Commit every and queue size must be greater than zero.")
+            raise ValueError
+
+        self.table = table
+        self.commit_every = commit_every
+        self._types = None
+        self._error = None
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._consume, name=f"{type(self).__name__}:{table}", daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        raise NotImplementedError
+
+    def _insert(self, connection, names, rows):
+        raise NotImplementedError
+
+    def _create_table(self, connection, types):
+        table = quote(self.table)
+        definition = ", ".join(f"{quote(name)} {column_type}" for name, column_type in types)
+
+        cursor = connection.cursor()
+        if self.first_row == 0:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {table} ({definition})")
+        cursor.close()
+        connection.commit()
+
+    def _consume(self):
+        connection = None
+        done = False
+        try:
+            connection = self._connect()
+            uncommitted = 0
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    done = True
+                    break
+
+                types, rows = item
+                if types is not None:
+                    self._create_table(connection, types)
+                if rows:
+                    self._insert(connection, [name for name, _ in self._types], rows)
+                    uncommitted += len(rows)
+
+                if uncommitted >= self.commit_every:
+                    connection.commit()
+                    uncommitted = 0
+
+            connection.commit()
+        except Exception as error:
+            self._error = error
+            # Keep taking chunks, so the caller never waits on a full queue that nothing reads.
+            while not done:
+                done = self._queue.get() is None
+        finally:
+            if connection is not None:
+                connection.close()
+
+    def _put(self, item):
+        if self._error is not None:
+            raise self._error
+        self._queue.put(item)
+
+    def _column_types(self, df):
+        types = [(INDEX_COLUMN, self.TYPES['i'])]
+        types.extend((name, self.TYPES.get(df[name].dtype.kind, self.TEXT)) for name in df.columns)
+        return types
+
+    def _write_frame(self, df):
+        types = None
+        if self._types is None:
+            types = self._types = self._column_types(df)
+
+        values = [df.index.to_numpy().tolist()]
+        for name in df.columns:
+            column = df[name]
+            if column.dtype.kind == 'M':
+                # The same text the CSV files hold, which both SQLite and PostgreSQL read as a time.
+                text = column.astype(str).to_numpy(dtype=object)
+                values.append(np.where(column.isna().to_numpy(), None, text).tolist())
+            elif column.dtype.kind == 'f':
+                values.append(np.where(np.isnan(column.to_numpy()), None, column.to_numpy(dtype=object)).tolist())
+            elif column.dtype.kind == 'O':
+                values.append([value if value is None or isinstance(value, (str, int, float)) else str(value)
+                               for value in column.to_numpy().tolist()])
+            else:
+                values.append(column.to_numpy().tolist())
+
+        self._put((types, list(zip(*values))))
+
+    def close(self):
+        if not self._thread.is_alive() and self._error is None:
+            return
+
+        try:
+            if self._types is None and self.columns is not None:
+                self._types = [(INDEX_COLUMN, self.TYPES['i'])] + [(name, self.TEXT) for name in self.columns]
+                self._put((self._types, []))
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+
+class SQLiteWriter(DatabaseWriter):
+    """
+    Bulk inserts chunks into a SQLite table with executemany on one prepared INSERT statement.
+
+    Every table of a run goes to the same database file.  Times are stored as text, as SQLite has no time type.
+
+    When initializing a SQLiteWriter class, include the following parameters:
+        path:          (String) The database file.  Created when missing.
+        table:         (String) The table to write.
+        columns:       (List) Column names, in output order. (Optional)
+        chunk_size:    (Int) Largest number of rows inserted at once.
+        first_row:     (Int) Rows an earlier run already inserted.  Above zero, the table is added to.
+        commit_every:  (Int) Rows inserted between commits.
+        queue_size:    (Int) Chunks that can wait for the writer thread.
+        synchronous:   (Bool) Wait for each commit to reach the disk.  False sets PRAGMA synchronous=OFF, which
+                       loads faster, but a power loss or OS crash while writing can corrupt the whole file,
+                       including tables earlier windows wrote.
+    """
+    TYPES = {'i': "INTEGER", 'u': "INTEGER", 'b': "INTEGER", 'f': "REAL"}
+
+    def __init__(self, path=None, table=None, columns=None, chunk_size=100000, first_row=0, commit_every=1000000,
+                 queue_size=4, synchronous=True):
+        self.synchronous = synchronous
+        super().__init__(path, table, columns, chunk_size, first_row, commit_every, queue_size)
+
+    def _connect(self):
+        import sqlite3
+
+        connection = sqlite3.connect(self.path)
+        if not self.synchronous:
+            connection.execute("PRAGMA synchronous = OFF")
+        return connection
+
+    def _insert(self, connection, names, rows):
+        # The statement text is the same for every chunk, so sqlite3 prepares it once and reuses it.
+        placeholders = ", ".join("?" * len(names))
+        connection.executemany(f"INSERT INTO {quote(self.table)} ({', '.join(map(quote, names))}) "
+                               f"VALUES ({placeholders})", rows)
+
+
+class PostgresWriter(DatabaseWriter):
+    """
+    Bulk loads chunks into a PostgreSQL table with COPY FROM STDIN.  Requires psycopg 3, which isn't in
+    requirements.txt: pip install psycopg, or pip install -r requirements-extras.txt.
+
+    When initializing a PostgresWriter class, include the following parameters:
+        path:          (String) The connection string, such as "postgresql://user@localhost/faker".
+        table:         (String) The table to write.
+        columns:       (List) Column names, in output order. (Optional)
+        chunk_size:    (Int) Largest number of rows copied at once.
+        first_row:     (Int) Rows an earlier run already copied.  Above zero, the table is added to.
+        commit_every:  (Int) Rows copied between commits.
+        queue_size:    (Int) Chunks that can wait for the writer thread.
+    """
+    TYPES = {'i': "BIGINT", 'u': "BIGINT", 'b': "BOOLEAN", 'f': "DOUBLE PRECISION", 'M': "TIMESTAMP"}
+
+    def __init__(self, path=None, table=None, columns=None, chunk_size=100000, first_row=0, commit_every=1000000,
+                 queue_size=4):
+        try:
+            import psycopg
+        except ImportError:
+            print("PostgreSQL output needs psycopg.  Please run: pip install psycopg")
+            raise
+
+        self._psycopg = psycopg
+        super().__init__(path, table, columns, chunk_size, first_row, commit_every, queue_size)
+
+    def _connect(self):
+        return self._psycopg.connect(self.path)
+
+    def _insert(self, connection, names, rows):
+        with connection.cursor() as cursor:
+            with cursor.copy(f"COPY {quote(self.table)} ({', '.join(map(quote, names))}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(row)
+
+
+SINKS = {'sqlite': SQLiteWriter,
+         'postgres': PostgresWriter}
+
+
+def open_sink(path=None, file_format='sqlite', table=None, columns=None, chunk_size=100000, first_row=0,
+              options=None):
+    """Opens the database writer for a sink.
+
+    Keyword Arguments:
+        path {str} -- The SQLite file, or the PostgreSQL connection string. (default: {None})
+        file_format {str} -- "sqlite" or "postgres". (default: {'sqlite'})
+        table {str} -- The table to write. (default: {None})
+        columns {List} -- Column names, in output order. (default: {None})
+        chunk_size {int} -- Largest number of rows inserted at once. (default: {100000})
+        first_row {int} -- Rows an earlier run already inserted.  Above zero, the table is added to. (default: {0})
+        options {Dict} -- Further keyword arguments for the writer, such as {"synchronous": False}. (default: {None})
+
+    Returns:
+        [DatabaseWriter] -- The writer, ready for write_records or write_columns.
+    """
+    if file_format not in SINKS:
+        print(f"Sinks only accepts {', '.join(SINKS)} as inputs.")
+        raise ValueError
+
+    return SINKS[file_format](path, table, columns=columns, chunk_size=chunk_size, first_row=first_row,
+                              **(options or {}))
@@ -0,0 +1,333 @@
+import json
+import os
+import shutil
+
+import numpy as np
+
+from entity_registry import ENTITY_KINDS
+from graphs import CSRGraph
+from transaction_table import COLUMN_DTYPES, TransactionTable
+
+SNAPSHOT_VERSION = 2
+
+STATE_FILE = "state.json"
+TABLES_FILE = "tables.json"
+
+# Directories save_snapshot writes.  They're cleared first, so nothing from an earlier population is left.
+SNAPSHOT_DIRECTORIES = ["people", "graph", "registry", "transactions"]
+
+# Person attributes kept in a snapshot and the array type each is stored as.
+PERSON_FIELDS = {"name": str,
+                 "company": str,
+                 "ssn": str,
+                 "address": str,
+                 "job": str,
+                 "email": str,
+                 "birthday": 'datetime64[D]',
+                 "work_email": str,
+                 "credit_card": str,
+                 "phone_number": str,
+                 "location_x": np.float64,
+                 "location_y": np.float64,
+                 "employee_number": np.int64}
+
+
+class StringTable:
+    """
+    Column of strings stored as one UTF-8 byte buffer and the offset each string starts at, so a column of
+    any size is two flat arrays that can be saved and memory mapped like any other array.
+
+    String i is data[offsets[i]:offsets[i + 1]].
+
+    When initializing a StringTable class, include the following parameters:
+        offsets:  (ndarray) Start of each string in data, plus the end of the last one.
+        data:     (ndarray) The UTF-8 bytes of every string, back to back, as uint8.
+        missing:  (ndarray) True where the value is None.  Missing values are stored as empty strings. (Optional)
+    """
+    def __init__(self, offsets, data, missing=None):
+        self.offsets = offsets
+        self.data = data
+        self.missing = missing
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __repr__(self):
+        return f"StringTable({len(self)} strings, {len(self.data)} bytes)"
+
+    def __getitem__(self, index):
+        if self.missing is not None and self.missing[index]:
+            return None
+        return self.data[self.offsets[index]:self.offsets[index + 1]].tobytes().decode('utf-8')
+
+    @classmethod
+    def from_values(cls, values):
+        """Method to build a table from strings.
+
+        Arguments:
+            values {List} -- Strings, or None for a missing value.
+
+        Returns:
+            [StringTable] -- The table.
+        """
+        encoded = [b'' if value is None else value.encode('utf-8') for value in values]
+
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+
+        missing = np.array([value is None for value in values], dtype=bool)
+        return cls(offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8), missing if missing.any() else None)
+
+    def tolist(self):
+        """Method to decode every string.
+
+        Returns:
+            [List] -- The strings, with None for missing values.
+        """
+        data = self.data.tobytes()
+        offsets = self.offsets.tolist()
+        values = [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(self))]
+
+        if self.missing is not None:
+            for index in np.flatnonzero(self.missing).tolist():
+                values[index] = None
+        return values
+
+
+def _save_strings(directory, name, table):
+    np.save(os.path.join(directory, f"{name}.offsets.npy"), table.offsets)
+    np.save(os.path.join(directory, f"{name}.data.npy"), table.data)
+    # Loading treats a mask file as belonging to the table, so a table without missing values removes any old one.
+    missing = os.path.join(directory, f"{name}.missing.npy")
+    if table.missing is not None:
+        np.save(missing, table.missing)
+    elif os.path.exists(missing):
+        os.remove(missing)
+
+
+def _load_strings(directory, name, mmap_mode):
+    missing = os.path.join(directory, f"{name}.missing.npy")
+    return StringTable(np.load(os.path.join(directory, f"{name}.offsets.npy"), mmap_mode=mmap_mode),
+                       np.load(os.path.join(directory, f"{name}.data.npy"), mmap_mode=mmap_mode),
+                       np.load(missing, mmap_mode=mmap_mode) if os.path.exists(missing) else None)
+
+
+def _load_array(directory, name, mmap_mode):
+    path = os.path.join(directory, f"{name}.npy")
+    return np.load(path, mmap_mode=mmap_mode) if os.path.exists(path) else None
+
+
+def save_snapshot(path=None, people=None, graph=None, registry=None, state=None):
+    """Writes a population to a snapshot directory, so later runs can add transactions without regenerating it.
+
+    Every column is a .npy file that np.load can memory map, and strings are kept as StringTables:
+
+        people/<field>.npy, or people/<field>.offsets.npy and people/<field>.data.npy for strings
+        graph/indptr.npy, graph/indices.npy and graph/groups.npy
+        registry/<kind>.offsets.npy and registry/<kind>.data.npy, in id order
+        state.json
+
+    A population saved into an existing snapshot replaces it.  Its people, graph, registry and transaction
+    windows are removed first, so none of them can be loaded with the new population.
+
+    Keyword Arguments:
+        path {str} -- The snapshot directory.  Created when missing. (default: {None})
+        people {List} -- Person objects, in person id order. (default: {None})
+        graph {CSRGraph} -- The social graph, or None for people without a graph. (default: {None})
+        registry {EntityRegistry} -- The registry whose ids the transactions refer to. (default: {None})
+        state {Dict} -- JSON serializable run state, see save_state. (default: {None})
+    """
+    for name in SNAPSHOT_DIRECTORIES:
+        shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+
+    directory = os.path.join(path, "people")
+    os.makedirs(directory, exist_ok=True)
+    for field, dtype in PERSON_FIELDS.items():
+        values = [getattr(person, field) for person in people]
+        if dtype is str:
+            _save_strings(directory, field, StringTable.from_values(values))
+        elif dtype is np.int64:
+            np.save(os.path.join(directory, f"{field}.npy"),
+                    np.array([-1 if value is None else value for value in values], dtype=np.int64))
+        else:
+            # Floats store a missing value as NaN and dates as NaT.
+            np.save(os.path.join(directory, f"{field}.npy"), np.array(values, dtype=dtype))
+
+    if graph is not None:
+        directory = os.path.join(path, "graph")
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "indptr.npy"), graph.indptr)
+        np.save(os.path.join(directory, "indices.npy"), graph.indices)
+        if graph.groups is not None:
+            np.save(os.path.join(directory, "groups.npy"), graph.groups)
+
+    # Entities are stored in id order, so registering them again hands out the same ids.
+    directory = os.path.join(path, "registry")
+    os.makedirs(directory, exist_ok=True)
+    for kind in ENTITY_KINDS:
+        _save_strings(directory, kind, StringTable.from_values(registry.values(kind).tolist()))
+
+    save_state(path, state)
+
+
+def save_transactions(path=None, window=0, table=None):
+    """Writes the transaction table of one window next to the snapshot's population.
+
+    Each window gets its own directory, transactions/<window>/, holding one .npy file per column, the
+    person to entity array of each type, and tables.json naming the entity kinds.  Earlier windows are
+    never rewritten.
+
+    Keyword Arguments:
+        path {str} -- The snapshot directory. (default: {None})
+        window {int} -- The window the transactions belong to. (default: {0})
+        table {TransactionTable} -- The bulk transactions of the window. (default: {None})
+    """
+    directory = os.path.join(path, "transactions", str(window))
+    os.makedirs(directory, exist_ok=True)
+
+    for name in COLUMN_DTYPES:
+        np.save(os.path.join(directory, f"{name}.npy"), table.column(name))
+
+    tables = {}
+    for transaction_type, (origin_kind, origin_entities) in table.origin_entities.items():
+        np.save(os.path.join(directory, f"origins.{transaction_type}.npy"), origin_entities)
+        tables[transaction_type] = {"origin_kind": origin_kind,
+                                    "destination_kind": table.destination_kinds[transaction_type]}
+
+    with open(os.path.join(directory, TABLES_FILE), 'w') as tables_file:
+        json.dump(tables, tables_file, indent=4)
+
+
+def save_state(path=None, state=None):
+    """Writes the run state of a snapshot without touching the population.
+
+    Keyword Arguments:
+        path {str} -- The snapshot directory. (default: {None})
+        state {Dict} -- The population settings, the last time window and the rows written to each output file.
+                        (default: {None})
+    """
+    with open(os.path.join(path, STATE_FILE), 'w') as state_file:
+        json.dump(dict(state, version=SNAPSHOT_VERSION), state_file, indent=4)
+
+
+def load_state(path=None):
+    """Reads the run state of a snapshot.
+
+    Keyword Arguments:
+        path {str} -- The snapshot directory. (default: {None})
+
+    Returns:
+        [Dict] -- The state written by save_state.
+    """
+    state_path = os.path.join(path, STATE_FILE)
+    if not os.path.exists(state_path):
+        print(f"No snapshot found at {path}.")
+        raise ValueError
+
+    with open(state_path, 'r') as state_file:
+        state = json.load(state_file)
+
+    if state.get("version") != SNAPSHOT_VERSION:
+        print(f"Snapshot version {state.get('version')} is not supported.")
+        raise ValueError
+
+    return state
+
+
+def load_people(path=None, mmap_mode='r'):
+    """Opens the people columns of a snapshot without reading them into memory.
+
+    Keyword Arguments:
+        path {str} -- The snapshot directory. (default: {None})
+        mmap_mode {str} -- Passed to np.load.  None reads the arrays into memory instead. (default: {'r'})
+
+    Returns:
+        [Dict] -- PERSON_FIELDS mapped to arrays, or to StringTables for strings.
+    """
+    directory = os.path.join(path, "people")
+    return {field: _load_strings(directory, field, mmap_mode) if dtype is str
+            else _load_array(directory, field, mmap_mode)
+            for field, dtype in PERSON_FIELDS.items()}
+
+
+def load_graph(path=None, mmap_mode='r'):
+    """Opens the social graph of a snapshot.
+
+    Keyword Arguments:
+        path {str} -- The snapshot directory. (default: {None})
+        mmap_mode {str} -- Passed to np.load.  None reads the arrays into memory instead. (default: {'r'})
+
+    Returns:
+        [CSRGraph] -- The graph, or None when the population has no graph.
+    """
+    directory = os.path.join(path, "graph")
+    if not os.path.exists(directory):
+        return None
+
+    return CSRGraph(_load_array(directory, "indptr", mmap_mode), _load_array(directory, "indices", mmap_mode),
+                    _load_array(directory, "groups", mmap_mode))
+
+
+def load_entities(path=None, mmap_mode='r'):
+    """Opens the registered entities of a snapshot.
+
+    Keyword Arguments:
+        path {str} -- The snapshot directory. (default: {None})
+        mmap_mode {str} -- Passed to np.load.  None reads the arrays into memory instead. (default: {'r'})
+
+    Returns:
+        [Dict] -- Each entity kind mapped to a StringTable of its values in id order.
+    """
+    directory = os.path.join(path, "registry")
+    return {kind: _load_strings(directory, kind, mmap_mode) for kind in ENTITY_KINDS}
+
+
+def load_transactions(path=None, window=0, registry=None, mmap_mode='r'):
+    """Opens the transactions of one window as a TransactionTable backed by the snapshot's files.
+
+    Keyword Arguments:
+        path {str} -- The snapshot directory. (default: {None})
+        window {int} -- Which window to open. (default: {0})
+        registry {EntityRegistry} -- Registry loaded from the same snapshot, used to resolve ids. (default: {None})
+        mmap_mode {str} -- Passed to np.load.  None reads the arrays into memory instead. (default: {'r'})
+
+    Returns:
+        [TransactionTable] -- The table.  Appending to it copies the columns into memory first.
+    """
+    directory = os.path.join(path, "transactions", str(window))
+    if not os.path.exists(directory):
+        print(f"The snapshot has no transactions for window {window}.")
+        raise ValueError
+
+    with open(os.path.join(directory, TABLES_FILE), 'r') as tables_file:
+        tables = json.load(tables_file)
+
+    table = TransactionTable.from_columns({name: _load_array(directory, name, mmap_mode) for name in COLUMN_DTYPES},
+                                          registry)
+    for transaction_type, kinds in tables.items():
+        table.set_entities(transaction_type, kinds["origin_kind"],
+                           _load_array(directory, f"origins.{transaction_type}", mmap_mode), kinds["destination_kind"])
+    return table
+
+
+def load_snapshot(path=None):
+    """Reads the population of a snapshot into memory.
+
+    Keyword Arguments:
+        path {str} -- The snapshot directory. (default: {None})
+
+    Returns:
+        [Tuple] -- (people, graph, entities): PERSON_FIELDS mapped to lists, the CSRGraph or None, and
+                   each entity kind mapped to its values in id order.
+    """
+    people = {}
+    for field, values in load_people(path).items():
+        if isinstance(values, StringTable):
+            people[field] = values.tolist()
+        elif field == "employee_number":
+            people[field] = [None if value < 0 else value for value in values.tolist()]
+        else:
+            people[field] = values.tolist()
+
+    entities = {kind: values.tolist() for kind, values in load_entities(path).items()}
+    return people, load_graph(path), entities
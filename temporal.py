@@ -0,0 +1,206 @@
+from datetime import datetime
+
+import numpy as np
+
+ARRIVAL_MODES = ['uniform', 'poisson', 'hawkes']
+
+# Relative activity in each hour of the day, midnight first.  Quiet at night, busiest in working hours.
+DIURNAL_WEIGHTS = np.array([0.20, 0.10, 0.08, 0.06, 0.06, 0.10, 0.30, 0.60, 0.90, 1.00, 1.00, 1.00,
+                            1.00, 1.00, 0.95, 0.95, 0.95, 0.90, 0.85, 0.80, 0.70, 0.60, 0.45, 0.30])
+
+# Relative activity on each day of the week, Monday first.
+WEEKLY_WEIGHTS = np.array([1.00, 1.00, 1.00, 1.00, 0.95, 0.60, 0.50])
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+
+# 1970-01-01, where datetime64 counts from, was a Thursday.
+EPOCH_WEEKDAY = 3
+
+
+class TemporalPattern:
+    """
+    Class that draws the timestamps of a whole population's transactions in one vectorized pass.
+
+    Times follow an activity curve made of hourly bins over the window, weighted by hour of day and day of
+    week, and drawn by inverse transform sampling on the bins' cumulative weight.  The cost only grows with
+    the number of hours in the window, so multi-year windows are as fast as a month.
+
+    Arrivals decide how many transactions each person makes:
+        "uniform" takes counts from the caller, "poisson" draws a Poisson count per person, and "hawkes"
+        draws Poisson background events that each trigger a Poisson(branching) number of follow-ups an
+        exponential delay later, generation after generation, so activity clusters in self-exciting bursts.
+
+    Every person's timestamps come back sorted, and people stay in id order.
+
+    When initializing a TemporalPattern class, include the following parameters:
+        start_date:   (Datetime) Earliest time a transaction can occur.
+        end_date:     (Datetime) Latest time a transaction can occur.  Defaults to now. (Optional)
+        arrivals:     (String) "uniform", "poisson", or "hawkes".
+        rate:         (Float) Mean transactions per person per day.  Defaults to the mean count the caller
+                      passes for the whole window. (Optional)
+        diurnal:      (Bool) Follow DIURNAL_WEIGHTS through the day.
+        weekly:       (Bool) Follow WEEKLY_WEIGHTS through the week.
+        bursts:       (Int) Burst times drawn per person.  0 turns bursts off.
+        burst_share:  (Float) Share of each person's transactions moved into one of their bursts.
+        burst_width:  (Float) Mean seconds a burst transaction falls after the start of its burst.
+        branching:    (Float) For "hawkes", mean follow-ups each transaction triggers.  Must be below one.
+        decay:        (Float) For "hawkes", mean seconds between a transaction and its follow-ups.
+    """
+    def __init__(self, start_date=None, end_date=None, arrivals='uniform', rate=None, diurnal=False, weekly=False,
+                 bursts=0, burst_share=0.5, burst_width=3600, branching=0.5, decay=3600):
+        if arrivals not in ARRIVAL_MODES:
+            print(f"Arrivals only accepts {', '.join(ARRIVAL_MODES)} as inputs.")
+            raise ValueError
+
+        if rate is not None and rate <= 0:
+            print("Please enter a number greater than zero for the rate.")
+            raise ValueError
+
+        if type(bursts) != int or bursts < 0 or not 0 <= burst_share <= 1 or burst_width <= 0:
+            print("Bursts must be a whole number of bursts, a share between 0 and 1 and a width above zero.")
+            raise ValueError
+
+        if not 0 <= branching < 1 or decay <= 0:
+            print("Branching must be at least 0 and below 1, and decay greater than zero.")
+            raise ValueError
+
+        self.start = np.datetime64(start_date, 's')
+        self.end = np.datetime64(end_date if end_date is not None else datetime.now(), 's')
+        self.span = max(int((self.end - self.start) / np.timedelta64(1, 's')), 1)
+
+        self.arrivals = arrivals
+        self.rate = rate
+        self.diurnal = diurnal
+        self.weekly = weekly
+        self.bursts = bursts
+        self.burst_share = burst_share
+        self.burst_width = burst_width
+        self.branching = branching
+        self.decay = decay
+
+        self._bins = self._activity_bins() if diurnal or weekly else None
+
+    def __repr__(self):
+        return f"TemporalPattern({self.arrivals}, {self.start} to {self.end})"
+
+    @property
+    def days(self):
+        return self.span / SECONDS_PER_DAY
+
+    def _activity_bins(self):
+        """Splits the window at every hour and weights each piece by its length and the hour and weekday it's in.
+
+        Returns:
+            [Tuple] -- (offset, width, cumulative) arrays: where each bin starts in seconds after the start,
+                       how many seconds it covers, and the running total of the bin weights.
+        """
+        start = self.start.astype(np.int64)
+        hours = np.arange(start - start % SECONDS_PER_HOUR + SECONDS_PER_HOUR, start + self.span, SECONDS_PER_HOUR)
+        edges = np.concatenate([[start], hours, [start + self.span]])
+
+        bin_start = edges[:-1]
+        width = np.diff(edges)
+        weight = width.astype(np.float64)
+        if self.diurnal:
+            weight *= DIURNAL_WEIGHTS[bin_start // SECONDS_PER_HOUR % 24]
+        if self.weekly:
+            weight *= WEEKLY_WEIGHTS[(bin_start // SECONDS_PER_DAY + EPOCH_WEEKDAY) % 7]
+
+        return bin_start - start, width, np.cumsum(weight)
+
+    def draw_offsets(self, count=0, rng=None):
+        """Method that draws times from the activity curve.
+
+        Keyword Arguments:
+            count {int} -- How many times to draw. (default: {0})
+            rng {Generator} -- NumPy random generator. (default: {None})
+
+        Returns:
+            [ndarray] -- Whole seconds after the start of the window, as int64.
+        """
+        if self._bins is None:
+            return rng.integers(0, self.span, size=count)
+
+        offset, width, cumulative = self._bins
+        target = rng.random(count) * cumulative[-1]
+        index = np.minimum(np.searchsorted(cumulative, target, side='right'), len(cumulative) - 1)
+
+        # Where the draw lands inside its bin's weight is also uniform, so it places the time within the bin.
+        weight = cumulative[index] - np.where(index > 0, cumulative[index - 1], 0)
+        within = (cumulative[index] - target) / np.maximum(weight, 1e-12)
+        position = np.minimum((within * width[index]).astype(np.int64), width[index] - 1)
+        return offset[index] + position
+
+    def _fold(self, offset):
+        # Burst and follow-up times past the end are reflected back into the window.
+        offset = np.where(offset >= self.span, 2 * (self.span - 1) - offset, offset)
+        return np.clip(offset, 0, self.span - 1)
+
+    def _add_bursts(self, number_of_people, person, offset, rng):
+        centers = self.draw_offsets(number_of_people * self.bursts, rng)
+
+        moved = np.flatnonzero(rng.random(len(person)) < self.burst_share)
+        center = centers[person[moved] * self.bursts + rng.integers(0, self.bursts, size=len(moved))]
+        offset[moved] = self._fold(center + rng.exponential(self.burst_width, size=len(moved)).astype(np.int64))
+        return offset
+
+    def _add_follow_ups(self, person, offset, rng):
+        people, offsets = [person], [offset]
+
+        # One generation at a time: every event of the last generation triggers its own follow-ups.
+        while len(person) > 0:
+            children = rng.poisson(self.branching, size=len(person))
+            person = np.repeat(person, children)
+            offset = np.repeat(offset, children) + rng.exponential(self.decay, size=len(person)).astype(np.int64)
+
+            inside = offset < self.span
+            person = person[inside]
+            offset = offset[inside]
+            people.append(person)
+            offsets.append(offset)
+
+        return np.concatenate(people), np.concatenate(offsets)
+
+    def sample(self, number_of_people=0, rng=None, counts=None, mean_count=None):
+        """Method that draws every person's transaction times.
+
+        Keyword Arguments:
+            number_of_people {int} -- How many people make transactions. (default: {0})
+            rng {Generator} -- NumPy random generator. (default: {None})
+            counts {ndarray} -- Transactions per person.  Required for "uniform" arrivals and ignored otherwise.
+                                (default: {None})
+            mean_count {float} -- Mean transactions per person over the window when no rate is set. (default: {None})
+
+        Returns:
+            [Tuple] -- (counts, timestamp): transactions per person, and datetime64[s] times grouped by person
+                       in id order and sorted within each person.
+        """
+        expected = self.rate * self.days if self.rate is not None else mean_count
+
+        if self.arrivals == 'uniform':
+            if counts is None:
+                print("Uniform arrivals need a count for every person.")
+                raise ValueError
+        elif self.arrivals == 'poisson':
+            counts = rng.poisson(expected, size=number_of_people)
+        else:
+            # Each background event brings 1 / (1 - branching) events in total, which keeps the mean at expected.
+            counts = rng.poisson(expected * (1 - self.branching), size=number_of_people)
+
+        person = np.repeat(np.arange(number_of_people, dtype=np.int64), counts)
+        offset = self.draw_offsets(len(person), rng)
+
+        if self.bursts > 0 and self.burst_share > 0:
+            offset = self._add_bursts(number_of_people, person, offset, rng)
+
+        if self.arrivals == 'hawkes':
+            person, offset = self._add_follow_ups(person, offset, rng)
+            counts = np.bincount(person, minlength=number_of_people)
+
+        # One int64 key per event orders by person and then by time, which is a single flat sort.
+        key = person * self.span + offset
+        key.sort()
+        offset = key - np.repeat(np.arange(number_of_people, dtype=np.int64), counts) * self.span
+
+        return counts, self.start + offset.astype('timedelta64[s]')
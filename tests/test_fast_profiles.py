@@ -0,0 +1,24 @@
+from fast_profiles import ProfileGenerator, create_faker
+
+
+def _generator():
+    return ProfileGenerator(create_faker(), seed=5)
+
+
+def test_ssn_areas_cover_fakers_range():
+    areas = {int(ssn[:3]) for ssn in _generator()._ssns(200000)}
+
+    assert min(areas) == 1 and max(areas) == 899
+    assert 666 not in areas
+
+
+def test_postcodes_cover_fakers_range():
+    postcodes = [int(postcode) for postcode in _generator().draw("postcode", 200000).tolist()]
+
+    assert min(postcodes) >= 501 and max(postcodes) <= 99950
+
+
+def test_state_abbreviations_include_territories():
+    states = set(_generator().draw("state_abbr", 20000).tolist())
+
+    assert {"CA", "DC", "PR", "GU", "FM"} <= states
@@ -0,0 +1,119 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from geocode_cache import GeocodeCache
+from geocoder import Geocoder
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers findAddressCandidates requests the way the ArcGIS World Geocoder does."""
+    def do_GET(self):
+        address = parse_qs(urlparse(self.path).query)["singleLine"][0]
+        server = self.server
+        with server.lock:
+            server.requests.append(address)
+            statuses = server.statuses.get(address, [])
+            status = statuses.pop(0) if statuses else 200
+
+        if status != 200:
+            self.send_response(status)
+            self.end_headers()
+            return
+
+        candidates = [] if address in server.unknown else [{"location": {"x": len(address), "y": 1.5}}]
+        body = json.dumps({"candidates": candidates}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.statuses = {}
+    server.unknown = set()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/findAddressCandidates"
+
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_geocode(stub):
+    with Geocoder(url=stub.url) as geocoder:
+        assert geocoder.geocode("1 Main St") == {"x": 9, "y": 1.5}
+        assert geocoder.stats()["requests"] == 1
+
+
+def test_retries_until_success(stub):
+    stub.statuses["1 Main St"] = [429, 503]
+
+    with Geocoder(url=stub.url, max_retries=3, backoff_factor=0) as geocoder:
+        assert geocoder.locate("1 Main St") == {"x": 9, "y": 1.5}
+        assert geocoder.stats()["requests"] == 3
+        assert geocoder.stats()["failures"] == 2
+
+
+def test_gives_up_after_max_retries(stub):
+    stub.statuses["1 Main St"] = [500] * 10
+
+    with Geocoder(url=stub.url, max_retries=2, backoff_factor=0) as geocoder:
+        assert geocoder.locate("1 Main St") is None
+        assert stub.requests == ["1 Main St"] * 3
+
+
+def test_unknown_address_is_not_retried(stub):
+    stub.unknown.add("nowhere")
+
+    with Geocoder(url=stub.url, backoff_factor=0) as geocoder:
+        assert geocoder.locate_many(["nowhere", "1 Main St"]) == [None, {"x": 9, "y": 1.5}]
+        assert stub.requests.count("nowhere") == 1
+
+
+def test_rate_limit(stub):
+    addresses = [f"{number} Main St" for number in range(6)]
+
+    with Geocoder(url=stub.url, max_workers=6, requests_per_second=20) as geocoder:
+        start = time.monotonic()
+        locations = geocoder.locate_many(addresses)
+        seconds = time.monotonic() - start
+
+    assert all(location is not None for location in locations)
+    # Six requests spaced 1/20s apart take at least five intervals.
+    assert seconds >= 5 / 20 * 0.9
+
+
+def test_cache_serves_repeated_addresses(stub):
+    with Geocoder(url=stub.url, cache=GeocodeCache(":memory:")) as geocoder:
+        first = geocoder.locate("1 Main St")
+        assert geocoder.locate("1  main st,") == first
+        assert geocoder.submit("1 MAIN ST").result() == first
+
+        assert stub.requests == ["1 Main St"]
+        assert geocoder.stats()["cache"]["hits"] == 2
+
+
+def test_cache_persists_between_runs(stub, tmp_path):
+    path = str(tmp_path / "geocode_cache.sqlite")
+
+    with Geocoder(url=stub.url, cache=GeocodeCache(path)) as geocoder:
+        geocoder.locate_many(["1 Main St", "2 Main St"])
+
+    with Geocoder(url=stub.url, cache=GeocodeCache(path, read_only=True)) as geocoder:
+        assert geocoder.locate_many(["1 Main St", "2 Main St"]) == [{"x": 9, "y": 1.5}, {"x": 9, "y": 1.5}]
+
+    assert stub.requests.count("1 Main St") == 1
+    assert stub.requests.count("2 Main St") == 1
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from graphs import erdos_renyi, stochastic_block_model
+
+
+def _cross_edges(graph):
+    source, target = graph.edge_arrays()
+    return int((graph.groups[source] != graph.groups[target]).sum())
+
+
+@pytest.mark.parametrize("sizes", [[5000, 5000], [100] * 100], ids=["two blocks", "many blocks"])
+def test_stochastic_block_model_cross_edges(sizes):
+    p_out = 0.001
+    number_of_nodes = sum(sizes)
+    cross_pairs = (number_of_nodes ** 2 - sum(size ** 2 for size in sizes)) // 2
+    expected = cross_pairs * p_out
+    deviation = np.sqrt(cross_pairs * p_out * (1 - p_out))
+
+    graph = stochastic_block_model(sizes, p_in=0.01, p_out=p_out, rng=np.random.default_rng(7))
+
+    assert abs(_cross_edges(graph) - expected) < 4 * deviation
+
+
+def test_stochastic_block_model_groups():
+    graph = stochastic_block_model([30, 20], p_in=0.5, p_out=0.1, rng=np.random.default_rng(7))
+
+    assert graph.number_of_nodes == 50
+    assert graph.groups.tolist() == [0] * 30 + [1] * 20
+
+
+@pytest.mark.parametrize("sizes, p_in", [([10] * 10, 0.9), ([30] * 10, 0.3), ([2000], 0.001)])
+def test_stochastic_block_model_within_block_edges(sizes, p_in):
+    pairs = sum(size * (size - 1) // 2 for size in sizes)
+    expected = pairs * p_in
+    deviation = np.sqrt(pairs * p_in * (1 - p_in))
+
+    graph = stochastic_block_model(sizes, p_in=p_in, p_out=0.0, rng=np.random.default_rng(7))
+
+    assert abs(graph.number_of_edges - expected) < 4 * deviation
+
+
+@pytest.mark.parametrize("number_of_nodes, average_degree", [(20, 4.0), (50, 10.0), (100000, 4.0)])
+def test_erdos_renyi_edges(number_of_nodes, average_degree):
+    pairs = number_of_nodes * (number_of_nodes - 1) // 2
+    p = average_degree / (number_of_nodes - 1)
+    deviation = np.sqrt(pairs * p * (1 - p))
+
+    edges = [erdos_renyi(number_of_nodes, average_degree, rng=np.random.default_rng(seed)).number_of_edges
+             for seed in range(20)]
+
+    # The mean of 20 graphs is within a few standard deviations of its own.
+    assert abs(np.mean(edges) - pairs * p) < 4 * deviation / np.sqrt(len(edges))
@@ -0,0 +1,13 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from run_benchmarks import IMPORT_BUDGET, measure_import  # noqa: E402
+
+
+def test_import_within_budget():
+    measured = measure_import(repeat=3)
+
+    assert measured["loaded"] == []
+    assert measured["best"] <= IMPORT_BUDGET
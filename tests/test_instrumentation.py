@@ -0,0 +1,62 @@
+import threading
+
+from instrumentation import Instrumentation
+
+
+def test_stage_records_traced_peak_when_alone():
+    instrumentation = Instrumentation(trace_memory=True)
+    try:
+        with instrumentation.stage("outer"):
+            data = [0] * 100000
+            with instrumentation.stage("inner"):
+                pass
+        del data
+    finally:
+        instrumentation.close()
+
+    stages = instrumentation.to_dict()["stages"]
+    assert stages["outer"]["traced_peak_mb"] > 0
+    assert "traced_peak_mb" not in stages["inner"]
+    assert stages["outer"]["calls"] == stages["inner"]["calls"] == 1
+
+
+def test_concurrent_stages_skip_traced_peak():
+    instrumentation = Instrumentation(trace_memory=True)
+    started = threading.Event()
+    finish = threading.Event()
+
+    def export():
+        with instrumentation.stage("export"):
+            started.set()
+            finish.wait()
+
+    thread = threading.Thread(target=export)
+    try:
+        with instrumentation.stage("generate"):
+            thread.start()
+            started.wait()
+        finish.set()
+        thread.join()
+    finally:
+        instrumentation.close()
+
+    stages = instrumentation.to_dict()["stages"]
+    assert "traced_peak_mb" not in stages["generate"]
+    assert "traced_peak_mb" not in stages["export"]
+
+
+def test_stages_from_many_threads_add_up():
+    instrumentation = Instrumentation()
+
+    def work():
+        for _ in range(1000):
+            with instrumentation.stage("work"):
+                pass
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert instrumentation.to_dict()["stages"]["work"]["calls"] == 8000
@@ -0,0 +1,47 @@
+import pytest
+from data_faker import main
+from manifest import read_manifest
+
+RUN = ["--graph-type", "Random", "--people", "600", "--transactions", "phonecall", "email", "money",
+       "--formats", "csv", "d3", "--locations", "synthetic", "--start-date", "2024-01-01",
+       "--end-date", "2024-01-15"]
+
+
+def _digests(output_dir, *options, seed="11"):
+    main(RUN + ["--seed", seed, "--output-dir", str(output_dir)] + list(options))
+    manifest = read_manifest(str(output_dir))
+    return {name: entry["sha256"] for name, entry in manifest["files"].items()}
+
+
+def test_same_seed_writes_same_bytes(tmp_path):
+    first = _digests(tmp_path / "first")
+    assert {"people.csv", "money.csv", "data.json"} <= set(first)
+
+    assert _digests(tmp_path / "second") == first
+    assert _digests(tmp_path / "other", seed="12") != first
+
+
+def test_pipeline_matches_no_pipeline(tmp_path):
+    assert _digests(tmp_path / "pipelined") == _digests(tmp_path / "serial", "--no-pipeline")
+
+
+@pytest.mark.parametrize("workers", ["2", "3"])
+def test_worker_count_does_not_change_output(tmp_path, workers):
+    one = _digests(tmp_path / "one", "--workers", "1", "--shard-size", "200")
+
+    assert _digests(tmp_path / "many", "--workers", workers, "--shard-size", "200") == one
+
+
+def test_skip_unchanged_skips_a_repeated_run(tmp_path, capsys):
+    _digests(tmp_path, "--skip-unchanged")
+    capsys.readouterr()
+
+    _digests(tmp_path, "--skip-unchanged")
+    assert "already matches this run" in capsys.readouterr().out
+
+
+def test_skip_unchanged_needs_fixed_dates(tmp_path):
+    options = [option for option in RUN if option not in ["--start-date", "2024-01-01", "--end-date", "2024-01-15"]]
+
+    with pytest.raises(ValueError):
+        main(options + ["--seed", "11", "--output-dir", str(tmp_path), "--skip-unchanged"])
@@ -0,0 +1,151 @@
+import os
+import sqlite3
+import sys
+import types
+
+import pytest
+from sinks import PostgresWriter, open_sink
+
+COLUMNS = ["origin", "amount", "transaction-type"]
+
+CHUNK = {"origin": ["a", "b", None], "amount": [1, 2, 3], "transaction-type": ["money", "money", "email"]}
+
+
+class FakeCopy:
+    def __init__(self, connection, statement):
+        self.connection = connection
+        self.statement = statement
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def write_row(self, row):
+        self.connection.sent.append((self.statement, tuple(row)))
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, statement):
+        self.connection.sent.append((statement, None))
+
+    def copy(self, statement):
+        return FakeCopy(self.connection, statement)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Records every statement and copied row instead of talking to a server."""
+    def __init__(self, dsn):
+        self.dsn = dsn
+        self.sent = []
+        self.commits = 0
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_psycopg(monkeypatch):
+    connections = []
+
+    def connect(dsn):
+        connections.append(FakeConnection(dsn))
+        return connections[-1]
+
+    monkeypatch.setitem(sys.modules, "psycopg", types.SimpleNamespace(connect=connect))
+    return connections
+
+
+def test_postgres_writer_copies_rows(fake_psycopg):
+    with open_sink("postgresql://localhost/faker", "postgres", "money", COLUMNS, chunk_size=2) as writer:
+        writer.write_columns(CHUNK)
+
+    connection, = fake_psycopg
+    assert connection.dsn == "postgresql://localhost/faker"
+    assert connection.closed and connection.commits >= 2
+
+    statements = [statement for statement, row in connection.sent if row is None]
+    assert statements[0] == 'DROP TABLE IF EXISTS "money"'
+    assert statements[1].startswith('CREATE TABLE IF NOT EXISTS "money" ("index" BIGINT, "origin" TEXT, '
+                                    '"amount" BIGINT')
+
+    rows = [row for statement, row in connection.sent if row is not None]
+    assert {statement for statement, row in connection.sent if row is not None} == \
+        {'COPY "money" ("index", "origin", "amount", "transaction-type") FROM STDIN'}
+    assert rows == [(0, "a", 1, "money"), (1, "b", 2, "money"), (2, None, 3, "email")]
+
+
+def test_postgres_writer_appends_after_first_row(fake_psycopg):
+    with open_sink("postgresql://localhost/faker", "postgres", "money", COLUMNS, first_row=5) as writer:
+        writer.write_columns(CHUNK)
+
+    connection, = fake_psycopg
+    assert not any(statement.startswith("DROP") for statement, _ in connection.sent)
+    assert [row[0] for _, row in connection.sent if row is not None] == [5, 6, 7]
+
+
+@pytest.mark.skipif("DATAFAKER_POSTGRES_DSN" not in os.environ,
+                    reason="Set DATAFAKER_POSTGRES_DSN to a throwaway database to run against PostgreSQL.")
+def test_postgres_writer_against_server():
+    psycopg = pytest.importorskip("psycopg")
+    dsn = os.environ["DATAFAKER_POSTGRES_DSN"]
+
+    with PostgresWriter(dsn, "datafaker_test", COLUMNS) as writer:
+        writer.write_columns(CHUNK)
+
+    with psycopg.connect(dsn) as connection:
+        rows = connection.execute('SELECT "index", origin, amount FROM datafaker_test ORDER BY "index"').fetchall()
+        connection.execute("DROP TABLE datafaker_test")
+
+    assert rows == [(0, "a", 1), (1, "b", 2), (2, None, 3)]
+
+
+class RecordingSQLiteConnection:
+    """Passes everything on to a real SQLite connection and records the statements run on it directly."""
+    def __init__(self, connection, statements):
+        self._connection = connection
+        self._statements = statements
+
+    def execute(self, statement, *args):
+        self._statements.append(statement)
+        return self._connection.execute(statement, *args)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+@pytest.mark.parametrize("synchronous", [True, False])
+def test_sqlite_writer(tmp_path, monkeypatch, synchronous):
+    path = str(tmp_path / "data.sqlite")
+    statements = []
+    connect = sqlite3.connect
+    monkeypatch.setattr(sqlite3, "connect", lambda *args: RecordingSQLiteConnection(connect(*args), statements))
+
+    with open_sink(path, "sqlite", "money", COLUMNS, options={"synchronous": synchronous}) as writer:
+        writer.write_columns(CHUNK)
+    monkeypatch.undo()
+
+    assert ("PRAGMA synchronous = OFF" in statements) is not synchronous
+    with sqlite3.connect(path) as connection:
+        rows = connection.execute('SELECT "index", origin, amount FROM money ORDER BY "index"').fetchall()
+    assert rows == [(0, "a", 1), (1, "b", 2), (2, None, 3)]
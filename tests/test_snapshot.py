@@ -0,0 +1,44 @@
+import os
+from types import SimpleNamespace
+
+import numpy as np
+from entity_registry import EntityRegistry
+from graphs import CSRGraph
+from snapshot import (PERSON_FIELDS, StringTable, _load_strings, _save_strings, load_graph, load_snapshot,
+                      save_snapshot, save_transactions)
+from transaction_table import TransactionTable
+
+
+def _people(names, phone_numbers):
+    people = []
+    for number, (name, phone_number) in enumerate(zip(names, phone_numbers)):
+        person = SimpleNamespace(**{field: None for field in PERSON_FIELDS})
+        person.name = name
+        person.phone_number = phone_number
+        person.birthday = "1990-01-01"
+        person.location_x = person.location_y = 1.0
+        person.employee_number = number
+        people.append(person)
+    return people
+
+
+def test_save_strings_twice_drops_old_missing_mask(tmp_path):
+    _save_strings(str(tmp_path), "phone", StringTable.from_values([None, "a"]))
+    _save_strings(str(tmp_path), "phone", StringTable.from_values(["x", "y"]))
+
+    assert _load_strings(str(tmp_path), "phone", None).tolist() == ["x", "y"]
+
+
+def test_save_snapshot_twice_replaces_population(tmp_path):
+    path = str(tmp_path)
+    graph = CSRGraph.from_edges(2, np.array([0]), np.array([1]), groups=np.zeros(2, dtype=np.int32))
+    save_snapshot(path, _people(["Ann", "Bob"], [None, "555"]), graph, EntityRegistry(), {"window": 0})
+    save_transactions(path, 0, TransactionTable())
+
+    save_snapshot(path, _people(["Cy", "Di", "Ed"], ["1", "2", "3"]), None, EntityRegistry(), {"window": 0})
+
+    people, loaded_graph, _ = load_snapshot(path)
+    assert people["name"] == ["Cy", "Di", "Ed"]
+    assert people["phone_number"] == ["1", "2", "3"]
+    assert loaded_graph is None and load_graph(path) is None
+    assert not os.path.exists(os.path.join(path, "transactions", "0"))
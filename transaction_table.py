@@ -0,0 +1,267 @@
+import numpy as np
+
+from entity_registry import EntityRegistry
+
+# Every transaction type, in the order runs generate them.  A row's type column holds its index in this list.
+TRANSACTION_TYPES = ['phonecall', 'email', 'money']
+
+# Stored in the amount column when a transaction has no amount.
+NO_AMOUNT = -1
+
+COLUMN_DTYPES = {"origin_id": np.int32,
+                 "destination_id": np.int32,
+                 "timestamp": 'datetime64[s]',
+                 "amount": np.int32,
+                 "type": np.int8,
+                 "x": np.float64,
+                 "y": np.float64}
+
+
+class TransactionTable:
+    """
+    Shared array-backed store for every transaction in a run.
+
+    Each column is a typed NumPy array.  Origins are stored as person ids and destinations as entity
+    ids from an EntityRegistry, which are only turned back into strings when the table is exported.
+    Rows are appended in batches, so every person's transactions of one type sit in a contiguous
+    index range that a TransactionView can point at.
+
+    When initializing a TransactionTable class, include the following parameters:
+        capacity:  (Int) Number of rows to allocate up front.  The table grows as needed.
+        registry:  (EntityRegistry) Resolves entity ids to strings.  A new registry is made when not given. (Optional)
+    """
+    def __init__(self, capacity=1024, registry=None):
+        self._size = 0
+        self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()}
+
+        self.registry = registry if registry is not None else EntityRegistry()
+        self.origin_entities = {}
+        self.destination_kinds = {}
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return f"TransactionTable({self._size} rows)"
+
+    @classmethod
+    def from_columns(cls, columns=None, registry=None):
+        """Method to wrap existing column arrays, such as memory mapped ones from a snapshot, without copying them.
+
+        Keyword Arguments:
+            columns {Dict} -- Every name in COLUMN_DTYPES mapped to an array of that type, all the same length.
+                              (default: {None})
+            registry {EntityRegistry} -- Resolves entity ids to strings. (default: {None})
+
+        Returns:
+            [TransactionTable] -- The table, full to capacity.  Appending copies the columns into memory first.
+        """
+        table = cls(capacity=0, registry=registry)
+        table._columns = {name: columns[name] for name in COLUMN_DTYPES}
+        table._size = len(columns["origin_id"])
+        return table
+
+    @property
+    def nbytes(self):
+        return sum(column[:self._size].nbytes for column in self._columns.values())
+
+    def column(self, name):
+        """Method to read one column without copying it.
+
+        Arguments:
+            name {str} -- One of origin_id, destination_id, timestamp, amount, type, x, or y.
+
+        Returns:
+            [ndarray] -- A view over the filled part of the column.
+        """
+        return self._columns[name][:self._size]
+
+    def _reserve(self, count):
+        needed = self._size + count
+        capacity = len(self._columns["origin_id"])
+        if needed <= capacity:
+            return
+
+        capacity = max(capacity, 1)
+        while capacity < needed:
+            capacity *= 2
+
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def set_entities(self, transaction_type=None, origin_kind=None, origin_entities=None, destination_kind=None):
+        """Method to register which entities the origin and destination ids of one type refer to.
+
+        Keyword Arguments:
+            transaction_type {str} -- "money", "email", or "phonecall". (default: {None})
+            origin_kind {str} -- Entity kind of the origins, such as "credit_card". (default: {None})
+            origin_entities {ndarray} -- For each person id, the entity id they send from. (default: {None})
+            destination_kind {str} -- Entity kind the destination ids belong to. (default: {None})
+        """
+        if transaction_type not in TRANSACTION_TYPES:
+            print("Transaction type only accepts 'money', 'email', or 'phonecall' as inputs.")
+            raise ValueError
+
+        self.origin_entities[transaction_type] = (origin_kind, np.asarray(origin_entities, dtype=np.int64))
+        self.destination_kinds[transaction_type] = destination_kind
+
+    def append(self, transaction_type=None, origin_id=None, destination_id=None, timestamp=None,
+               amount=None, x=None, y=None):
+        """Method to append a batch of transactions of one type.
+
+        Keyword Arguments:
+            transaction_type {str} -- "money", "email", or "phonecall". (default: {None})
+            origin_id {ndarray} -- Person id of each origin. (default: {None})
+            destination_id {ndarray} -- Entity id of each destination. (default: {None})
+            timestamp {ndarray} -- When each transaction occurred. (default: {None})
+            amount {ndarray} -- Whole number amounts.  None stores no amount. (default: {None})
+            x {ndarray} -- X location of each transaction. (default: {None})
+            y {ndarray} -- Y location of each transaction. (default: {None})
+
+        Returns:
+            [Tuple] -- The (start, stop) row range the batch was written to.
+        """
+        if transaction_type not in TRANSACTION_TYPES:
+            print("Transaction type only accepts 'money', 'email', or 'phonecall' as inputs.")
+            raise ValueError
+
+        count = len(origin_id)
+        self._reserve(count)
+        start, stop = self._size, self._size + count
+
+        self._columns["origin_id"][start:stop] = origin_id
+        self._columns["destination_id"][start:stop] = destination_id
+        self._columns["timestamp"][start:stop] = timestamp
+        self._columns["amount"][start:stop] = NO_AMOUNT if amount is None else amount
+        self._columns["type"][start:stop] = TRANSACTION_TYPES.index(transaction_type)
+        self._columns["x"][start:stop] = x
+        self._columns["y"][start:stop] = y
+
+        self._size = stop
+        return start, stop
+
+    def rows(self, transaction_type=None, start=0, stop=None):
+        """Method to find the rows of one type, optionally inside a row range.
+
+        Keyword Arguments:
+            transaction_type {str} -- "money", "email", or "phonecall".  None selects every type. (default: {None})
+            start {int} -- First row to consider. (default: {0})
+            stop {int} -- Row to stop before.  Defaults to the end of the table. (default: {None})
+
+        Returns:
+            [ndarray] -- Row indexes.
+        """
+        stop = self._size if stop is None else stop
+        rows = np.arange(start, stop)
+        if transaction_type is not None:
+            rows = rows[self._columns["type"][start:stop] == TRANSACTION_TYPES.index(transaction_type)]
+        return rows
+
+    def to_columns(self, transaction_type=None, start=0, stop=None):
+        """Method that resolves ids back to strings and exports rows of one type.
+
+        Keyword Arguments:
+            transaction_type {str} -- "money", "email", or "phonecall". (default: {None})
+            start {int} -- First row to export. (default: {0})
+            stop {int} -- Row to stop before.  Defaults to the end of the table. (default: {None})
+
+        Returns:
+            [Dict] -- Column name to array, in the same layout as Transaction.to_dict().
+        """
+        return self._resolve(transaction_type, self.rows(transaction_type, start, stop))
+
+    def _resolve(self, transaction_type, rows):
+        amount = self._columns["amount"][rows]
+        missing = amount == NO_AMOUNT
+        if missing.any():
+            amount = amount.astype(np.float64)
+            amount[missing] = np.nan
+
+        origin_kind, origin_entities = self.origin_entities[transaction_type]
+        destination_kind = self.destination_kinds[transaction_type]
+
+        return {"origin": self.registry.resolve(origin_kind, origin_entities[self._columns["origin_id"][rows]]),
+                "destination": self.registry.resolve(destination_kind, self._columns["destination_id"][rows]),
+                "date": self._columns["timestamp"][rows],
+                "amount": amount,
+                "transaction-type": np.full(len(rows), transaction_type, dtype=object),
+                "x": self._columns["x"][rows],
+                "y": self._columns["y"][rows]}
+
+    def time_order(self, transaction_type=None):
+        """Method to find the rows of one type in order of time.
+
+        Rows are stored by person, and the temporal engine already sorts each person's rows by time, so the
+        stable sort mostly merges sorted runs.  Rows with the same time keep their table order.
+
+        Keyword Arguments:
+            transaction_type {str} -- "money", "email", or "phonecall".  None selects every type. (default: {None})
+
+        Returns:
+            [ndarray] -- Row indexes, earliest first.
+        """
+        rows = self.rows(transaction_type)
+        return rows[np.argsort(self._columns["timestamp"][rows], kind='stable')]
+
+    def iter_columns(self, transaction_type=None, chunk_size=100000, sort_by_time=False):
+        """Method that exports rows of one type in windows of the table, so the export never holds every row.
+
+        Keyword Arguments:
+            transaction_type {str} -- "money", "email", or "phonecall". (default: {None})
+            chunk_size {int} -- Number of table rows resolved at a time. (default: {100000})
+            sort_by_time {bool} -- Export the rows in order of time instead of by person.  Only the row order
+                                   is held in memory. (default: {False})
+
+        Yields:
+            [Dict] -- Column name to array for the next window, as returned by to_columns.
+        """
+        if sort_by_time:
+            rows = self.time_order(transaction_type)
+            for start in range(0, len(rows), chunk_size):
+                yield self._resolve(transaction_type, rows[start:start + chunk_size])
+            return
+
+        for start in range(0, self._size, chunk_size):
+            yield self.to_columns(transaction_type, start, min(start + chunk_size, self._size))
+
+
+class TransactionView:
+    """
+    Read-only view over a contiguous row range of a TransactionTable.  Persons hold views in place of
+    their own transaction lists.
+
+    When initializing a TransactionView class, include the following parameters:
+        table:             (TransactionTable) The table the rows live in.
+        transaction_type:  (String) The type of every row in the range.
+        start:             (Int) First row of the range.
+        stop:              (Int) Row the range stops before.
+    """
+    __slots__ = ("table", "transaction_type", "start", "stop")
+
+    def __init__(self, table, transaction_type, start, stop):
+        self.table = table
+        self.transaction_type = transaction_type
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __repr__(self):
+        return f"TransactionView({self.transaction_type}, {self.start}:{self.stop})"
+
+    def to_dicts(self):
+        """Method to export the rows in the view.
+
+        Returns:
+            [List] -- One dictionary per transaction, in the same layout as Transaction.to_dict().
+        """
+        columns = self.table.to_columns(self.transaction_type, self.start, self.stop)
+        columns["date"] = columns["date"].astype(object)
+        if columns["amount"].dtype.kind == 'f':
+            columns["amount"] = np.where(np.isnan(columns["amount"]), None, columns["amount"].astype(object))
+
+        names = list(columns)
+        return [dict(zip(names, values)) for values in zip(*(columns[name].tolist() for name in names))]